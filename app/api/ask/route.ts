@@ -1,4 +1,8 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { askUpstream, UpstreamTimeoutError } from './upstream';
+
+// keep-alive 에이전트(node:http)를 쓰므로 Node.js 런타임 필요
+export const runtime = 'nodejs';
 
 /**
  * 벡터 검색 API 라우트
@@ -18,6 +22,8 @@ import { NextRequest, NextResponse } from 'next/server';
  *   },
  *   "success": true
  * }
+ *
+ * 같은 질문(정규화 기준)은 캐시/진행 중인 요청을 공유합니다 (upstream.ts 참고).
  */
 
 interface AskRequest {
@@ -64,19 +70,7 @@ export async function POST(request: NextRequest): Promise<NextResponse<AskRespon
       });
     }
 
-    const response = await fetch(lambdaUrl, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({ question }),
-    });
-
-    if (!response.ok) {
-      throw new Error(`Lambda 오류: ${response.statusText}`);
-    }
-
-    const lambdaResponse: AskResponse = await response.json();
+    const lambdaResponse = await askUpstream<AskResponse>(lambdaUrl, question);
     
     return NextResponse.json(lambdaResponse);
 
@@ -89,7 +83,7 @@ export async function POST(request: NextRequest): Promise<NextResponse<AskRespon
         success: false,
         error: error instanceof Error ? error.message : '알 수 없는 오류',
       },
-      { status: 500 }
+      { status: error instanceof UpstreamTimeoutError ? 504 : 500 }
     );
   }
 }
@@ -0,0 +1,150 @@
+import http from 'node:http';
+import https from 'node:https';
+
+/**
+ * Lambda 업스트림 클라이언트
+ *
+ * - keep-alive 커넥션 풀: 요청마다 TCP/TLS 핸드셰이크를 반복하지 않음
+ * - LRU 캐시: 정규화된 질문 기준으로 최근 답변 재사용 (TTL 적용, success: true인 응답만 저장)
+ *   업스트림에는 질문만 보내므로 (컬렉션/게임 컨텍스트 없음, Lambda의 DEFAULT_COLLECTION 검색)
+ *   캐시 키도 질문뿐입니다. 요청 본문에 컬렉션이나 게임 타입을 추가하면 키에도 함께 넣어야 합니다.
+ * - 요청 합치기: 같은 질문이 동시에 들어오면 업스트림 호출 한 번을 공유
+ * - 타임아웃: 초과 시 UpstreamTimeoutError
+ *
+ * 환경 변수:
+ * - CHATBOT_API_TIMEOUT_MS: 업스트림 타임아웃 (기본: 10000)
+ * - CHATBOT_API_MAX_SOCKETS: 호스트당 최대 커넥션 수 (기본: 50)
+ * - ASK_CACHE_MAX_ENTRIES: 캐시 최대 항목 수 (기본: 500)
+ * - ASK_CACHE_TTL_MS: 캐시 유효 시간 (기본: 300000)
+ */
+
+const UPSTREAM_TIMEOUT_MS = Number(process.env.CHATBOT_API_TIMEOUT_MS ?? 10000);
+const MAX_SOCKETS = Number(process.env.CHATBOT_API_MAX_SOCKETS ?? 50);
+const CACHE_MAX_ENTRIES = Number(process.env.ASK_CACHE_MAX_ENTRIES ?? 500);
+const CACHE_TTL_MS = Number(process.env.ASK_CACHE_TTL_MS ?? 5 * 60 * 1000);
+
+const agents: Record<string, http.Agent> = {
+  'http:': new http.Agent({ keepAlive: true, maxSockets: MAX_SOCKETS }),
+  'https:': new https.Agent({ keepAlive: true, maxSockets: MAX_SOCKETS }),
+};
+
+export class UpstreamTimeoutError extends Error {
+  constructor(timeoutMs: number) {
+    super(`Lambda 응답 시간 초과 (${timeoutMs}ms)`);
+    this.name = 'UpstreamTimeoutError';
+  }
+}
+
+/** 캐시 키용 질문 정규화 (Lambda의 normalize_question과 동일: 공백 정리 + 소문자) */
+export function normalizeQuestion(question: string): string {
+  return question.trim().split(/\s+/).join(' ').toLowerCase();
+}
+
+/** Map 삽입 순서를 이용한 TTL LRU 캐시 */
+class LruCache<V> {
+  private entries = new Map<string, { value: V; expiresAt: number }>();
+
+  constructor(private maxEntries: number, private ttlMs: number) {}
+
+  get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+    this.entries.delete(key);
+    if (entry.expiresAt <= Date.now()) return undefined;
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  set(key: string, value: V): void {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + this.ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as string;
+      this.entries.delete(oldest);
+    }
+  }
+}
+
+const cache = new LruCache<unknown>(CACHE_MAX_ENTRIES, CACHE_TTL_MS);
+const inflight = new Map<string, Promise<unknown>>();
+
+/** 풀링된 커넥션으로 JSON POST (전체 응답 시간 기준 타임아웃) */
+function postJson<T>(url: string, payload: unknown, timeoutMs: number): Promise<T> {
+  return new Promise((resolve, reject) => {
+    const target = new URL(url);
+    const body = JSON.stringify(payload);
+    const transport = target.protocol === 'https:' ? https : http;
+
+    const request = transport.request(
+      target,
+      {
+        method: 'POST',
+        agent: agents[target.protocol],
+        headers: {
+          'Content-Type': 'application/json',
+          'Content-Length': Buffer.byteLength(body),
+        },
+      },
+      (response) => {
+        const chunks: Buffer[] = [];
+        response.on('data', (chunk: Buffer) => chunks.push(chunk));
+        response.on('error', reject);
+        response.on('end', () => {
+          clearTimeout(timer);
+          const status = response.statusCode ?? 500;
+          if (status >= 400) {
+            reject(new Error(`Lambda 오류: ${response.statusMessage ?? status}`));
+            return;
+          }
+          try {
+            resolve(JSON.parse(Buffer.concat(chunks).toString('utf8')) as T);
+          } catch (error) {
+            reject(error);
+          }
+        });
+      }
+    );
+
+    const timer = setTimeout(() => request.destroy(new UpstreamTimeoutError(timeoutMs)), timeoutMs);
+    request.on('error', (error) => {
+      clearTimeout(timer);
+      reject(error);
+    });
+    request.end(body);
+  });
+}
+
+/** 캐시해도 되는 응답인지 (success: false 응답이나 폴백 답변은 같은 질문에 재사용하지 않음) */
+function isCacheable(response: unknown): boolean {
+  return typeof response === 'object' && response !== null && (response as { success?: unknown }).success === true;
+}
+
+/**
+ * 질문을 Lambda에 전달 (캐시 → 진행 중인 동일 요청 → 새 업스트림 호출 순)
+ *
+ * 캐시 키는 정규화된 질문뿐이므로 업스트림 payload도 { question }만 보냅니다.
+ */
+export function askUpstream<T>(url: string, question: string): Promise<T> {
+  const key = normalizeQuestion(question);
+
+  const cached = cache.get(key);
+  if (cached !== undefined) {
+    return Promise.resolve(cached as T);
+  }
+
+  const pending = inflight.get(key);
+  if (pending) {
+    return pending as Promise<T>;
+  }
+
+  const call = postJson<T>(url, { question }, UPSTREAM_TIMEOUT_MS)
+    .then((response) => {
+      if (isCacheable(response)) {
+        cache.set(key, response);
+      }
+      return response;
+    })
+    .finally(() => inflight.delete(key));
+  inflight.set(key, call);
+  return call;
+}
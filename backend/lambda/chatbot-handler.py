@@ -4,6 +4,9 @@ import requests
 import os
 from datetime import datetime
 
+from intent_classifier import canned_response
+from keyword_engine import get_engine
+
 def lambda_handler(event, context):
     """
     AI 챗봇 Lambda 핸들러
@@ -44,6 +47,22 @@ def lambda_handler(event, context):
                 })
             }
         
+        # 정형 의도는 템플릿으로 바로 응답 (모델 호출 생략)
+        canned = canned_response(user_question, game_type)
+        if canned:
+            intent, response_text = canned
+            print(f"Intent fast path: {intent.name} ({intent.confidence:.2f})")
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': json.dumps({
+                    'response': response_text,
+                    'intent': intent.name,
+                    'timestamp': datetime.now().isoformat(),
+                    'success': True
+                })
+            }
+        
         # 빅카인즈 API 호출
         bigkinds_response = call_bigkinds_api(user_question, question_text)
         
@@ -122,29 +141,10 @@ def call_bigkinds_api(user_question, question_text):
 
 def extract_keywords(user_question, question_text):
     """
-    질문에서 키워드 추출
+    질문에서 키워드 추출 (사전 매칭 + IDF 순위, 정규형 정렬 쿼리)
     """
-    # 간단한 키워드 추출 로직
     combined_text = f"{user_question} {question_text}"
-    
-    # 경제 관련 키워드 우선 추출
-    economic_keywords = [
-        '금리', '환율', '주식', '부동산', '인플레이션', '경제성장',
-        '수출', '수입', '무역', '투자', '소비', '고용', '실업',
-        '코스피', '코스닥', '달러', '원화', 'GDP', 'CPI'
-    ]
-    
-    found_keywords = []
-    for keyword in economic_keywords:
-        if keyword in combined_text:
-            found_keywords.append(keyword)
-    
-    # 키워드가 없으면 첫 번째 명사 추출 (간단한 구현)
-    if not found_keywords:
-        words = combined_text.split()
-        found_keywords = [word for word in words if len(word) > 1][:3]
-    
-    return ' '.join(found_keywords[:3])
+    return get_engine().query(combined_text, limit=3)
 
 def generate_ai_response(user_question, question_text, game_type, bigkinds_data):
     """
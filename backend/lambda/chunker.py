@@ -0,0 +1,170 @@
+"""
+긴 문서 청크 분할 / 검색 시 인접 청크 병합
+
+기사·정책 문서처럼 긴 본문은 그대로 임베딩하면 입력 한도를 넘고 검색 품질도 떨어지므로
+문장 단위로 잘라 목표 크기(CHUNK_CHARS)의 청크로 묶고, 앞 청크 끝부분(CHUNK_OVERLAP_CHARS)을
+다음 청크 앞에 겹쳐 넣습니다. 입력은 텍스트 블록 이터레이터로 받아 청크를 하나씩 내보내므로
+문서 크기와 무관하게 메모리 사용량은 청크 몇 개 분량으로 일정합니다.
+
+청크 아이템 필드 (Q&A 아이템과 같은 테이블/스냅샷에 저장):
+- parent_id / parent_question: 원본 문서 ID / 제목 (패러프레이즈와 같은 부모 규칙 → 검색 결과는 문서 단위)
+- answer: 청크 원문 (공백 포함, 문서 내 [chunk_start, chunk_end) 구간 그대로)
+- chunk: 문서 내 청크 번호 (0부터)
+
+검색 시 collapse_hits()가 같은 문서에서 함께 걸린 인접 청크를 겹친 부분 없이 이어 붙여
+문서당 결과 하나로 합칩니다.
+
+환경 변수:
+- CHUNK_CHARS: 청크 목표 크기, 문자 수 (기본: 800)
+- CHUNK_OVERLAP_CHARS: 인접 청크 겹침 크기, 문자 수 (기본: 150)
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+
+CHUNK_CHARS = int(os.environ.get("CHUNK_CHARS", "800"))
+CHUNK_OVERLAP_CHARS = int(os.environ.get("CHUNK_OVERLAP_CHARS", "150"))
+CHUNK_FIELDS = ("chunk", "chunk_start", "chunk_end")
+
+# 문장 끝: 마침표/물음표/느낌표/말줄임표(+ 닫는 따옴표·괄호) 뒤 공백, 또는 줄바꿈
+# 한국어 평서문("~다.", "~요.")과 의문문("~까?")은 모두 문장부호로 끝나므로 부호 기준으로 충분
+_SENTENCE_END = re.compile(r"[.!?。…]+[\"'”’)\]」』]*(?=\s)|\n")
+_WHITESPACE = re.compile(r"\s*")
+
+
+@dataclass
+class Chunk:
+    index: int
+    start: int  # 문서 내 시작 위치 (문자)
+    end: int
+    text: str  # 원문 그대로 (text == 문서[start:end])
+
+
+def split_sentences(blocks: Iterable[str], max_chars: int = CHUNK_CHARS) -> Iterator[tuple[int, str]]:
+    """
+    텍스트 블록 스트림 → (시작 위치, 문장) 조각
+
+    조각은 문장 + 뒤따르는 공백이며 이어 붙이면 원문과 같습니다.
+    max_chars보다 긴 문장은 그 안의 마지막 공백(없으면 max_chars)에서 자릅니다.
+    """
+    buffer = ""
+    base = 0  # buffer[0]의 문서 내 위치
+    for block in blocks:
+        buffer += block
+        pos = 0
+        for match in _SENTENCE_END.finditer(buffer):
+            end = _WHITESPACE.match(buffer, match.end()).end()
+            if end == len(buffer) or match.start() < pos:
+                # 공백이 다음 블록까지 이어질 수 있음 / 이미 내보낸 구간
+                continue
+            yield base + pos, buffer[pos:end]
+            pos = end
+        while len(buffer) - pos > max_chars:
+            cut = buffer.rfind(" ", pos + 1, pos + max_chars) + 1 or pos + max_chars
+            yield base + pos, buffer[pos:cut]
+            pos = cut
+        buffer = buffer[pos:]
+        base += pos
+    if buffer:
+        yield base, buffer
+
+
+def chunk_text(
+    blocks: Iterable[str],
+    chunk_chars: int = CHUNK_CHARS,
+    overlap_chars: int = CHUNK_OVERLAP_CHARS,
+) -> Iterator[Chunk]:
+    """
+    텍스트 블록 스트림 → 청크 (문장 경계 유지, 앞 청크의 끝 문장들을 overlap_chars 이내로 겹침)
+
+    공백뿐인 청크는 건너뛰고 청크 번호는 내보낸 청크 기준으로 0부터 매깁니다.
+    """
+    if overlap_chars >= chunk_chars:
+        raise ValueError(f"❌ 겹침({overlap_chars})은 청크 크기({chunk_chars})보다 작아야 합니다")
+
+    window: list[tuple[int, str]] = []
+    size = 0
+    fresh = False  # 마지막으로 내보낸 뒤 새 문장이 들어왔는지
+    index = 0
+
+    def emit() -> Optional[Chunk]:
+        text = "".join(piece for _, piece in window)
+        if not text.strip():
+            return None
+        return Chunk(index=index, start=window[0][0], end=window[0][0] + len(text), text=text)
+
+    for start, piece in split_sentences(blocks, chunk_chars):
+        if fresh and size + len(piece) > chunk_chars:
+            chunk = emit()
+            if chunk:
+                yield chunk
+                index += 1
+            # 끝 문장들을 겹침 크기 안에서 다음 청크로 넘김 (새 문장과 합쳐 청크 크기를 넘지 않는 만큼만)
+            kept: list[tuple[int, str]] = []
+            kept_size = 0
+            budget = min(overlap_chars, chunk_chars - len(piece))
+            for item in reversed(window):
+                if kept_size + len(item[1]) > budget:
+                    break
+                kept.insert(0, item)
+                kept_size += len(item[1])
+            window, size, fresh = kept, kept_size, False
+        window.append((start, piece))
+        size += len(piece)
+        fresh = True
+    if fresh:
+        chunk = emit()
+        if chunk:
+            yield chunk
+
+
+def merge_chunks(hits: Iterable[dict[str, Any]]) -> str:
+    """같은 문서의 연속 청크를 겹친 부분 없이 이어 붙인 텍스트"""
+    text = ""
+    end = None
+    for hit in sorted(hits, key=lambda h: int(h["chunk"])):
+        start, answer = int(hit["chunk_start"]), hit["answer"]
+        if end is None:
+            text = answer
+        elif start <= end:
+            # 겹치거나 바로 이어지는 청크는 원문 그대로 이어짐
+            text += answer[end - start:]
+        else:
+            # 사이에 공백뿐인 구간이 빠진 경우
+            text += " " + answer
+        end = max(end or 0, int(hit["chunk_end"]))
+    return text.strip()
+
+
+def collapse_hits(hits: Iterable[dict[str, Any]], top_k: int) -> list[dict[str, Any]]:
+    """
+    유사도 내림차순 후보 → 부모(원본 Q&A/문서)당 결과 하나, 상위 top_k개
+
+    일반/패러프레이즈 행은 가장 높은 행 하나, 청크 행은 가장 높은 청크와
+    함께 걸린 앞뒤 연속 청크를 이어 붙인 구간을 답변으로 반환합니다.
+    """
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for hit in hits:
+        groups.setdefault(hit.get("parent_id") or hit["id"], []).append(hit)
+
+    results = []
+    for parent_id, group in list(groups.items())[:top_k]:
+        best = group[0]
+        answer = best.get("answer", "")
+        if best.get("chunk") is not None:
+            by_index = {int(h["chunk"]): h for h in group if h.get("chunk") is not None}
+            first = last = int(best["chunk"])
+            while first - 1 in by_index:
+                first -= 1
+            while last + 1 in by_index:
+                last += 1
+            answer = merge_chunks(by_index[i] for i in range(first, last + 1))
+        results.append({
+            "id": parent_id,
+            "question": best.get("parent_question") or best.get("question", ""),
+            "answer": answer,
+            "similarity": best["similarity"],
+        })
+    return results
@@ -0,0 +1,78 @@
+"""
+AWS Lambda Handler - Q&A 테이블 변경분 수집 / 스냅샷 압축
+
+handler: qa-documents DynamoDB Streams(NEW_AND_OLD_IMAGES) 트리거.
+  레코드를 upsert/delete 변경분으로 바꿔 변경분 로그에 추가합니다 (deltas.py 참고).
+  웜 컨테이너의 index.py는 이 로그를 따라가며 스냅샷 인덱스를 몇 초 안에 갱신합니다.
+
+compact_handler: 주기 실행 (EventBridge schedule).
+  컬렉션별 최신 S3 스냅샷에 변경분을 반영한 새 스냅샷을 올리고 LATEST를 바꿔서,
+  새 컨테이너가 적은 변경분만 따라가면 되도록 합니다. SNAPSHOT_S3_BUCKET이 없으면 아무것도 하지 않습니다.
+  GENERATION_TABLE이 있으면 컬렉션마다 포인터가 가리키는 라이브 세대 source("perso.ai@<세대>")를 압축합니다
+  (index.live_source / export_snapshot.py와 같은 규칙, 아이템과 변경분 모두 세대 source로 기록됨).
+
+두 트리거는 serverless.yml에서 DELTA_SYNC=enabled로 배포할 때만 연결됩니다.
+
+환경 변수:
+- DELTA_TABLE: 변경분 테이블명 (deltas.py 참고)
+- DELTA_COMPACT_COLLECTIONS: 압축할 컬렉션 목록, 쉼표 구분 (기본: DEFAULT_COLLECTION)
+- GENERATION_TABLE: 설정 시 컬렉션을 라이브 세대 source로 바꿔 압축 (generations.py 참고)
+- SNAPSHOT_S3_BUCKET / SNAPSHOT_S3_PREFIX: 스냅샷 위치 (index.py와 동일)
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from deltas import DeltaFollower, compact, deltas_from_stream, default_log
+from generations import GENERATION_TABLE, GenerationPointers
+from snapshot import SnapshotIndex, download_snapshot, upload_snapshot
+
+# 로깅 설정
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 설정
+DEFAULT_COLLECTION = os.environ.get("DEFAULT_COLLECTION") or "perso.ai"  # index.py는 빈 값 = 전체 컬렉션
+DELTA_COMPACT_COLLECTIONS = [
+    c.strip() for c in os.environ.get("DELTA_COMPACT_COLLECTIONS", DEFAULT_COLLECTION).split(",") if c.strip()
+]
+SNAPSHOT_S3_BUCKET = os.environ.get("SNAPSHOT_S3_BUCKET", "")
+SNAPSHOT_S3_PREFIX = os.environ.get("SNAPSHOT_S3_PREFIX", "snapshots/qa/")
+SNAPSHOT_TMP_DIR = "/tmp/qa-snapshot"
+
+delta_log = default_log()
+
+
+def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """DynamoDB Streams 배치 → 변경분 로그 (실패 시 예외로 배치 전체를 재시도)"""
+    records = event.get("Records", [])
+    deltas = deltas_from_stream(records)
+    written = delta_log.append(deltas)
+    logger.info(f"📝 스트림 레코드 {len(records)}건 → 변경분 {written}건 기록")
+    return {"records": len(records), "deltas": written}
+
+
+def compact_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """컬렉션별 최신 스냅샷 + 변경분 → 새 스냅샷 업로드"""
+    if not SNAPSHOT_S3_BUCKET:
+        # 스냅샷 백엔드를 쓰지 않는 배포에서 스케줄이 켜져 있어도 매시간 실패하지 않도록 건너뜀
+        logger.warning("⚠️  SNAPSHOT_S3_BUCKET 미설정 — 스냅샷 압축 건너뜀")
+        return {}
+
+    # 포인터를 읽지 못하면 예외로 실패 (세대 없는 컬렉션 이름으로 아무도 읽지 않는 스냅샷을 만들지 않음)
+    pointers = GenerationPointers(poll_seconds=0) if GENERATION_TABLE else None
+    results = {}
+    for name in DELTA_COMPACT_COLLECTIONS:
+        collection = pointers.live_source(name) if pointers else name
+        prefix = f"{SNAPSHOT_S3_PREFIX}{collection}/"
+        index = SnapshotIndex(download_snapshot(SNAPSHOT_S3_BUCKET, prefix, f"{SNAPSHOT_TMP_DIR}/{collection}"))
+        follower = DeltaFollower(index, delta_log, collection)
+        before = follower.cursor
+        snapshot_dir = compact(follower, f"{SNAPSHOT_TMP_DIR}/compacted/{collection}")
+        upload_snapshot(Path(snapshot_dir), SNAPSHOT_S3_BUCKET, prefix)
+        results[collection] = {"version": Path(snapshot_dir).name, "count": len(index), "from": before, "to": follower.cursor}
+        logger.info(f"🗜️  {collection} 압축 완료: {json.dumps(results[collection], ensure_ascii=False)}")
+    return results
@@ -0,0 +1,258 @@
+"""
+Q&A 테이블 변경분 로그 (DynamoDB Streams → 메모리 인덱스 증분 반영)
+
+insert_perso_qa.py나 적재 스크립트가 qa-documents에 쓰면 스트림 핸들러(delta_handler.py)가
+레코드를 작은 upsert/delete 변경분으로 바꿔 컬렉션별 로그에 추가하고,
+웜 컨테이너는 DELTA_POLL_SECONDS마다 새 변경분만 읽어 스냅샷 인덱스에 바로 반영합니다.
+주기적인 압축(compact)은 변경분을 반영한 새 스냅샷을 만들어 재로드 비용을 일정하게 유지합니다.
+
+변경분 한 건:
+- collection: 아이템의 source
+- seq: "<기록 시각 ms 13자리>#<스트림 sequence number>" (로그 정렬 키)
+- version: 40자리로 채운 스트림 sequence number (같은 아이템의 변경 순서, 늦게 도착한 오래된 변경분은 무시)
+- op: upsert / delete
+- upsert는 question, answer, created_at, parent_id, parent_question, 청크 위치(chunker.py)와 float32 바이너리 임베딩 포함
+
+여러 스트림 샤드가 동시에 기록하므로 읽을 때 DELTA_LOOKBACK_MS만큼 겹쳐 읽고
+이미 반영한 seq는 건너뜁니다.
+
+저장 백엔드:
+- DynamoDB: DELTA_TABLE 설정 시 (파티션 키 collection, 정렬 키 seq, TTL 속성 expires_at)
+- 메모리: DELTA_TABLE 미설정 시 (로컬 재생/테스트용)
+
+테이블 생성 + 스트림 활성화: python scripts/create_delta_table.py
+로컬 이벤트 재생: python scripts/replay_stream_events.py events.json --snapshot <스냅샷 경로>
+
+환경 변수:
+- DELTA_TABLE: 변경분 테이블명 (기본: 없음 → 메모리)
+- DELTA_TTL_SECONDS: 변경분 보관 기간 (기본: 604800, 압축 주기보다 충분히 길게)
+- DELTA_POLL_SECONDS: 웜 컨테이너의 변경분 확인 간격 (기본: 2)
+- DELTA_LOOKBACK_MS: 늦게 기록된 변경분을 잡기 위한 겹쳐 읽기 구간 (기본: 10000)
+"""
+
+import os
+import time
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from chunker import CHUNK_FIELDS
+from embeddings import TitanV1Provider
+from snapshot import write_snapshot
+
+logger = logging.getLogger()
+
+DELTA_TABLE = os.environ.get("DELTA_TABLE", "")
+DELTA_TTL_SECONDS = int(os.environ.get("DELTA_TTL_SECONDS", "604800"))
+DELTA_POLL_SECONDS = float(os.environ.get("DELTA_POLL_SECONDS", "2"))
+DELTA_LOOKBACK_MS = int(os.environ.get("DELTA_LOOKBACK_MS", "10000"))
+
+UPSERT = "upsert"
+DELETE = "delete"
+_FIELDS = ("question", "answer", "created_at", "parent_id", "parent_question", "embedding_model", "embedding_dim", *CHUNK_FIELDS)
+_INT_FIELDS = ("embedding_dim", *CHUNK_FIELDS)
+
+
+@dataclass
+class Delta:
+    collection: str
+    seq: str
+    version: str
+    op: str
+    id: str
+    fields: dict[str, Any] = field(default_factory=dict)
+    embedding: Optional[bytes] = None  # float32 little-endian
+
+    def to_item(self) -> dict[str, Any]:
+        item = {"collection": self.collection, "seq": self.seq, "version": self.version, "op": self.op, "id": self.id}
+        item.update({k: v for k, v in self.fields.items() if v not in (None, "")})
+        if self.embedding is not None:
+            item["embedding"] = self.embedding
+        return item
+
+    @classmethod
+    def from_item(cls, item: dict[str, Any]) -> "Delta":
+        embedding = item.get("embedding")
+        return cls(
+            collection=item["collection"],
+            seq=item["seq"],
+            version=item["version"],
+            op=item["op"],
+            id=item["id"],
+            fields={k: item[k] for k in _FIELDS if k in item},
+            embedding=bytes(embedding.value if hasattr(embedding, "value") else embedding) if embedding is not None else None,
+        )
+
+    def vector(self) -> list[float]:
+        return np.frombuffer(self.embedding, dtype="<f4").tolist()
+
+
+def cursor_at(timestamp: float) -> str:
+    """해당 시각 이후의 변경분을 가리키는 seq 커서"""
+    return f"{int(timestamp * 1000):013d}"
+
+
+def deltas_from_stream(records: Iterable[dict[str, Any]], written_at: Optional[float] = None) -> list[Delta]:
+    """DynamoDB Streams 레코드(NEW_AND_OLD_IMAGES) → 변경분 (embedding 없는 아이템은 제외)"""
+    from boto3.dynamodb.types import TypeDeserializer
+
+    deserializer = TypeDeserializer()
+    prefix = cursor_at(time.time() if written_at is None else written_at)
+    deltas = []
+    for record in records:
+        change = record["dynamodb"]
+        image = change.get("NewImage") if record["eventName"] != "REMOVE" else change.get("OldImage")
+        if not image:
+            continue
+        item = {k: deserializer.deserialize(v) for k, v in image.items()}
+        if "source" not in item or "id" not in item:
+            continue
+        sequence = change["SequenceNumber"]
+        delta = Delta(
+            collection=str(item["source"]),
+            seq=f"{prefix}#{sequence}",
+            version=sequence.zfill(40),
+            op=DELETE if record["eventName"] == "REMOVE" else UPSERT,
+            id=str(item["id"]),
+        )
+        if delta.op == UPSERT:
+            if "embedding" not in item:
+                continue
+            delta.fields = {k: (int(item[k]) if k in _INT_FIELDS else str(item[k])) for k in _FIELDS if k in item}
+            delta.embedding = np.asarray([float(x) for x in item["embedding"]], dtype="<f4").tobytes()
+        deltas.append(delta)
+    return deltas
+
+
+class MemoryDeltaLog:
+    """프로세스 메모리 변경분 로그 (로컬 재생/테스트용)"""
+
+    def __init__(self):
+        self._items: dict[str, dict[str, dict[str, Any]]] = {}
+
+    def append(self, deltas: Iterable[Delta]) -> int:
+        count = 0
+        for delta in deltas:
+            self._items.setdefault(delta.collection, {})[delta.seq] = delta.to_item()
+            count += 1
+        return count
+
+    def read(self, collection: str, after: str) -> list[Delta]:
+        items = self._items.get(collection, {})
+        return [Delta.from_item(items[seq]) for seq in sorted(items) if seq > after]
+
+
+class DynamoDeltaLog:
+    """DynamoDB 변경분 로그 (collection + seq, 만료는 TTL)"""
+
+    def __init__(self, table: Any):
+        self.table = table
+
+    def append(self, deltas: Iterable[Delta]) -> int:
+        expires_at = int(time.time()) + DELTA_TTL_SECONDS
+        count = 0
+        with self.table.batch_writer(overwrite_by_pkeys=["collection", "seq"]) as batch:
+            for delta in deltas:
+                batch.put_item(Item={**delta.to_item(), "expires_at": expires_at})
+                count += 1
+        return count
+
+    def read(self, collection: str, after: str) -> list[Delta]:
+        from boto3.dynamodb.conditions import Key
+
+        kwargs = {"KeyConditionExpression": Key("collection").eq(collection) & Key("seq").gt(after)}
+        deltas = []
+        while True:
+            response = self.table.query(**kwargs)
+            deltas.extend(Delta.from_item(item) for item in response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return deltas
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def default_log() -> Any:
+    """DELTA_TABLE이 있으면 DynamoDB, 없으면 메모리 로그"""
+    if DELTA_TABLE:
+        import boto3
+
+        dynamodb = boto3.resource("dynamodb", region_name=os.environ.get("BEDROCK_REGION", "ap-northeast-1"))
+        return DynamoDeltaLog(dynamodb.Table(DELTA_TABLE))
+    return MemoryDeltaLog()
+
+
+def snapshot_cursor(manifest: dict[str, Any]) -> str:
+    """스냅샷에 이미 반영된 변경분 위치 (압축 스냅샷은 delta_cursor, 그 외는 생성 시각)"""
+    if manifest.get("delta_cursor"):
+        return manifest["delta_cursor"]
+    return cursor_at(datetime.fromisoformat(manifest["created_at"]).timestamp())
+
+
+class DeltaFollower:
+    """변경분 로그를 따라가며 스냅샷 인덱스에 반영"""
+
+    def __init__(self, index: Any, log: Any, collection: str, poll_seconds: float = DELTA_POLL_SECONDS):
+        self.index = index
+        self.log = log
+        self.collection = collection
+        self.poll_seconds = poll_seconds
+        self.cursor = snapshot_cursor(index.manifest)
+        self._applied: set[str] = set()  # 겹쳐 읽는 구간에서 이미 반영한 seq
+        self._last_poll = 0.0
+
+    def _matches(self, delta: Delta) -> bool:
+        """스냅샷과 같은 임베딩 모델/차원인지 (메타데이터 없는 아이템은 Titan v1로 간주)"""
+        model = delta.fields.get("embedding_model", TitanV1Provider.model_id)
+        dim = int(delta.fields.get("embedding_dim", TitanV1Provider.dimensions))
+        return model == self.index.manifest["embedding_model"] and dim == self.index.dim
+
+    def apply(self, deltas: Iterable[Delta]) -> int:
+        applied = 0
+        for delta in deltas:
+            if delta.seq in self._applied:
+                continue
+            self._applied.add(delta.seq)
+            self.cursor = max(self.cursor, delta.seq)
+            if delta.op == UPSERT and self._matches(delta):
+                changed = self.index.upsert({"id": delta.id, **delta.fields, "embedding": delta.vector()}, delta.version)
+            else:
+                # 다른 모델로 다시 임베딩된 아이템도 이 인덱스에서는 비교할 수 없으므로 제거
+                changed = self.index.delete(delta.id, delta.version)
+            applied += changed
+        return applied
+
+    def poll(self, force: bool = False) -> int:
+        """간격이 지났으면 새 변경분 반영 (반영한 건수)"""
+        now = time.time()
+        if not force and now - self._last_poll < self.poll_seconds:
+            return 0
+        self._last_poll = now
+        lookback = cursor_at(max(int(self.cursor[:13]) - DELTA_LOOKBACK_MS, 0) / 1000)
+        applied = self.apply(self.log.read(self.collection, lookback))
+        # 겹쳐 읽는 구간보다 오래된 seq는 다시 나오지 않으므로 정리
+        self._applied = {seq for seq in self._applied if seq > lookback}
+        if applied:
+            logger.info(f"🔄 변경분 {applied}건 반영 ({self.collection}, 현재 {len(self.index)}개)")
+        return applied
+
+
+def compact(follower: DeltaFollower, root: str) -> Any:
+    """
+    지금까지의 변경분을 반영한 새 스냅샷을 root/<버전>에 저장
+
+    manifest의 delta_cursor에 반영한 위치를 기록하므로 새 스냅샷을 연 컨테이너는 그 뒤부터 따라갑니다.
+    """
+    follower.poll(force=True)
+    index = follower.index
+    generated = ("version", "created_at", "count", "dim", "dtype", "embedding_model", "files", "checksum", "delta_cursor")
+    extra = {k: v for k, v in index.manifest.items() if k not in generated}
+    return write_snapshot(
+        index.iter_items(),
+        root,
+        embedding_model=index.manifest["embedding_model"],
+        embedding_dim=index.dim,
+        dtype=index.manifest["dtype"],
+        extra={**extra, "delta_cursor": follower.cursor},
+    )
@@ -0,0 +1,224 @@
+"""
+임베딩 프로바이더
+
+질문 임베딩(index.py)과 적재 스크립트(scripts/*)가 같은 인터페이스를 사용하여
+조회 시점과 적재 시점의 모델이 어긋나지 않도록 합니다.
+
+지원 모델:
+- amazon.titan-embed-text-v1: 1536차원 (기본, 기존 데이터 호환)
+- amazon.titan-embed-text-v2:0: 256 / 512 / 1024차원, 정규화 벡터
+- text-embedding-3-small / -large: OpenAI, dimensions 파라미터로 축소 가능
+- local-hash: 외부 호출 없는 결정적 임베딩 (오프라인 테스트/벤치마크용)
+
+환경 변수:
+- EMBEDDING_MODEL_ID: 모델 ID (기본: amazon.titan-embed-text-v1)
+- EMBEDDING_DIMENSIONS: 출력 차원 (모델 기본값 사용 시 생략)
+- BEDROCK_REGION: Bedrock 리전 (기본: ap-northeast-1)
+- OPENAI_API_KEY / OPENAI_BASE_URL: OpenAI 모델 사용 시
+"""
+
+import os
+import json
+import math
+import hashlib
+import logging
+import urllib.request
+from typing import Any, Optional
+
+logger = logging.getLogger()
+
+EMBEDDING_MODEL_ID = os.environ.get("EMBEDDING_MODEL_ID", "amazon.titan-embed-text-v1")
+EMBEDDING_DIMENSIONS = os.environ.get("EMBEDDING_DIMENSIONS", "")
+BEDROCK_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+
+
+def l2_normalize(vector: list[float]) -> list[float]:
+    """단위 벡터로 정규화"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return vector
+    return [x / norm for x in vector]
+
+
+class EmbeddingProvider:
+    """
+    임베딩 프로바이더 기본 클래스
+
+    model_id와 dimensions는 저장되는 모든 아이템에 함께 기록되며
+    (`embedding_model`, `embedding_dim`), 검색 시 일치하는 아이템만 비교합니다.
+    """
+
+    model_id: str = ""
+    dimensions: int = 0
+    normalized: bool = False  # True면 출력 벡터의 노름이 1
+    max_batch_size: int = 1  # 요청 한 번에 보낼 수 있는 최대 입력 수
+
+    def embed(self, text: str) -> list[float]:
+        raise NotImplementedError
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed(text) for text in texts]
+
+    @property
+    def key(self) -> str:
+        """모델 + 차원 식별자 (콘텐츠 해시 등에 사용)"""
+        return f"{self.model_id}:{self.dimensions}"
+
+    def metadata(self) -> dict[str, Any]:
+        """저장 아이템에 함께 기록할 필드"""
+        return {"embedding_model": self.model_id, "embedding_dim": self.dimensions}
+
+    def matches(self, item: dict[str, Any]) -> bool:
+        """저장된 아이템이 같은 모델/차원으로 임베딩되었는지 확인 (메타데이터 없는 기존 아이템은 Titan v1)"""
+        model = item.get("embedding_model", TitanV1Provider.model_id)
+        dim = int(item.get("embedding_dim", TitanV1Provider.dimensions))
+        return model == self.model_id and dim == self.dimensions
+
+
+class TitanV1Provider(EmbeddingProvider):
+    """Bedrock Titan Text Embeddings v1 (1536차원 고정)"""
+
+    model_id = "amazon.titan-embed-text-v1"
+    dimensions = 1536
+
+    def __init__(self, client: Any = None, normalize: bool = False):
+        self._client = client
+        self.normalized = normalize
+        self.client_side_normalize = normalize  # v1은 정규화 옵션이 없어 클라이언트에서 처리
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+        return self._client
+
+    def request_body(self, text: str) -> dict[str, Any]:
+        return {"inputText": text}
+
+    def embed(self, text: str) -> list[float]:
+        response = self.client.invoke_model(
+            modelId=self.model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps(self.request_body(text))
+        )
+        embedding = json.loads(response["body"].read())["embedding"]
+        return l2_normalize(embedding) if self.client_side_normalize else embedding
+
+
+class TitanV2Provider(TitanV1Provider):
+    """Bedrock Titan Text Embeddings v2 (256 / 512 / 1024차원, 정규화 출력)"""
+
+    model_id = "amazon.titan-embed-text-v2:0"
+    SUPPORTED_DIMENSIONS = (256, 512, 1024)
+
+    def __init__(self, client: Any = None, dimensions: int = 512):
+        if dimensions not in self.SUPPORTED_DIMENSIONS:
+            raise ValueError(f"❌ Titan v2 지원 차원: {self.SUPPORTED_DIMENSIONS} (요청: {dimensions})")
+        super().__init__(client)
+        self.dimensions = dimensions
+        self.normalized = True
+        self.client_side_normalize = False
+
+    def request_body(self, text: str) -> dict[str, Any]:
+        return {"inputText": text, "dimensions": self.dimensions, "normalize": True}
+
+
+class OpenAIProvider(EmbeddingProvider):
+    """
+    OpenAI text-embedding-3 계열 (요청당 최대 2048개 입력)
+
+    비동기 클라이언트를 쓰는 호출자는 `request_body()` / `parse_response()`만 사용해도 됩니다.
+    """
+
+    DEFAULT_DIMENSIONS = {"text-embedding-3-small": 1536, "text-embedding-3-large": 3072}
+    max_batch_size = 2048
+
+    def __init__(self, model_id: str = "text-embedding-3-small", dimensions: Optional[int] = None,
+                 api_key: Optional[str] = None, base_url: str = OPENAI_BASE_URL):
+        self.model_id = model_id
+        self.dimensions = dimensions or self.DEFAULT_DIMENSIONS.get(model_id, 1536)
+        self.normalized = True
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+        self.url = f"{base_url}/embeddings"
+
+    def request_body(self, texts: list[str]) -> dict[str, Any]:
+        body: dict[str, Any] = {"model": self.model_id, "input": texts}
+        if self.dimensions != self.DEFAULT_DIMENSIONS.get(self.model_id):
+            body["dimensions"] = self.dimensions
+        return body
+
+    @staticmethod
+    def parse_response(payload: dict[str, Any]) -> list[list[float]]:
+        data = sorted(payload["data"], key=lambda d: d["index"])
+        return [d["embedding"] for d in data]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(self.request_body(texts)).encode("utf-8"),
+            headers={"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return self.parse_response(json.loads(response.read()))
+
+    def embed(self, text: str) -> list[float]:
+        return self.embed_batch([text])[0]
+
+
+class LocalHashProvider(EmbeddingProvider):
+    """
+    결정적 로컬 임베딩 (문자 2·3-gram feature hashing)
+
+    네트워크 없이 같은 입력에 항상 같은 벡터를 반환하며,
+    글자가 많이 겹치는 문장끼리는 코사인 유사도가 높게 나옵니다.
+    """
+
+    model_id = "local-hash"
+    max_batch_size = 4096
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.normalized = True
+
+    def embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        normalized = " ".join(text.lower().split())
+        for n in (2, 3):
+            for i in range(len(normalized) - n + 1):
+                digest = hashlib.blake2b(normalized[i:i + n].encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vector[(value >> 1) % self.dimensions] += sign
+        return l2_normalize(vector)
+
+
+def get_provider(
+    model_id: Optional[str] = None,
+    dimensions: Optional[int] = None,
+    bedrock_client: Any = None,
+    normalize: bool = False,
+) -> EmbeddingProvider:
+    """
+    모델 ID로 프로바이더 생성 (인자 생략 시 환경 변수 사용)
+
+    normalize는 자체 정규화 옵션이 없는 Titan v1에만 적용됩니다.
+    """
+    model_id = model_id or EMBEDDING_MODEL_ID
+    if dimensions is None and EMBEDDING_DIMENSIONS:
+        dimensions = int(EMBEDDING_DIMENSIONS)
+
+    if model_id == TitanV1Provider.model_id:
+        if dimensions not in (None, TitanV1Provider.dimensions):
+            raise ValueError(f"❌ Titan v1은 {TitanV1Provider.dimensions}차원만 지원합니다")
+        return TitanV1Provider(bedrock_client, normalize=normalize)
+    if model_id.startswith("amazon.titan-embed-text-v2"):
+        return TitanV2Provider(bedrock_client, dimensions=dimensions or 512)
+    if model_id.startswith("text-embedding-"):
+        return OpenAIProvider(model_id, dimensions)
+    if model_id == LocalHashProvider.model_id:
+        return LocalHashProvider(dimensions or 256)
+    raise ValueError(f"❌ 지원하지 않는 임베딩 모델: {model_id}")
@@ -1,14 +1,40 @@
 import json
 import boto3
-import requests
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
+import uuid
+from functools import lru_cache
+
+from embeddings import get_provider
+from intent_classifier import canned_response
+from keyword_engine import get_engine
+from news_index import NewsIndex
+from news_prefetch import GAME_KEYWORDS, GENERIC_TERMS, NewsPrefetchStore, call_bigkinds_api
+from profiler import profiled
+from rate_limit import GENERATE, RateLimiter, too_many_requests
+from response_cache import SemanticResponseCache, sources_fingerprint
+from session_store import Session, SessionStore
 
 # 로깅 설정
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# 대화 세션 (최근 턴 + 누적 요약)
+session_store = SessionStore()
+
+# 클라이언트별 요청 제한 (generate 버킷)
+rate_limiter = RateLimiter()
+
+# 의미 기반 응답 캐시 (게임 타입 + 질문 임베딩, 컨테이너 재사용 시 유지)
+response_cache = SemanticResponseCache()
+embedding_provider = get_provider()
+
+# 게임별 사전 수집 뉴스와 뉴스 벡터 인덱스 (news_prefetch.handler가 주기적으로 갱신)
+news_store = NewsPrefetchStore()
+news_index = NewsIndex()
+
+@profiled
 def lambda_handler(event, context):
     """
     RAG 기반 Claude 챗봇 Lambda 핸들러
@@ -20,7 +46,7 @@ def lambda_handler(event, context):
         'Content-Type': 'application/json',
         'Access-Control-Allow-Origin': '*',
         'Access-Control-Allow-Methods': 'POST, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type'
+        'Access-Control-Allow-Headers': 'Content-Type, X-Api-Key'
     }
     
     # OPTIONS 요청 처리
@@ -37,6 +63,7 @@ def lambda_handler(event, context):
         user_question = body.get('question', '')
         game_type = body.get('gameType', '')
         question_text = body.get('questionText', '')
+        session_id = body.get('sessionId')
         quiz_article_url = body.get('quizArticleUrl', '')
         
         if not user_question:
@@ -49,6 +76,31 @@ def lambda_handler(event, context):
                 })
             }
         
+        session = load_session(session_id)
+        
+        # 정형 의도는 템플릿으로 바로 응답 (모델 호출 생략)
+        canned = canned_response(user_question, game_type)
+        if canned:
+            intent, response_text = canned
+            logger.info(f"Intent fast path: {intent.name} ({intent.confidence:.2f})")
+            save_turn(session, user_question, response_text)
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': json.dumps({
+                    'response': response_text,
+                    'intent': intent.name,
+                    'sessionId': session.session_id,
+                    'timestamp': datetime.now().isoformat(),
+                    'success': True
+                })
+            }
+        
+        # 클라이언트별 요청 제한 (Claude 호출 전, 템플릿 응답은 제한하지 않음)
+        retry_after = rate_limiter.check(event, GENERATE)
+        if retry_after:
+            return too_many_requests(retry_after, headers)
+        
         logger.info(f"RAG Query: {user_question[:50]}... (Game: {game_type})")
         
         # RAG 지식 베이스 수집
@@ -63,8 +115,13 @@ def lambda_handler(event, context):
         claude_response = generate_claude_rag_response(
             user_question,
             knowledge_base,
-            game_type
+            game_type,
+            session
         )
+        # 대체 응답은 다음 프롬프트의 대화 기록으로 쓰이지 않도록 저장하지 않음
+        if not isinstance(claude_response, FallbackResponse):
+            save_turn(session, user_question, claude_response)
+        logger.info(f"Response cache stats: {response_cache.stats()}")
         
         return {
             'statusCode': 200,
@@ -72,6 +129,7 @@ def lambda_handler(event, context):
             'body': json.dumps({
                 'response': claude_response,
                 'knowledge_sources': len(knowledge_base.get('sources', [])),
+                'sessionId': session.session_id,
                 'timestamp': datetime.now().isoformat(),
                 'success': True
             })
@@ -88,6 +146,31 @@ def lambda_handler(event, context):
             })
         }
 
+class FallbackResponse(str):
+    """
+    Claude 실패 시 대체 응답 (세션 대화 기록에는 남기지 않음)
+    """
+
+def load_session(session_id):
+    """
+    대화 세션 조회 (저장소 오류 시 새 세션으로 진행)
+    """
+    try:
+        return session_store.load(session_id)
+    except Exception as e:
+        logger.error(f"Session load error: {str(e)}")
+        return Session(session_id=session_id or uuid.uuid4().hex)
+
+def save_turn(session, user_question, claude_response):
+    """
+    이번 턴을 세션에 기록 (저장 실패는 응답에 영향 없음)
+    """
+    try:
+        session.add_turn(user_question, claude_response)
+        session_store.save(session)
+    except Exception as e:
+        logger.error(f"Session save error: {str(e)}")
+
 def build_rag_knowledge_base(user_question, question_text, quiz_article_url, game_type):
     """
     RAG 지식 베이스 구축 (3개 소스)
@@ -138,20 +221,27 @@ def build_rag_knowledge_base(user_question, question_text, quiz_article_url, gam
 
 def fetch_bigkinds_knowledge(user_question, game_type):
     """
-    BigKinds API에서 관련 뉴스 지식 수집
+    BigKinds 관련 뉴스 지식 수집
+    뉴스 벡터 인덱스에서 질문과 가까운 기사를 먼저 찾고,
+    없으면 키워드로 사전 수집 저장본 → API 실시간 호출 순으로 확인
     """
     try:
-        api_key = os.environ.get('BIGKINDS_API_KEY')
-        if not api_key:
-            logger.warning("BigKinds API key not found")
-            return None
-        
-        # 게임별 키워드 추출
-        keywords = extract_search_keywords(user_question, game_type)
-        logger.info(f"BigKinds search keywords: {keywords}")
+        news_data = search_news_index(user_question)
         
-        # API 호출
-        news_data = call_bigkinds_api(keywords, api_key)
+        if news_data is None:
+            # 게임별 키워드 추출
+            keywords = extract_search_keywords(user_question, game_type)
+            logger.info(f"BigKinds search keywords: {keywords}")
+            news_data = news_store.lookup(game_type, keywords)
+            
+            if news_data is None:
+                api_key = os.environ.get('BIGKINDS_API_KEY')
+                if not api_key:
+                    logger.warning("BigKinds API key not found")
+                    return None
+                
+                # API 호출
+                news_data = call_bigkinds_api(keywords, api_key)
         
         if news_data and news_data.get('return_object', {}).get('documents'):
             articles = news_data['return_object']['documents'][:3]
@@ -175,6 +265,32 @@ def fetch_bigkinds_knowledge(user_question, game_type):
     
     return None
 
+def search_news_index(user_question):
+    """
+    뉴스 벡터 인덱스 검색 (BigKinds 응답과 같은 형식, 맞는 기사가 없으면 None)
+    """
+    if not news_index.enabled:
+        return None
+    try:
+        articles = news_index.search(embed_question(user_question))
+    except Exception as e:
+        logger.error(f"News index search error: {str(e)}")
+        return None
+    if not articles:
+        return None
+    logger.info(f"News index hits: {[round(a['similarity'], 3) for a in articles]}")
+    return {'return_object': {'documents': articles}}
+
+@lru_cache(maxsize=64)
+def _embed_question(user_question):
+    return tuple(embedding_provider.embed(user_question))
+
+def embed_question(user_question):
+    """
+    질문 임베딩 (뉴스 검색과 응답 캐시가 같은 질문을 두 번 임베딩하지 않도록 캐시)
+    """
+    return list(_embed_question(user_question))
+
 def fetch_quiz_article_knowledge(article_url):
     """
     퀴즈 관련 기사 내용 추출 (URL에서)
@@ -195,74 +311,32 @@ def fetch_quiz_article_knowledge(article_url):
 def extract_search_keywords(user_question, game_type):
     """
     사용자 질문에서 검색 키워드 추출
+    같은 의도의 질문은 같은 쿼리가 되도록 정규형 용어를 정렬하여 반환
     """
-    # 기본 키워드
-    base_keywords = []
-    
-    # 사용자 질문에서 핵심 단어 추출
-    question_words = user_question.replace('?', '').replace('!', '').split()
-    meaningful_words = [word for word in question_words if len(word) > 2]
-    base_keywords.extend(meaningful_words[:3])
-    
-    # 게임별 관련 키워드 추가
-    game_keywords = {
-        'BlackSwan': ['위기', '리스크', '예측', '충격'],
-        'PrisonersDilemma': ['경쟁', '협력', '전략', '딜레마'],
-        'SignalDecoding': ['지표', '신호', '분석', '데이터']
-    }
-    
-    if game_type in game_keywords:
-        base_keywords.extend(game_keywords[game_type][:2])
-    
-    # 경제 관련 키워드 추가
-    base_keywords.extend(['경제', '금융'])
-    
-    return ' '.join(base_keywords[:5])
-
-def call_bigkinds_api(keywords, api_key):
-    """
-    BigKinds API 호출
-    """
-    try:
-        url = "https://www.bigkinds.or.kr/api/news/search"
-        
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=30)
-        
-        params = {
-            'access_key': api_key,
-            'argument': {
-                'query': keywords,
-                'published_at': {
-                    'from': start_date.strftime('%Y-%m-%d'),
-                    'until': end_date.strftime('%Y-%m-%d')
-                },
-                'provider': ['서울경제', '한국경제', '매일경제', '연합뉴스'],
-                'category': ['경제', '사회', '정치'],
-                'sort': {'date': 'desc'},
-                'hilight': 200,
-                'return_from': 0,
-                'return_size': 3
-            }
-        }
-        
-        response = requests.post(url, json=params, timeout=15)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            logger.error(f"BigKinds API error: {response.status_code}")
-            return None
-            
-    except Exception as e:
-        logger.error(f"BigKinds API call failed: {str(e)}")
-        return None
+    # 질문 핵심 용어 3개 + 게임 키워드 2개 + 경제 관련 키워드 (최대 5개)
+    extra = GAME_KEYWORDS.get(game_type, [])[:2] + list(GENERIC_TERMS)
+    return get_engine().query(user_question, limit=3, extra=extra, max_terms=5)
 
-def generate_claude_rag_response(user_question, knowledge_base, game_type):
+def generate_claude_rag_response(user_question, knowledge_base, game_type, session=None):
     """
     RAG 기반 Claude 순수 응답 생성
+    session이 있으면 누적 요약(system)과 최근 턴(messages)을 토큰 상한 내에서 포함
+    대화 기록이 없는 질문은 의미 기반 캐시를 먼저 확인 (같은 게임 타입, 같은 RAG 소스)
     """
     try:
+        # 의미 기반 응답 캐시 (이전 대화에 따라 답이 달라지므로 기록이 없을 때만)
+        cache_embedding = None
+        sources_key = sources_fingerprint(knowledge_base)
+        if not (session and (session.turns or session.summary)):
+            try:
+                cache_embedding = embed_question(user_question)
+            except Exception as e:
+                logger.error(f"Cache embedding error: {str(e)}")
+            if cache_embedding:
+                cached = response_cache.lookup(game_type, cache_embedding, sources_key)
+                if cached:
+                    return cached.answer
+
         # Bedrock 클라이언트 초기화
         bedrock = boto3.client(
             service_name='bedrock-runtime',
@@ -312,6 +386,13 @@ def generate_claude_rag_response(user_question, knowledge_base, game_type):
 
 위 질문에 대해 경제 전문가로서 전문적이고 통찰력 있는 답변을 해주세요."""
 
+        # 이전 대화 (요약 + 최근 턴)
+        history = []
+        if session:
+            if session.summary:
+                system_prompt += f"\n\n이전 대화 요약:\n{session.summary}"
+            history = session.history_messages()
+
         # Claude 모델 호출
         model_id = "anthropic.claude-3-sonnet-20240229-v1:0"
         
@@ -319,7 +400,7 @@ def generate_claude_rag_response(user_question, knowledge_base, game_type):
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 1000,
             "system": system_prompt,
-            "messages": [
+            "messages": history + [
                 {
                     "role": "user",
                     "content": user_prompt
@@ -340,6 +421,8 @@ def generate_claude_rag_response(user_question, knowledge_base, game_type):
             claude_response = response_body['content'][0]['text']
             knowledge_status = "RAG" if has_external_knowledge else "Pure Claude"
             logger.info(f"Claude {knowledge_status} response generated successfully")
+            if cache_embedding:
+                response_cache.store(game_type, cache_embedding, user_question, claude_response, sources_key)
             return claude_response
         else:
             logger.error("Empty response from Claude")
@@ -400,4 +483,4 @@ def generate_fallback_response(user_question, game_type):
     
     base_response += "\n\n더 구체적인 질문이 있으시면 언제든 말씀해 주세요."
     
-    return base_response
\ No newline at end of file
+    return FallbackResponse(base_response)
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Q&A 인덱스 세대 (blue/green 게시)
+
+적재 스크립트가 라이브 컬렉션의 아이템을 직접 지우고 다시 쓰면 그동안 index.py는 반쯤 바뀐 코퍼스로
+응답합니다. 대신 새 세대를 별도 네임스페이스(source = "<컬렉션>@<세대>")에 모두 쓰고 검증한 뒤,
+컬렉션 포인터 아이템 하나를 조건부 쓰기로 원자적으로 바꿔 게시합니다.
+
+- 세대 아이템의 id / parent_id 앞에는 "<세대>#"가 붙어 라이브 세대 아이템과 겹치지 않습니다.
+- 롤백은 포인터를 이전 세대로 되돌리는 것뿐이므로 즉시 적용됩니다 (이전 세대 아이템은 GENERATION_KEEP개까지 보관).
+- 보관 범위를 벗어난 세대와 게시되지 않은 빌드는 garbage()로 골라 컬렉션 Query + 배치 삭제로 한꺼번에 지웁니다.
+- 웜 컨테이너는 GENERATION_POLL_SECONDS마다 포인터만 다시 읽어, 다음 요청부터 새 세대 네임스페이스를 검색합니다
+  (스냅샷 백엔드는 새 세대 스냅샷만 새로 열고 이전 세대 인덱스는 버림).
+
+포인터 아이템 (파티션 키 collection):
+{collection, generation: 라이브 세대, history: [이전 라이브 세대, ...], builds: [만든 세대 전체], revision}
+모든 변경은 읽기 → 수정 → revision 조건부 쓰기로 처리하여 동시에 실행된 게시/롤백 중 하나만 성공합니다.
+포인터가 없는 컬렉션은 기존처럼 source = 컬렉션 이름을 그대로 검색합니다.
+
+저장 백엔드:
+- DynamoDB: GENERATION_TABLE 설정 시
+- 메모리: 로컬 테스트용 (MemoryPointerBackend)
+
+테이블 생성: python scripts/create_generation_table.py
+세대 조회/롤백/정리: python scripts/index_generations.py
+
+환경 변수:
+- GENERATION_TABLE: 포인터 테이블명 (기본: 없음 → index.py는 세대 없이 컬렉션 이름으로 검색)
+- GENERATION_POLL_SECONDS: 웜 컨테이너의 포인터 확인 간격 (기본: 5)
+- GENERATION_KEEP: 롤백용으로 보관할 이전 세대 수 (기본: 2)
+"""
+
+import os
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+logger = logging.getLogger()
+
+GENERATION_TABLE = os.environ.get("GENERATION_TABLE", "")
+GENERATION_POLL_SECONDS = float(os.environ.get("GENERATION_POLL_SECONDS", "5"))
+GENERATION_KEEP = int(os.environ.get("GENERATION_KEEP", "2"))
+
+SOURCE_SEPARATOR = "@"
+ID_SEPARATOR = "#"
+
+
+class GenerationConflict(RuntimeError):
+    """포인터가 그사이 다른 실행에 의해 바뀜 (게시/롤백 실패)"""
+
+
+def new_generation() -> str:
+    """새 세대 이름 (UTC 타임스탬프, 문자열 순서 = 생성 순서)"""
+    return datetime.now(timezone.utc).strftime("g%Y%m%dT%H%M%SZ")
+
+
+def generation_source(collection: str, generation: str) -> str:
+    """세대 아이템의 source 값 (컬렉션 GSI 파티션)"""
+    return f"{collection}{SOURCE_SEPARATOR}{generation}"
+
+
+def namespaced(row: dict[str, Any], generation: str) -> dict[str, Any]:
+    """세대 네임스페이스 아이템 (id / parent_id에 세대 접두사)"""
+    row = {**row, "id": f"{generation}{ID_SEPARATOR}{row['id']}"}
+    if row.get("parent_id"):
+        row["parent_id"] = f"{generation}{ID_SEPARATOR}{row['parent_id']}"
+    return row
+
+
+class MemoryPointerBackend:
+    """프로세스 메모리 포인터 (로컬 테스트용)"""
+
+    def __init__(self):
+        self._items: dict[str, dict[str, Any]] = {}
+
+    def get(self, collection: str) -> Optional[dict[str, Any]]:
+        item = self._items.get(collection)
+        return {**item, "history": list(item["history"]), "builds": list(item["builds"])} if item else None
+
+    def put(self, item: dict[str, Any], revision: int) -> bool:
+        """현재 revision이 일치할 때만 저장 (없는 아이템은 revision 0)"""
+        current = self._items.get(item["collection"])
+        if (current["revision"] if current else 0) != revision:
+            return False
+        self._items[item["collection"]] = item
+        return True
+
+
+class DynamoPointerBackend:
+    """DynamoDB 포인터 (강한 일관성 읽기 + revision 조건부 쓰기)"""
+
+    def __init__(self, table: Any):
+        self.table = table
+
+    def get(self, collection: str) -> Optional[dict[str, Any]]:
+        item = self.table.get_item(Key={"collection": collection}, ConsistentRead=True).get("Item")
+        if item:
+            item["revision"] = int(item["revision"])
+        return item
+
+    def put(self, item: dict[str, Any], revision: int) -> bool:
+        from botocore.exceptions import ClientError
+
+        if revision:
+            condition, values = "revision = :revision", {":revision": revision}
+        else:
+            condition, values = "attribute_not_exists(#c)", {}
+        kwargs: dict[str, Any] = {"Item": item, "ConditionExpression": condition}
+        if values:
+            kwargs["ExpressionAttributeValues"] = values
+        else:
+            kwargs["ExpressionAttributeNames"] = {"#c": "collection"}
+        try:
+            self.table.put_item(**kwargs)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+
+
+class GenerationPointers:
+    """컬렉션 → 라이브 세대 포인터"""
+
+    def __init__(self, backend: Any = None, poll_seconds: float = GENERATION_POLL_SECONDS):
+        self.backend = backend or default_backend()
+        self.poll_seconds = poll_seconds
+        self._cache: dict[str, tuple[float, str]] = {}  # 컬렉션 → (확인 시각, source)
+
+    def get(self, collection: str) -> dict[str, Any]:
+        item = self.backend.get(collection)
+        return item or {"collection": collection, "generation": "", "history": [], "builds": [], "revision": 0}
+
+    def live_source(self, collection: str) -> str:
+        """검색할 source (poll_seconds 동안 캐시, 포인터가 없으면 컬렉션 이름)"""
+        now = time.time()
+        cached = self._cache.get(collection)
+        if cached is None or now - cached[0] >= self.poll_seconds:
+            generation = self.get(collection)["generation"]
+            source = generation_source(collection, generation) if generation else collection
+            if cached and cached[1] != source:
+                logger.info(f"🔀 세대 전환 감지: {cached[1]} → {source}")
+            cached = (now, source)
+            self._cache[collection] = cached
+        return cached[1]
+
+    def _update(self, collection: str, change: Any) -> dict[str, Any]:
+        """읽기 → change(item) → revision 조건부 쓰기 (경합 시 GenerationConflict)"""
+        item = self.get(collection)
+        revision = item["revision"]
+        change(item)
+        item["revision"] = revision + 1
+        item["updated_at"] = datetime.now(timezone.utc).isoformat()
+        if not self.backend.put(item, revision):
+            raise GenerationConflict(f"❌ {collection} 포인터가 다른 실행에 의해 변경됨, 다시 시도하세요")
+        self._cache.pop(collection, None)
+        return item
+
+    def register(self, collection: str, generation: str) -> None:
+        """빌드 시작 기록 (실패한 빌드도 나중에 정리할 수 있도록)"""
+        def change(item: dict[str, Any]) -> None:
+            if generation not in item["builds"]:
+                item["builds"].append(generation)
+
+        self._update(collection, change)
+
+    def publish(self, collection: str, generation: str, expected: Optional[str] = None) -> dict[str, Any]:
+        """
+        generation을 라이브로 전환 (expected를 주면 라이브 세대가 그대로일 때만)
+
+        이전 라이브 세대는 history 끝에 쌓여 rollback()으로 되돌릴 수 있습니다.
+        """
+        def change(item: dict[str, Any]) -> None:
+            if generation not in item["builds"]:
+                raise ValueError(f"❌ 등록되지 않은 세대: {generation}")
+            if expected is not None and item["generation"] != expected:
+                raise GenerationConflict(f"❌ 라이브 세대가 {expected}에서 {item['generation']}(으)로 바뀌어 게시 중단")
+            if item["generation"] and item["generation"] != generation:
+                item["history"] = [g for g in item["history"] if g != item["generation"]] + [item["generation"]]
+            item["history"] = [g for g in item["history"] if g != generation]
+            item["generation"] = generation
+
+        item = self._update(collection, change)
+        logger.info(f"🚀 {collection} 라이브 세대: {generation}")
+        return item
+
+    def rollback(self, collection: str) -> dict[str, Any]:
+        """직전 라이브 세대로 되돌리기 (되돌린 세대는 다시 게시할 수 있도록 builds에 남김)"""
+        def change(item: dict[str, Any]) -> None:
+            if not item["history"]:
+                raise ValueError(f"❌ {collection}: 되돌릴 이전 세대가 없습니다")
+            item["generation"] = item["history"].pop()
+
+        item = self._update(collection, change)
+        logger.info(f"⏪ {collection} 롤백: {item['generation']}")
+        return item
+
+    def garbage(self, collection: str, keep: int = GENERATION_KEEP) -> list[str]:
+        """지워도 되는 세대 (라이브, 최근 keep개 이전 세대, 게시 전 최신 빌드는 제외)"""
+        item = self.get(collection)
+        if not item["generation"]:
+            return []
+        retained = {item["generation"], *item["history"][-keep:]} if keep else {item["generation"]}
+        # 라이브보다 새 빌드는 진행 중일 수 있으므로 남김
+        return [g for g in item["builds"] if g not in retained and g < item["generation"]]
+
+    def forget(self, collection: str, generations: list[str]) -> None:
+        """아이템을 지운 세대를 포인터에서 제거"""
+        def change(item: dict[str, Any]) -> None:
+            if item["generation"] in generations:
+                raise ValueError(f"❌ 라이브 세대는 지울 수 없습니다: {item['generation']}")
+            item["builds"] = [g for g in item["builds"] if g not in generations]
+            item["history"] = [g for g in item["history"] if g not in generations]
+
+        self._update(collection, change)
+
+
+_default_backend = None
+
+
+def default_backend() -> Any:
+    """GENERATION_TABLE이 있으면 DynamoDB, 없으면 메모리 백엔드 (컨테이너 재사용 시 캐시)"""
+    global _default_backend
+    if _default_backend is None:
+        if GENERATION_TABLE:
+            import boto3
+
+            region = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+            _default_backend = DynamoPointerBackend(boto3.resource("dynamodb", region_name=region).Table(GENERATION_TABLE))
+        else:
+            _default_backend = MemoryPointerBackend()
+    return _default_backend
@@ -19,16 +19,48 @@ AWS Lambda Handler - Bedrock + DynamoDB Q&A Chatbot
 - BEDROCK_REGION: AWS 리전 (기본: ap-northeast-1)
 - BEDROCK_MODEL_ID: Claude 모델 ID
 - DYNAMODB_TABLE: DynamoDB 테이블명 (기본: qa-documents)
+- EMBEDDING_MODEL_ID / EMBEDDING_DIMENSIONS: 질문 임베딩 모델 (embeddings.py 참고, 적재 시와 동일해야 함)
+- PROFILE_SAMPLE_RATE / PROFILE_TOKEN: 샘플링 프로파일러 (profiler.py 참고)
+- SIMILARITY_THRESHOLD / TOP_K: 검색 임계값 (기본: 0.7) / 후보 수 (기본: 3)
+- COLLECTIONS: 검색을 허용하는 컬렉션 목록, 쉼표 구분 (기본: perso.ai,excel,documents,test)
+  목록에 없는 collection 요청은 400으로 거절합니다.
+- DEFAULT_COLLECTION: 요청에 collection이 없을 때 검색할 컬렉션 (기본: 없음 → COLLECTIONS 전체에서 최고 결과)
+- COLLECTION_INDEX: 컬렉션 GSI 이름 (qa_store.py 참고)
+- SEARCH_BACKEND: 검색 방식 (dynamodb: 컬렉션 Query [기본] / snapshot: 스냅샷 memory-map /
+  pgvector: Supabase RPC로 Postgres에서 최근접 검색, pgvector_store.py 참고 /
+  sharded: 샤드 워커에 scatter-gather, shards.py 참고)
+- SHARD_COUNT / SHARD_FUNCTION / SHARD_TIMEOUT_SECONDS: sharded 백엔드 설정 (shards.py 참고)
+- SNAPSHOT_REFRESH_SECONDS: sharded 로컬 샤드가 LATEST를 다시 읽는 간격 (기본: 60, snapshot.py 참고)
+- SNAPSHOT_PATH: 스냅샷 루트 (기본: 배포 패키지의 snapshot/, 컬렉션별 하위 디렉터리)
+- SNAPSHOT_S3_BUCKET / SNAPSHOT_S3_PREFIX: 설정 시 콜드 스타트에 /tmp로 내려받아 사용
+- DELTA_TABLE: 설정 시 snapshot 백엔드가 테이블 변경분을 따라가며 인덱스를 증분 갱신 (deltas.py 참고)
+- INDEX_VERSION: dynamodb / pgvector / sharded 백엔드의 인덱스 버전 접두사 (설정 변경 시 캐시 무효화용)
+  데이터 버전은 적재 스크립트가 올리는 컬렉션 버전 아이템에서 읽습니다 (qa_store.py 참고, snapshot 백엔드는 스냅샷 버전 사용)
+- INDEX_VERSION_POLL_SECONDS: 웜 컨테이너가 컬렉션 버전 아이템을 다시 읽는 간격 (기본: 5)
+- ANSWER_CACHE_MAX_AGE / ANSWER_CDN_MAX_AGE: GET 응답의 브라우저 / CDN 캐시 시간(초)
+- RATE_LIMIT_TABLE / RATE_LIMIT_EMBED_RATE / RATE_LIMIT_EMBED_BURST: 클라이언트별 요청 제한 (rate_limit.py 참고)
+- GENERATION_TABLE / GENERATION_POLL_SECONDS: 설정 시 컬렉션 포인터가 가리키는 라이브 세대를 검색 (generations.py 참고)
 """
 
 import json
 import os
+import hashlib
 import logging
 import math
+import shutil
+import time
+from pathlib import Path
 from typing import Any, Optional
 import boto3
 from botocore.exceptions import ClientError
 
+from chunker import collapse_hits
+from embeddings import get_provider
+from generations import GENERATION_TABLE, SOURCE_SEPARATOR, GenerationPointers
+from profiler import profiled
+from rate_limit import EMBED, RateLimiter, too_many_requests
+from qa_store import collection_version, query_collection
+
 # 로깅 설정
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -46,29 +78,42 @@ dynamodb = boto3.resource(
 # 설정
 BEDROCK_MODEL_ID = os.environ.get("BEDROCK_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0")
 DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
-
-# 설정
-BEDROCK_MODEL_ID = os.environ.get("BEDROCK_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0")
-DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
-SIMILARITY_THRESHOLD = 0.7
-TOP_K = 3
+# 임계값/Top-K는 scripts/evaluate_retrieval.py 결과로 조정
+SIMILARITY_THRESHOLD = float(os.environ.get("SIMILARITY_THRESHOLD", "0.7"))
+TOP_K = int(os.environ.get("TOP_K", "3"))
+COLLECTIONS = [c.strip() for c in os.environ.get("COLLECTIONS", "perso.ai,excel,documents,test").split(",") if c.strip()]
+DEFAULT_COLLECTION = os.environ.get("DEFAULT_COLLECTION", "")
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "dynamodb")
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", str(Path(__file__).parent / "snapshot"))
+SNAPSHOT_S3_BUCKET = os.environ.get("SNAPSHOT_S3_BUCKET", "")
+SNAPSHOT_S3_PREFIX = os.environ.get("SNAPSHOT_S3_PREFIX", "snapshots/qa/")
+SNAPSHOT_TMP_DIR = "/tmp/qa-snapshot"
+DELTA_TABLE = os.environ.get("DELTA_TABLE", "")
+INDEX_VERSION = os.environ.get("INDEX_VERSION", "dynamodb")
+INDEX_VERSION_POLL_SECONDS = float(os.environ.get("INDEX_VERSION_POLL_SECONDS", "5"))
+PGVECTOR_VERSION_KEY = "pgvector"  # 컬렉션 구분 없는 pgvector 적재(scripts/ingest.py)의 버전 키
+ANSWER_CACHE_MAX_AGE = int(os.environ.get("ANSWER_CACHE_MAX_AGE", "60"))
+ANSWER_CDN_MAX_AGE = int(os.environ.get("ANSWER_CDN_MAX_AGE", "300"))
 
 # DynamoDB 테이블
 table = dynamodb.Table(DYNAMODB_TABLE)
 
+# 임베딩 프로바이더 (적재 스크립트와 같은 모델/차원 사용)
+embedding_provider = get_provider(bedrock_client=bedrock)
+
+# 클라이언트별 요청 제한 (embed 버킷)
+rate_limiter = RateLimiter()
+
+# 컬렉션 → 라이브 세대 포인터 (GENERATION_TABLE 미설정 시 컬렉션 이름 그대로 검색)
+generation_pointers = GenerationPointers() if GENERATION_TABLE else None
+
 
-def embed_text_bedrock(text: str) -> list[float]:
-    """Bedrock Titan Embeddings으로 텍스트 임베딩"""
+def embed_text(text: str) -> list[float]:
+    """설정된 임베딩 프로바이더로 텍스트 임베딩"""
     try:
-        response = bedrock.invoke_model(
-            modelId="amazon.titan-embed-text-v1",
-            contentType="application/json",
-            accept="application/json",
-            body=json.dumps({"inputText": text})
-        )
-        response_body = json.loads(response["body"].read())
-        logger.info(f"✅ 임베딩 생성 완료: {text[:50]}...")
-        return response_body["embedding"]
+        embedding = embedding_provider.embed(text)
+        logger.info(f"✅ 임베딩 생성 완료 ({embedding_provider.key}): {text[:50]}...")
+        return embedding
     except ClientError as e:
         logger.error(f"❌ Bedrock 임베딩 오류: {str(e)}")
         raise
@@ -85,20 +130,263 @@ def cosine_similarity(vec1: list[float], vec2: list[float]) -> float:
     return dot_product / (norm1 * norm2)
 
 
-def search_similar_qa(embedding: list[float]) -> Optional[dict[str, Any]]:
-    """DynamoDB에서 유사한 Q&A 검색"""
+_snapshot_indexes: dict[str, Any] = {}
+_delta_followers: dict[str, Any] = {}
+_delta_log: Any = None
+_pgvector: Any = None
+_coordinators: dict[str, Any] = {}
+_live_sources: dict[str, str] = {}
+
+
+def live_source(collection: str) -> str:
+    """
+    컬렉션의 현재 검색 대상 source (라이브 세대 네임스페이스)
+
+    포인터가 다른 세대로 바뀌면 이전 세대의 스냅샷 인덱스/변경분 팔로워/샤드 코디네이터를 버려
+    웜 컨테이너가 다음 요청부터 새 세대만 로드합니다. 포인터를 읽지 못하면 마지막으로 본 세대를 계속 씁니다.
+    """
+    if generation_pointers is None:
+        return collection
+    previous = _live_sources.get(collection)
     try:
-        # DynamoDB에서 모든 문서 가져오기
-        response = table.scan()
-        items = response.get("Items", [])
-        logger.info(f"📊 DynamoDB에서 {len(items)}개 문서 검색")
+        source = generation_pointers.live_source(collection)
+    except Exception as e:
+        logger.warning(f"⚠️  세대 포인터 조회 실패, 기존 세대 사용: {str(e)}")
+        return previous or collection
+    if previous and previous != source:
+        index = _snapshot_indexes.pop(previous, None)
+        if index is not None:
+            index.close()
+        _delta_followers.pop(previous, None)
+        coordinator = _coordinators.pop(previous, None)
+        if coordinator is not None:
+            coordinator.close()
+        if SNAPSHOT_S3_BUCKET:
+            shutil.rmtree(f"{SNAPSHOT_TMP_DIR}/{previous}", ignore_errors=True)
+    _live_sources[collection] = source
+    return source
+
+
+def get_snapshot_index(collection: str):
+    """컬렉션 스냅샷 인덱스 (컨테이너 재사용 시 캐시)"""
+    global _delta_log
+    if collection not in _snapshot_indexes:
+        from snapshot import SnapshotIndex, download_snapshot
+
+        if SNAPSHOT_S3_BUCKET:
+            path = download_snapshot(SNAPSHOT_S3_BUCKET, f"{SNAPSHOT_S3_PREFIX}{collection}/", f"{SNAPSHOT_TMP_DIR}/{collection}")
+        else:
+            path = str(Path(SNAPSHOT_PATH) / collection)
+        index = SnapshotIndex(path)
+        manifest = {"embedding_model": index.manifest["embedding_model"], "embedding_dim": index.dim}
+        if not embedding_provider.matches(manifest):
+            raise ValueError(f"❌ 스냅샷 임베딩 모델 불일치: {manifest} (현재: {embedding_provider.key})")
+        _snapshot_indexes[collection] = index
+        if DELTA_TABLE:
+            from deltas import DeltaFollower, default_log
+
+            _delta_log = _delta_log or default_log()
+            _delta_followers[collection] = DeltaFollower(index, _delta_log, collection)
+
+    # 웜 컨테이너는 전체 재로드 없이 새 변경분만 반영 (실패해도 기존 인덱스로 계속 응답)
+    follower = _delta_followers.get(collection)
+    if follower:
+        try:
+            follower.poll()
+        except Exception as e:
+            logger.warning(f"⚠️  변경분 반영 실패, 기존 인덱스 사용: {str(e)}")
+    return _snapshot_indexes[collection]
+
+
+def search_snapshot(
+    embedding: list[float],
+    collection: str,
+    created_after: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """스냅샷(memory-map 행렬)에서 유사한 Q&A 검색"""
+    try:
+        index = get_snapshot_index(collection)
+        candidates = index.search(embedding, TOP_K, SIMILARITY_THRESHOLD, created_after=created_after)
+        if candidates:
+            logger.info(f"✅ 최고 유사도: {candidates[0]['similarity']:.2f}")
+            return candidates[0]
+        logger.warning("⚠️ 유사한 Q&A를 찾을 수 없음")
+        return None
+    except Exception as e:
+        logger.error(f"❌ 스냅샷 검색 오류: {str(e)}")
+        return {"failed": True}
+
+
+def get_pgvector():
+    """pgvector 검색 클라이언트 (컨테이너 재사용 시 커넥션 유지)"""
+    global _pgvector
+    if _pgvector is None:
+        from pgvector_store import PgVectorSearch
+
+        _pgvector = PgVectorSearch()
+    return _pgvector
+
+
+def search_pgvector(
+    embedding: list[float],
+    collection: str,
+    created_after: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    Supabase qa_embeddings에서 유사한 Q&A 검색 (Postgres 안에서 Top-K만 계산)
+
+    qa_embeddings는 scripts/ingest.py가 적재하는 단일 코퍼스라
+    collection / created_after 조건은 적용되지 않습니다.
+    """
+    try:
+        if created_after:
+            logger.warning("⚠️  pgvector 백엔드는 created_after 조건을 지원하지 않아 무시합니다")
+        candidates = get_pgvector().search(
+            embedding,
+            TOP_K,
+            SIMILARITY_THRESHOLD,
+            embedding_model=embedding_provider.model_id,
+            embedding_dim=embedding_provider.dimensions,
+        )
+        if candidates:
+            logger.info(f"✅ 최고 유사도: {candidates[0]['similarity']:.2f}")
+            return candidates[0]
+        logger.warning("⚠️ 유사한 Q&A를 찾을 수 없음")
+        return None
+    except Exception as e:
+        logger.error(f"❌ pgvector 검색 오류: {str(e)}")
+        return {"failed": True}
+
+
+def get_coordinator(collection: str):
+    """
+    컬렉션 샤드 코디네이터 (컨테이너 재사용 시 캐시)
+
+    로컬 샤드는 검색할 때마다 SNAPSHOT_REFRESH_SECONDS 간격으로 샤드 LATEST를 확인해
+    다시 내보낸 스냅샷으로 교체합니다 (shard_worker.py와 동일).
+    """
+    if collection not in _coordinators:
+        from shards import SHARD_COUNT, SHARD_FUNCTION, LocalShardWorker, ScatterGather, lambda_workers, shard_dir
+
+        if SHARD_FUNCTION:
+            workers = lambda_workers()
+        else:
+            from snapshot import LatestSnapshot
+
+            def check_model(index, shard):
+                manifest = {"embedding_model": index.manifest["embedding_model"], "embedding_dim": index.dim}
+                if not embedding_provider.matches(manifest):
+                    raise ValueError(f"❌ 샤드 {shard} 임베딩 모델 불일치: {manifest} (현재: {embedding_provider.key})")
+
+            workers = []
+            for shard in range(SHARD_COUNT):
+                snapshot = LatestSnapshot(
+                    str(Path(SNAPSHOT_PATH) / collection / shard_dir(shard)),
+                    check=lambda index, shard=shard: check_model(index, shard),
+                )
+                snapshot.get()  # 콜드 스타트에 모든 샤드를 열어 모델 불일치를 바로 알림
+                workers.append(LocalShardWorker(shard, snapshot))
+        _coordinators[collection] = ScatterGather(workers)
+    return _coordinators[collection]
+
+
+def search_sharded(
+    embedding: list[float],
+    collection: str,
+    created_after: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """샤드 워커에 동시에 검색을 보내고 샤드별 Top-K를 합쳐 최고 결과 반환"""
+    try:
+        gathered = get_coordinator(collection).search(collection, embedding, TOP_K, SIMILARITY_THRESHOLD, created_after)
+        logger.info(f"🧩 샤드 응답 {gathered.answered}/{gathered.shards}")
+        if gathered.results:
+            logger.info(f"✅ 최고 유사도: {gathered.results[0]['similarity']:.2f}")
+            return {**gathered.results[0], "partial": gathered.partial}
+        logger.warning("⚠️ 유사한 Q&A를 찾을 수 없음")
+        # 응답하지 않은 샤드에 답이 있을 수 있으므로 부분 결과임을 알림
+        return {"partial": True} if gathered.partial else None
+    except Exception as e:
+        logger.error(f"❌ 샤드 검색 오류: {str(e)}")
+        return {"failed": True}
+
+
+def search_similar_qa(
+    embedding: list[float],
+    collection: str,
+    created_after: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    설정된 검색 백엔드로 유사한 Q&A 검색
+
+    collection / created_after 조건은 벡터 비교 전에 적용되며, 컬렉션은 라이브 세대 source로 바꿔 검색합니다.
+    sharded 백엔드는 일부 샤드만 응답했으면 partial=True를 붙입니다 (결과가 없으면 answer 없이 partial만).
+    백엔드 오류(DynamoDB / S3 / Postgres / 샤드 전체)는 "결과 없음"과 구분하도록 {"failed": True}를 반환합니다.
+    """
+    collection = live_source(collection)
+    if SEARCH_BACKEND == "snapshot":
+        return search_snapshot(embedding, collection, created_after)
+    if SEARCH_BACKEND == "pgvector":
+        return search_pgvector(embedding, collection, created_after)
+    if SEARCH_BACKEND == "sharded":
+        return search_sharded(embedding, collection, created_after)
+    return search_dynamodb(embedding, collection, created_after)
+
+
+def search_collections(
+    embedding: list[float],
+    collections: list[str],
+    created_after: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    여러 컬렉션을 각각 검색하여 유사도가 가장 높은 결과 반환
+
+    하나라도 부분 결과면 partial=True, 백엔드 오류로 검색하지 못한 컬렉션이 있으면 failed=True를 붙입니다.
+    """
+    if SEARCH_BACKEND == "pgvector":
+        # pgvector는 컬렉션 조건 없이 전체에서 검색하므로 한 번이면 충분
+        collections = collections[:1]
+    best: Optional[dict[str, Any]] = None
+    partial = failed = False
+    for collection in collections:
+        result = search_similar_qa(embedding, collection, created_after)
+        if not result:
+            continue
+        partial = partial or bool(result.get("partial"))
+        failed = failed or bool(result.get("failed"))
+        if "answer" in result and (best is None or result["similarity"] > best["similarity"]):
+            best = result
+    if partial or failed:
+        best = dict(best or {})
+        if partial:
+            best["partial"] = True
+        if failed:
+            best["failed"] = True
+    return best
+
+
+def search_dynamodb(
+    embedding: list[float],
+    collection: str,
+    created_after: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+    """DynamoDB 컬렉션(GSI Query)에서 유사한 Q&A 검색"""
+    try:
+        # 컬렉션의 문서만 가져오기
+        items = list(query_collection(table, collection, created_after=created_after))
+        logger.info(f"📊 DynamoDB 컬렉션 '{collection}'에서 {len(items)}개 문서 검색")
         
         # 유사도 계산
         candidates = []
+        mismatched = 0
         for item in items:
             if "embedding" not in item:
                 continue
             
+            # 다른 모델/차원으로 임베딩된 아이템은 비교 불가
+            if not embedding_provider.matches(item):
+                mismatched += 1
+                continue
+            
             # DynamoDB의 임베딩 변환
             item_embedding = item["embedding"]
             
@@ -116,15 +404,15 @@ def search_similar_qa(embedding: list[float]) -> Optional[dict[str, Any]]:
             similarity = cosine_similarity(embedding, item_embedding)
             
             if similarity >= SIMILARITY_THRESHOLD:
-                candidates.append({
-                    "id": item.get("id"),
-                    "question": item.get("question", ""),
-                    "answer": item.get("answer", ""),
-                    "similarity": similarity
-                })
+                fields = {k: v for k, v in item.items() if k != "embedding"}
+                candidates.append({**fields, "similarity": similarity})
+        
+        if mismatched:
+            logger.warning(f"⚠️  임베딩 모델 불일치로 {mismatched}개 문서 제외 (현재: {embedding_provider.key})")
         
-        # 유사도 높은 순으로 정렬
+        # 유사도 높은 순으로 정렬 (패러프레이즈는 부모 Q&A로, 문서 청크는 인접 청크를 이어 문서 하나로)
         candidates.sort(key=lambda x: x["similarity"], reverse=True)
+        candidates = collapse_hits(candidates, TOP_K)
         
         if candidates:
             best_match = candidates[:TOP_K]
@@ -136,13 +424,7 @@ def search_similar_qa(embedding: list[float]) -> Optional[dict[str, Any]]:
             
     except Exception as e:
         logger.error(f"❌ DynamoDB 검색 오류: {str(e)}")
-        return None
-
-# 상수
-SIMILARITY_THRESHOLD = 0.7
-TOP_K = 3
-
-
+        return {"failed": True}
 
 
 def format_response(question: str, answer: str, similarity: float = 0.0) -> dict[str, Any]:
@@ -155,6 +437,149 @@ def format_response(question: str, answer: str, similarity: float = 0.0) -> dict
     }
 
 
+def normalize_question(question: str) -> str:
+    """캐시 키용 질문 정규화 (공백 정리 + 소문자)"""
+    return " ".join(question.split()).lower()
+
+
+_data_versions: dict[str, tuple[float, int]] = {}
+
+
+def data_version(collection: str) -> int:
+    """컬렉션 버전 아이템의 revision (INDEX_VERSION_POLL_SECONDS 동안 캐시, 읽기 실패 시 마지막 값)"""
+    now = time.time()
+    cached = _data_versions.get(collection)
+    if cached and now - cached[0] < INDEX_VERSION_POLL_SECONDS:
+        return cached[1]
+    try:
+        version = collection_version(table, collection)
+    except Exception as e:
+        logger.warning(f"⚠️  컬렉션 버전 조회 실패, 이전 값 사용: {str(e)}")
+        version = cached[1] if cached else 0
+    _data_versions[collection] = (now, version)
+    return version
+
+
+def index_version(source: str) -> str:
+    """검색 결과를 결정하는 인덱스 버전 (적재/게시하면 바뀌고 ETag도 바뀜, source는 live_source() 결과)"""
+    if SEARCH_BACKEND == "snapshot":
+        index = get_snapshot_index(source)
+        follower = _delta_followers.get(source)
+        return f"{index.version}+{follower.cursor}" if follower else index.version
+    collection = PGVECTOR_VERSION_KEY if SEARCH_BACKEND == "pgvector" else source.split(SOURCE_SEPARATOR)[0]
+    return f"{INDEX_VERSION}+v{data_version(collection)}"
+
+
+class InvalidCollection(ValueError):
+    """COLLECTIONS에 없는 컬렉션 요청"""
+
+
+def request_collections(requested: Optional[str]) -> list[str]:
+    """
+    요청의 collection → 검색할 컬렉션 목록
+
+    허용 목록(COLLECTIONS)에 있는 이름만 받으므로 경로/캐시 키로 임의 문자열이 들어오지 않습니다.
+    collection이 없으면 DEFAULT_COLLECTION, 그것도 없으면 허용된 컬렉션 전체를 검색합니다.
+    """
+    if requested:
+        if requested not in COLLECTIONS:
+            raise InvalidCollection(f"지원하지 않는 컬렉션입니다: {requested[:64]}")
+        return [requested]
+    return [DEFAULT_COLLECTION] if DEFAULT_COLLECTION else list(COLLECTIONS)
+
+
+def answer_etag(question: str, collections: list[str], created_after: Optional[str]) -> str:
+    """정규화된 질문 + 검색 조건 + 인덱스 버전으로 만든 ETag (임베딩 없이 계산, 세대가 바뀌면 ETag도 바뀜)"""
+    sources = [live_source(collection) for collection in collections]
+    key = "\n".join([
+        ",".join(index_version(source) for source in sources),
+        embedding_provider.key,
+        f"{SIMILARITY_THRESHOLD}:{TOP_K}",
+        ",".join(sources),
+        created_after or "",
+        normalize_question(question),
+    ])
+    return f'"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def answer_question(question: str, collections: list[str], created_after: Optional[str]) -> dict[str, Any]:
+    """질문 임베딩 → 유사 Q&A 검색 → 응답 포맷팅"""
+    logger.info(f"❓ 질문: {question} (컬렉션: {', '.join(collections)})")
+    
+    # 1. 질문 임베딩
+    embedding = embed_text(question)
+    
+    # 2. 유사한 Q&A 검색
+    result = search_collections(embedding, collections, created_after)
+    
+    # 3. 응답 포맷팅
+    if result and "answer" in result:
+        response = format_response(question, result["answer"], result["similarity"])
+    elif result and result.get("failed"):
+        response = format_response(question, "죄송합니다. 일시적인 오류로 답변을 찾지 못했습니다. 잠시 후 다시 시도해 주세요.", 0.0)
+        response["success"] = False
+    else:
+        response = format_response(question, "죄송합니다. 데이터셋에 해당 정보가 없습니다.", 0.0)
+        response["success"] = False
+    if result and result.get("partial"):
+        response["partial"] = True
+    if result and result.get("failed"):
+        response["failed"] = True
+    
+    logger.info(f"✅ 응답 완료: {response}")
+    return response
+
+
+def handle_get(event: dict[str, Any]) -> dict[str, Any]:
+    """
+    GET /ask?question=...&collection=...&created_after=...
+
+    같은 질문과 인덱스 버전에 대해 답변이 항상 같으므로 CloudFront/브라우저가 캐시하도록
+    Cache-Control과 ETag를 붙이고, If-None-Match가 일치하면 임베딩 없이 304를 반환합니다.
+    부분 결과나 검색 백엔드 오류가 섞인 응답은 no-store로 보내고, 오류로 답이 없으면 503을 반환합니다.
+    """
+    params = event.get("queryStringParameters") or {}
+    question = (params.get("question") or "").strip()
+    if not question:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"error": "질문이 필요합니다"}, ensure_ascii=False),
+            "headers": {"Content-Type": "application/json", "Cache-Control": "no-store"}
+        }
+    
+    collections = request_collections(params.get("collection"))
+    created_after = params.get("created_after")
+    
+    etag = answer_etag(question, collections, created_after)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={ANSWER_CACHE_MAX_AGE}, s-maxage={ANSWER_CDN_MAX_AGE}",
+        "Access-Control-Allow-Origin": "*"
+    }
+    
+    request_headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    if_none_match = request_headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        logger.info(f"♻️  304 Not Modified: {question}")
+        return {"statusCode": 304, "body": "", "headers": headers}
+    
+    retry_after = rate_limiter.check(event, EMBED)
+    if retry_after:
+        return too_many_requests(retry_after, {"Access-Control-Allow-Origin": "*"})
+    
+    response = answer_question(question, collections, created_after)
+    if response.get("partial") or response.get("failed"):
+        # 일부 샤드만 응답했거나 검색 백엔드 오류가 난 결과는 캐시하지 않음
+        headers["Cache-Control"] = "no-store"
+    return {
+        # 오류로 답을 하나도 찾지 못했으면 "결과 없음"(200)이 아니라 503
+        "statusCode": 503 if response.get("failed") and not response["success"] else 200,
+        "body": json.dumps(response, ensure_ascii=False),
+        "headers": {"Content-Type": "application/json", **headers}
+    }
+
+
+@profiled
 def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """
     AWS Lambda Handler - Q&A 챗봇
@@ -162,10 +587,14 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     요청 형식:
     {
         "body": {
-            "question": "회사는 언제 설립되었나요?"
+            "question": "회사는 언제 설립되었나요?",
+            "collection": "perso.ai",              # 선택, COLLECTIONS 중 하나 (기본: DEFAULT_COLLECTION 또는 전체)
+            "created_after": "2025-01-01T00:00:00"  # 선택, 이 시각 이후 아이템만 검색
         }
     }
     
+    GET /ask?question=... 도 같은 응답을 반환하며 CDN 캐시 대상입니다 (handle_get 참고).
+    
     응답 형식:
     {
         "question": "회사는 언제 설립되었나요?",
@@ -177,6 +606,9 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     try:
         logger.info(f"🚀 요청 받음: {event}")
         
+        if event.get("httpMethod") == "GET":
+            return handle_get(event)
+        
         # 요청 파싱
         if isinstance(event.get("body"), str):
             body = json.loads(event["body"])
@@ -191,22 +623,15 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                 "headers": {"Content-Type": "application/json"}
             }
         
-        logger.info(f"❓ 질문: {question}")
-        
-        # 1. 질문 임베딩
-        embedding = embed_text_bedrock(question)
+        collections = request_collections(body.get("collection"))
+        created_after = body.get("created_after")
         
-        # 2. 유사한 Q&A 검색
-        result = search_similar_qa(embedding)
-        
-        # 3. 응답 포맷팅
-        if result:
-            response = format_response(question, result["answer"], result["similarity"])
-        else:
-            response = format_response(question, "죄송합니다. 데이터셋에 해당 정보가 없습니다.", 0.0)
-            response["success"] = False
+        # 클라이언트별 요청 제한 (임베딩 호출 전)
+        retry_after = rate_limiter.check(event, EMBED)
+        if retry_after:
+            return too_many_requests(retry_after, {"Access-Control-Allow-Origin": "*"})
         
-        logger.info(f"✅ 응답 완료: {response}")
+        response = answer_question(question, collections, created_after)
         
         return {
             "statusCode": 200,
@@ -217,6 +642,13 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
             }
         }
         
+    except InvalidCollection as e:
+        logger.warning(f"⚠️  {str(e)}")
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"error": str(e), "collections": COLLECTIONS}, ensure_ascii=False),
+            "headers": {"Content-Type": "application/json", "Access-Control-Allow-Origin": "*", "Cache-Control": "no-store"}
+        }
     except Exception as e:
         logger.error(f"❌ 오류 발생: {str(e)}", exc_info=True)
         return {
@@ -225,6 +657,5 @@ def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
                 "error": "서버 오류가 발생했습니다",
                 "message": str(e)
             }, ensure_ascii=False),
-            "headers": {"Content-Type": "application/json"}
+            "headers": {"Content-Type": "application/json", "Cache-Control": "no-store"}
         }
-
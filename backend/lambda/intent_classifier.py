@@ -0,0 +1,206 @@
+"""
+의도 분류기 (모델 호출 없는 빠른 경로)
+
+모든 챗봇 핸들러가 Bedrock/BigKinds 호출 전에 실행합니다.
+정답 이해 안 됨, 인사, 감사, 사용법 같은 정형 의도는 높은 신뢰도로 분류되면
+템플릿 답변을 바로 반환하여 모델 왕복을 생략합니다.
+
+분류 순서:
+1. 정규식 규칙 (모듈 로드 시 컴파일, 규칙마다 고정 신뢰도)
+2. (선택) 오프라인 학습한 선형 모델 — INTENT_MODEL_PATH 파일이 있을 때만
+   문자 2-gram + 어절 특징의 softmax 확률을 신뢰도로 사용
+템플릿 답변은 짧은 단독 발화에만 적용합니다. 경제 용어(keyword_engine.ECONOMIC_TERMS)가 있거나
+긴 질문이면 "모르겠어요"로 끝나도 일반 질문으로 보고 모델에 넘깁니다.
+
+모델 학습: python scripts/train_intent_model.py data/intents.jsonl
+
+환경 변수:
+- INTENT_MODEL_PATH: 선형 모델 JSON 경로 (기본: 배포 패키지의 intent_model.json)
+- INTENT_CONFIDENCE_THRESHOLD: 템플릿으로 답할 최소 신뢰도 (기본: 0.85)
+"""
+
+import os
+import re
+import json
+import math
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from keyword_engine import ECONOMIC_TERMS
+
+logger = logging.getLogger()
+
+INTENT_MODEL_PATH = os.environ.get("INTENT_MODEL_PATH", str(Path(__file__).parent / "intent_model.json"))
+INTENT_CONFIDENCE_THRESHOLD = float(os.environ.get("INTENT_CONFIDENCE_THRESHOLD", "0.85"))
+
+OTHER = "other"  # 템플릿 대상이 아닌 일반 질문
+
+# (의도, 신뢰도, 패턴) — 위에서부터 검사하여 가장 높은 신뢰도 채택
+# 템플릿으로 바로 답하는 높은 신뢰도 규칙은 짧은 단독 발화 전체(^…$)에만 맞춤
+RULES = [
+    ("greeting", 0.99, re.compile(r"^\s*(안녕(하세요|하십니까)?|하이|반가워(요)?|hi|hello)\s*[!?.~]*\s*$", re.IGNORECASE)),
+    ("thanks", 0.99, re.compile(r"^\s*(고마워(요)?|감사(합니다|해요)?|땡큐|thanks?( you)?)\s*[!?.~]*\s*$", re.IGNORECASE)),
+    ("help", 0.95, re.compile(
+        r"^\s*((뭘|무엇을|뭐) ?(할 ?수 ?있|도와줄 ?수 ?있)\w*|사용법( 알려 ?줘(요)?)?|도움말|어떻게 사용(해|하)\w*)\s*[!?.~]*\s*$"
+    )),
+    ("answer_confusion", 0.95, re.compile(
+        r"^\s*(이 ?)?(정답|답|해설)\w* ?.{0,8}(이해가? ?안 ?[가돼]\w*|모르겠\w*|헷갈\w*|납득이? ?안 ?[가돼]\w*)\s*[!?.~]*\s*$"
+        r"|^\s*(왜|어째서) .{0,10}정답\w*\s*[!?.~]*\s*$"
+    )),
+    ("answer_confusion", 0.9, re.compile(r"^.{0,10}(이해가? ?안 ?[가돼]\w*|헷갈려\w*|헷갈리\w*|모르겠\w*)\s*[!?.~]*\s*$")),
+    ("answer_confusion", 0.6, re.compile(r"정답|이해|헷갈|모르겠")),
+]
+
+# 단독 발화로 볼 최대 길이 (이보다 길면 높은 신뢰도 규칙/모델 결과를 쓰지 않음)
+STANDALONE_MAX_LENGTH = 30
+
+# 경제 용어가 들어간 질문은 "헷갈려요"로 끝나도 실제 질문이므로 템플릿 대상에서 제외
+_DOMAIN_TERMS = re.compile(
+    "|".join(re.escape(term) for canonical, aliases in ECONOMIC_TERMS.items() for term in (canonical, *aliases)),
+    re.IGNORECASE,
+)
+
+TEMPLATES: dict[str, dict[str, str]] = {
+    "answer_confusion": {
+        "BlackSwan": """블랙스완 게임에서 정답이 이해가 안 가신다면, 다음을 고려해보세요:
+
+1. **예측 불가능성**: 블랙스완 이벤트는 일반적인 예측 모델로는 파악하기 어려운 극단적 사건입니다.
+
+2. **낮은 확률, 높은 영향**: 발생 확률은 매우 낮지만, 한 번 발생하면 경제 전체에 큰 충격을 줍니다.
+
+3. **사후 설명 가능성**: 일어난 후에는 그럴듯한 설명이 가능하지만, 사전에는 예측하기 어렵습니다.
+
+구체적으로 어떤 문제나 개념이 궁금하신지 알려주시면 더 자세히 설명해드릴게요.""",
+        "PrisonersDilemma": """죄수의 딜레마에서 정답이 헷갈리신다면, 핵심 원리를 이해해보세요:
+
+1. **개인 vs 집단 이익**: 각자가 자신의 이익만 추구하면 모두에게 나쁜 결과가 나올 수 있습니다.
+
+2. **협력의 딜레마**: 협력이 최선이지만, 상대방이 배신할 가능성 때문에 협력하기 어렵습니다.
+
+3. **경제적 적용**: 가격 경쟁, 환경 보호, 공공재 문제 등에서 자주 나타납니다.
+
+어떤 상황이나 문제가 특히 어려우신지 말씀해주세요.""",
+        "SignalDecoding": """경제 신호 해석이 어려우시다면, 다음 접근법을 시도해보세요:
+
+1. **다중 지표 분석**: 하나의 지표만 보지 말고 여러 경제 지표를 종합적으로 판단하세요.
+
+2. **맥락 이해**: 같은 지표라도 경제 상황에 따라 다른 의미를 가질 수 있습니다.
+
+3. **시간적 관점**: 단기적 변동과 장기적 추세를 구분해서 해석하세요.
+
+구체적으로 어떤 경제 지표나 신호가 궁금하신가요?""",
+        "": """경제 문제의 정답을 이해하기 어려우시군요. 경제학에서는 다음과 같은 접근이 도움됩니다:
+
+1. **기본 원리 파악**: 수요와 공급, 기회비용 등 기본 개념부터 차근차근 이해하세요.
+
+2. **실제 사례 연결**: 이론을 현실의 경제 상황과 연결해서 생각해보세요.
+
+3. **단계별 분석**: 복잡한 문제는 작은 단위로 나누어 분석하세요.
+
+어떤 구체적인 부분이 가장 궁금하신지 알려주시면 더 도움을 드릴 수 있습니다.""",
+    },
+    "greeting": {
+        "": "안녕하세요! 경제 뉴스와 퀴즈에 대해 궁금한 점을 편하게 물어보세요.",
+    },
+    "thanks": {
+        "": "도움이 되었다니 다행입니다. 더 궁금한 점이 있으면 언제든 물어보세요!",
+    },
+    "help": {
+        "": """이렇게 활용해보세요:
+
+1. **퀴즈 해설**: 정답이 이해가 안 가는 문제를 알려주시면 핵심 개념을 설명해드립니다.
+
+2. **경제 개념**: 금리, 환율, 인플레이션 같은 용어를 물어보세요.
+
+3. **최신 뉴스**: 관심 있는 주제를 말씀해주시면 관련 뉴스를 바탕으로 답변합니다.""",
+    },
+}
+
+
+@dataclass
+class Intent:
+    name: str
+    confidence: float
+    source: str  # rule / model
+
+
+def features(text: str) -> list[str]:
+    """선형 모델 특징 (문자 2-gram + 어절, 학습 스크립트와 공유)"""
+    normalized = " ".join(text.lower().split())
+    grams = [f"c:{normalized[i:i + 2]}" for i in range(len(normalized) - 1)]
+    return grams + [f"w:{word}" for word in normalized.split()]
+
+
+class LinearIntentModel:
+    """다중 클래스 로지스틱 회귀 ({labels, bias, weights: {feature: [label별 가중치]}})"""
+
+    def __init__(self, data: dict[str, Any]):
+        self.labels: list[str] = data["labels"]
+        self.bias: list[float] = data["bias"]
+        self.weights: dict[str, list[float]] = data["weights"]
+
+    def predict(self, text: str) -> tuple[str, float]:
+        scores = list(self.bias)
+        for feature in features(text):
+            row = self.weights.get(feature)
+            if row:
+                scores = [s + w for s, w in zip(scores, row)]
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        best = scores.index(top)
+        return self.labels[best], exps[best] / sum(exps)
+
+
+_model: Optional[LinearIntentModel] = None
+_model_loaded = False
+
+
+def get_model() -> Optional[LinearIntentModel]:
+    """선형 모델 (파일이 없으면 None, 컨테이너 재사용 시 캐시)"""
+    global _model, _model_loaded
+    if not _model_loaded:
+        _model_loaded = True
+        if Path(INTENT_MODEL_PATH).exists():
+            _model = LinearIntentModel(json.loads(Path(INTENT_MODEL_PATH).read_text(encoding="utf-8")))
+            logger.info(f"🧭 의도 모델 로드: {len(_model.labels)}개 의도")
+    return _model
+
+
+def is_standalone(text: str) -> bool:
+    """템플릿으로 답해도 되는 짧은 단독 발화인지 (길이 상한 + 경제 용어 없음)"""
+    return len(text.strip()) <= STANDALONE_MAX_LENGTH and not _DOMAIN_TERMS.search(text)
+
+
+def classify(text: str) -> Optional[Intent]:
+    """
+    규칙 → 모델 순으로 분류 (정형 의도가 아니면 None)
+
+    단독 발화가 아니면 INTENT_CONFIDENCE_THRESHOLD 이상 규칙과 모델은 건너뛰어
+    경제 질문이 템플릿 답변으로 새지 않게 합니다 (낮은 신뢰도 규칙만 남음).
+    """
+    standalone = is_standalone(text)
+    best: Optional[Intent] = None
+    for name, confidence, pattern in RULES:
+        if confidence >= INTENT_CONFIDENCE_THRESHOLD and not standalone:
+            continue
+        if (best is None or confidence > best.confidence) and pattern.search(text):
+            best = Intent(name, confidence, "rule")
+
+    model = get_model() if standalone else None
+    if model and (best is None or best.confidence < INTENT_CONFIDENCE_THRESHOLD):
+        label, probability = model.predict(text)
+        if label != OTHER and label in TEMPLATES and (best is None or probability > best.confidence):
+            best = Intent(label, probability, "model")
+
+    return best
+
+
+def canned_response(text: str, game_type: str = "", threshold: float = INTENT_CONFIDENCE_THRESHOLD) -> Optional[tuple[Intent, str]]:
+    """신뢰도가 threshold 이상인 정형 의도면 (의도, 템플릿 답변)"""
+    intent = classify(text)
+    if intent is None or intent.confidence < threshold:
+        return None
+    templates = TEMPLATES[intent.name]
+    return intent, templates.get(game_type, templates[""])
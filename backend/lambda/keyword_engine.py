@@ -0,0 +1,230 @@
+"""
+키워드 추출 엔진
+
+경제 용어 사전(동의어 포함)을 Aho–Corasick 오토마톤으로 컴파일하여 질문을 한 번만 훑어
+사전 용어를 찾고, 남은 어절은 조사 제거 + 불용어 필터 후 보조 키워드로 사용합니다.
+용어는 기사 코퍼스에서 미리 계산한 IDF 가중치로 순위를 매기고,
+최종 쿼리는 정규형(canonical) 용어를 정렬해 만들기 때문에
+같은 의도의 질문은 항상 같은 BigKinds 쿼리가 됩니다 (캐시 가능).
+
+IDF 파일 생성: python scripts/build_keyword_idf.py <코퍼스.jsonl>
+
+환경 변수:
+- KEYWORD_IDF_PATH: IDF 가중치 JSON 경로 (기본: 배포 패키지의 keyword_idf.json, 없으면 모든 가중치 1.0)
+"""
+
+import os
+import re
+import json
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+logger = logging.getLogger()
+
+KEYWORD_IDF_PATH = os.environ.get("KEYWORD_IDF_PATH", str(Path(__file__).parent / "keyword_idf.json"))
+
+# 정규형 → 동의어/변형 (정규형 자신도 패턴에 포함)
+ECONOMIC_TERMS: dict[str, tuple[str, ...]] = {
+    "금리": ("기준금리", "이자율"),
+    "환율": ("원달러", "원·달러"),
+    "주식": ("증시", "주식시장"),
+    "부동산": ("집값", "아파트값", "주택가격"),
+    "인플레이션": ("인플레", "물가상승"),
+    "경제성장": ("경제성장률", "성장률"),
+    "수출": (),
+    "수입": (),
+    "무역": ("무역수지", "교역"),
+    "투자": (),
+    "소비": ("소비심리", "내수"),
+    "고용": ("취업자",),
+    "실업": ("실업률",),
+    "코스피": ("코스피지수",),
+    "코스닥": (),
+    "달러": ("미국달러",),
+    "원화": (),
+    "GDP": ("국내총생산",),
+    "CPI": ("소비자물가", "소비자물가지수"),
+    "위기": ("금융위기", "경제위기"),
+    "리스크": ("위험",),
+    "예측": ("전망",),
+    "충격": ("쇼크",),
+    "경쟁": (),
+    "협력": (),
+    "전략": (),
+    "딜레마": (),
+    "지표": ("경제지표",),
+    "신호": ("시그널",),
+    "분석": (),
+    "데이터": (),
+    "반도체": (),
+    "관세": (),
+    "채권": ("국채",),
+    "유가": ("국제유가",),
+}
+
+# 어절 끝에서 떼어낼 조사/어미 (긴 것부터 검사)
+PARTICLES = tuple(sorted((
+    "은", "는", "이", "가", "을", "를", "에", "에서", "에게", "의", "로", "으로", "와", "과",
+    "도", "만", "까지", "부터", "보다", "처럼", "이나", "나", "란", "이란", "라는", "이라는",
+    "요", "은요", "는요", "이요", "인가요", "인가", "일까", "일까요", "이에요", "예요", "입니다",
+), key=len, reverse=True))
+
+# 서술어 어미 (질문의 서술어 어절은 키워드에서 제외)
+PREDICATE_ENDINGS = (
+    "나요", "까요", "가요", "어요", "아요", "해요", "세요", "니다", "습니까", "는지", "을지",
+    "했다", "한다", "된다", "하다", "되다", "줘", "죠", "야",
+)
+
+STOPWORDS = frozenset((
+    "무엇", "뭐", "뭔가요", "뭐야", "어떻게", "어떤", "왜", "언제", "어디", "누가", "얼마",
+    "알려줘", "알려주세요", "설명해줘", "설명해주세요", "해줘", "해주세요", "궁금해요", "궁금합니다",
+    "있나요", "있어요", "없나요", "되나요", "하나요", "했나요", "인가요", "건가요", "대해", "대한", "관련",
+    "그리고", "그런데", "하지만", "그래서", "요즘", "최근", "현재", "지금", "오늘", "정말", "너무", "좀",
+    "이", "그", "저", "것", "수", "등", "및", "더",
+))
+
+_TOKEN = re.compile(r"[가-힣A-Za-z0-9]+")
+
+
+class AhoCorasick:
+    """다중 패턴 문자열 매칭 오토마톤 (텍스트를 한 번만 훑음)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(pattern)
+
+        # BFS로 실패 링크 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """(시작, 끝, 패턴) — 겹치는 매치 포함"""
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for pattern in self._out[state]:
+                yield i + 1 - len(pattern), i + 1, pattern
+
+
+def strip_particle(word: str) -> str:
+    """어절 끝의 조사 제거 (남는 부분이 2자 미만이면 원형 유지)"""
+    for particle in PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[:-len(particle)]
+    return word
+
+
+class KeywordEngine:
+    """사전 매칭 + IDF 순위 + 정규형 정렬 쿼리"""
+
+    def __init__(
+        self,
+        terms: Optional[dict[str, tuple[str, ...]]] = None,
+        idf: Optional[dict[str, float]] = None,
+        default_idf: float = 1.0,
+    ):
+        terms = ECONOMIC_TERMS if terms is None else terms
+        self.canonical: dict[str, str] = {}
+        for canonical, aliases in terms.items():
+            for pattern in (canonical, *aliases):
+                self.canonical[pattern.lower()] = canonical
+        self.automaton = AhoCorasick(self.canonical)
+        self.idf = idf or {}
+        self.default_idf = default_idf
+
+    def terms(self, text: str) -> list[tuple[str, bool, int]]:
+        """텍스트의 (정규형 용어, 사전 용어 여부, 첫 위치) — 중복 제거"""
+        lowered = text.lower()
+
+        # 가장 왼쪽-가장 긴 매치만 채택 (예: "인플레이션" > "인플레")
+        matches = sorted(self.automaton.iter_matches(lowered), key=lambda m: (m[0], -(m[1] - m[0])))
+        found: dict[str, tuple[bool, int]] = {}
+        covered = [False] * len(lowered)
+        cursor = 0
+        for start, end, pattern in matches:
+            if start < cursor:
+                continue
+            found.setdefault(self.canonical[pattern], (True, start))
+            covered[start:end] = [True] * (end - start)
+            cursor = end
+
+        # 사전에 없는 어절 → 서술어 제외 + 조사 제거 + 불용어 필터
+        for token in _TOKEN.finditer(text):
+            if any(covered[token.start():token.end()]) or token.group().endswith(PREDICATE_ENDINGS):
+                continue
+            word = strip_particle(token.group())
+            if len(word) < 2 or word in STOPWORDS or word.isdigit():
+                continue
+            found.setdefault(word, (False, token.start()))
+
+        return [(term, in_dictionary, position) for term, (in_dictionary, position) in found.items()]
+
+    def weight(self, term: str) -> float:
+        return self.idf.get(term, self.default_idf)
+
+    def extract(self, text: str, limit: int = 3) -> list[str]:
+        """중요도 순 상위 용어 (사전 용어 우선, 같은 그룹은 IDF 내림차순, 동률이면 먼저 나온 순)"""
+        ranked = sorted(self.terms(text), key=lambda t: (not t[1], -self.weight(t[0]), t[2]))
+        return [term for term, _, _ in ranked[:limit]]
+
+    def query(self, text: str, limit: int = 3, extra: Iterable[str] = (), max_terms: Optional[int] = None) -> str:
+        """
+        BigKinds 검색 쿼리 (정규형 용어를 정렬하여 공백으로 연결)
+
+        extra는 추출 용어 뒤에 붙는 고정 키워드(게임별 키워드 등), max_terms는 전체 상한
+        """
+        selected = self.extract(text, limit)
+        for keyword in extra:
+            keyword = self.canonical.get(keyword.lower(), keyword)
+            if keyword not in selected:
+                selected.append(keyword)
+        if max_terms is not None:
+            selected = selected[:max_terms]
+        return " ".join(sorted(selected))
+
+
+_engine: Optional[KeywordEngine] = None
+
+
+def load_idf(path: str = KEYWORD_IDF_PATH) -> tuple[dict[str, float], float]:
+    """IDF 파일 로드 ({documents, default_idf, idf: {term: weight}}), 없으면 빈 가중치"""
+    if not Path(path).exists():
+        logger.warning(f"⚠️  IDF 파일 없음, 균등 가중치 사용: {path}")
+        return {}, 1.0
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return data.get("idf", {}), float(data.get("default_idf", 1.0))
+
+
+def get_engine() -> KeywordEngine:
+    """기본 사전 + IDF 파일로 만든 엔진 (컨테이너 재사용 시 캐시)"""
+    global _engine
+    if _engine is None:
+        idf, default_idf = load_idf()
+        _engine = KeywordEngine(idf=idf, default_idf=default_idf)
+    return _engine
@@ -0,0 +1,218 @@
+"""
+뉴스 벡터 인덱스 (BigKinds 기사 → Q&A와 같은 스냅샷 형식)
+
+news_prefetch.handler가 수집한 기사를 Q&A 인덱스와 같은 스냅샷(snapshot.py)으로 저장하고,
+enhanced-chatbot-handler는 질문 임베딩과의 코사인 유사도로 관련 기사를 컨테이너 안에서 바로 고릅니다.
+키워드 검색 후 날짜순 상위 3건을 쓰던 방식보다 빠르고 질문과 더 가까운 기사를 찾습니다.
+
+스냅샷 행 하나 = 기사 하나:
+- id: news_id, question: 제목, answer: 본문 앞부분, created_at: 발행 시각, provider: 언론사
+
+갱신할 때마다 이전 스냅샷의 기사와 새 기사를 합치고 NEWS_WINDOW_DAYS(call_bigkinds_api 검색 기간과 동일)보다
+오래된 기사는 뺍니다. 이미 인덱스에 있는 기사는 저장된 벡터를 그대로 쓰므로 기사마다 한 번만 임베딩합니다.
+
+저장 위치:
+- S3: NEWS_INDEX_S3_BUCKET(기본: NEWS_PREFETCH_S3_BUCKET)의 NEWS_INDEX_PREFIX (기본: news-index/)
+  — 콜드 스타트에 /tmp로 내려받음
+- 로컬: NEWS_INDEX_PATH (로컬 개발용)
+
+새 버전으로 바꿀 때 이전 인덱스를 닫고 /tmp에 내려받은 이전 버전 디렉터리를 지웁니다.
+갱신(refresh) 후에는 S3에 최신 NEWS_INDEX_KEEP_VERSIONS개 버전만 남깁니다.
+
+환경 변수:
+- NEWS_INDEX_S3_BUCKET / NEWS_INDEX_PATH / NEWS_INDEX_PREFIX: 위 참고
+- NEWS_WINDOW_DAYS: 인덱스에 남길 기간, BigKinds 검색 기간 (기본: 30)
+- NEWS_INDEX_THRESHOLD: 컨텍스트로 쓸 최소 유사도 (기본: 0.3)
+- NEWS_INDEX_REFRESH_SECONDS: 컨테이너가 새 스냅샷을 확인하는 간격 (기본: 300)
+- NEWS_INDEX_KEEP_VERSIONS: S3에 남길 스냅샷 버전 수 (기본: 2, 내려받는 중인 컨테이너를 위해 직전 버전 유지)
+"""
+
+import os
+import time
+import shutil
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from embeddings import EmbeddingProvider
+from snapshot import (
+    SnapshotIndex,
+    download_snapshot,
+    prune_snapshots,
+    resolve_snapshot_dir,
+    upload_snapshot,
+    write_snapshot,
+)
+
+logger = logging.getLogger()
+
+NEWS_INDEX_S3_BUCKET = os.environ.get("NEWS_INDEX_S3_BUCKET", os.environ.get("NEWS_PREFETCH_S3_BUCKET", ""))
+NEWS_INDEX_PATH = os.environ.get("NEWS_INDEX_PATH", "")
+NEWS_INDEX_PREFIX = os.environ.get("NEWS_INDEX_PREFIX", "news-index/")
+NEWS_INDEX_THRESHOLD = float(os.environ.get("NEWS_INDEX_THRESHOLD", "0.3"))
+NEWS_INDEX_REFRESH_SECONDS = int(os.environ.get("NEWS_INDEX_REFRESH_SECONDS", "300"))
+NEWS_WINDOW_DAYS = int(os.environ.get("NEWS_WINDOW_DAYS", "30"))
+NEWS_INDEX_KEEP_VERSIONS = int(os.environ.get("NEWS_INDEX_KEEP_VERSIONS", "2"))
+NEWS_INDEX_TMP_DIR = "/tmp/news-index"
+EMBED_BATCH_SIZE = 64
+
+
+def window_start(now: Optional[datetime] = None) -> str:
+    """인덱스에 남길 가장 오래된 발행일 (YYYY-MM-DD, published_at과 문자열 비교)"""
+    now = now or datetime.now()
+    return (now - timedelta(days=NEWS_WINDOW_DAYS)).strftime("%Y-%m-%d")
+
+
+def article_text(article: dict[str, Any]) -> str:
+    """임베딩 입력 (제목 + 본문)"""
+    return f"{article.get('title', '')}\n{article.get('content', '')}".strip()
+
+
+def _article_id(article: dict[str, Any]) -> str:
+    return article.get("news_id") or f"{article.get('provider', '')}:{article.get('title', '')}"
+
+
+def build_items(
+    articles: Iterable[dict[str, Any]],
+    provider: EmbeddingProvider,
+    previous: Optional[SnapshotIndex] = None,
+    cutoff: Optional[str] = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    이전 인덱스 + 새 기사 → 기간 내 스냅샷 아이템 (새 기사만 임베딩)
+
+    같은 모델/차원의 이전 인덱스만 벡터를 재사용하고, 다르면 모든 기사를 다시 임베딩합니다.
+    """
+    cutoff = cutoff or window_start()
+    reuse = previous is not None and previous.manifest["embedding_model"] == provider.model_id and previous.dim == provider.dimensions
+
+    items: dict[str, dict[str, Any]] = {}
+    if previous is not None:
+        for item in previous.iter_items():
+            if item.get("created_at", "") < cutoff:
+                continue
+            if not reuse:
+                item = {**item, "embedding": None}
+            items[item["id"]] = item
+    for article in articles:
+        if article.get("published_at", "") < cutoff:
+            continue
+        article_id = _article_id(article)
+        if article_id in items:
+            continue
+        items[article_id] = {
+            "id": article_id,
+            "question": article.get("title", ""),
+            "answer": article.get("content", "")[:500],
+            "created_at": article.get("published_at", ""),
+            "provider": article.get("provider", ""),
+            "embedding": None,
+        }
+
+    pending = [item for item in items.values() if item["embedding"] is None]
+    for start in range(0, len(pending), EMBED_BATCH_SIZE):
+        batch = pending[start:start + EMBED_BATCH_SIZE]
+        texts = [article_text({"title": item["question"], "content": item["answer"]}) for item in batch]
+        for item, embedding in zip(batch, provider.embed_batch(texts)):
+            item["embedding"] = embedding
+    logger.info(f"📰 뉴스 인덱스 아이템: {len(items)}개 (새로 임베딩 {len(pending)}개, 기준일 {cutoff})")
+    return iter(sorted(items.values(), key=lambda item: item["created_at"], reverse=True))
+
+
+class NewsIndex:
+    """뉴스 스냅샷 로드/갱신/검색 (컨테이너 재사용 시 NEWS_INDEX_REFRESH_SECONDS마다 새 버전 확인)"""
+
+    def __init__(self, bucket: str = NEWS_INDEX_S3_BUCKET, path: str = NEWS_INDEX_PATH, prefix: str = NEWS_INDEX_PREFIX):
+        self.bucket = bucket
+        self.path = path
+        self.prefix = prefix
+        self._index: Optional[SnapshotIndex] = None
+        self._checked_at = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.bucket or self.path)
+
+    def _root(self) -> str:
+        return self.path or NEWS_INDEX_TMP_DIR
+
+    def load(self) -> Optional[SnapshotIndex]:
+        """최신 스냅샷 (없으면 None)"""
+        try:
+            if self.bucket and not self.path:
+                snapshot_dir = resolve_snapshot_dir(download_snapshot(self.bucket, self.prefix, NEWS_INDEX_TMP_DIR))
+            else:
+                snapshot_dir = resolve_snapshot_dir(self.path)
+            if self._index is None or snapshot_dir != self._index.dir:
+                self._swap(snapshot_dir)
+        except Exception as e:
+            logger.warning(f"⚠️  뉴스 인덱스 로드 실패: {str(e)}")
+        return self._index
+
+    def _swap(self, snapshot_dir: Path) -> None:
+        """새 버전 인덱스로 교체 (이전 인덱스는 닫고, S3에서 내려받은 다른 버전 디렉터리는 삭제)"""
+        previous = self._index
+        self._index = SnapshotIndex(str(snapshot_dir))
+        if previous is not None and previous.dir != self._index.dir:
+            previous.close()
+        if self.bucket and not self.path:
+            # 이전 실행(웜 컨테이너)에서 받은 버전도 함께 정리
+            for stale in Path(NEWS_INDEX_TMP_DIR).iterdir():
+                if stale.is_dir() and stale != self._index.dir:
+                    shutil.rmtree(stale, ignore_errors=True)
+
+    def get(self) -> Optional[SnapshotIndex]:
+        """메모리의 인덱스 (간격이 지났으면 새 버전 확인)"""
+        now = time.time()
+        if self.enabled and (self._index is None or now - self._checked_at >= NEWS_INDEX_REFRESH_SECONDS):
+            self._checked_at = now
+            self.load()
+        return self._index
+
+    def refresh(self, articles: Iterable[dict[str, Any]], provider: EmbeddingProvider) -> Path:
+        """이전 스냅샷 + 새 기사로 새 스냅샷 기록 (S3면 업로드 후 LATEST 교체, 오래된 버전 삭제)"""
+        previous = self.load()
+        snapshot_dir = write_snapshot(
+            build_items(articles, provider, previous),
+            self._root(),
+            embedding_model=provider.model_id,
+            embedding_dim=provider.dimensions,
+            extra={"collection": "news", "window_days": NEWS_WINDOW_DAYS},
+        )
+        if self.bucket and not self.path:
+            upload_snapshot(snapshot_dir, self.bucket, self.prefix)
+            try:
+                prune_snapshots(self.bucket, self.prefix, NEWS_INDEX_KEEP_VERSIONS)
+            except Exception as e:
+                logger.warning(f"⚠️  이전 뉴스 스냅샷 정리 실패: {str(e)}")
+        self._swap(snapshot_dir)
+        return snapshot_dir
+
+    def search(self, embedding: list[float], top_k: int = 3, threshold: float = NEWS_INDEX_THRESHOLD) -> list[dict[str, Any]]:
+        """
+        질문 임베딩과 가까운 기간 내 기사 (BigKinds 문서와 같은 필드 + similarity)
+
+        인덱스와 차원이 다른 임베딩은 비교할 수 없으므로 빈 목록
+        (수집 작업과 요청 경로가 같은 EMBEDDING_MODEL_ID를 써야 함)
+        """
+        index = self.get()
+        if index is None or len(embedding) != index.dim:
+            return []
+        rows = index.rows_created_after(window_start())
+        scores = index.scores(embedding, rows)
+        articles = []
+        for position in scores.argsort()[::-1][:top_k]:
+            if scores[position] < threshold:
+                break
+            row = int(rows[position])
+            entry = index.entry(row)
+            articles.append({
+                "news_id": entry["id"],
+                "title": entry["question"],
+                "content": index.answer(row),
+                "provider": entry.get("provider", ""),
+                "published_at": entry.get("created_at", ""),
+                "similarity": float(scores[position]),
+            })
+        return articles
@@ -0,0 +1,273 @@
+"""
+BigKinds 뉴스 사전 수집 (게임 타입별)
+
+게임마다 검색 키워드가 작은 고정 집합(GAME_KEYWORDS + 경제 용어 사전)에 몰려 있으므로,
+주기 실행 작업(handler, 예: 1시간마다)이 키워드별 최신 기사를 미리 받아 게임별 JSON으로 저장하고
+수집한 기사는 뉴스 벡터 인덱스(news_index.py)에도 추가되고,
+enhanced-chatbot-handler는 벡터 인덱스에 맞는 기사가 없을 때 이 저장본에서 기사를 고릅니다.
+사전 용어 없이 드문 키워드만 있는 질문이나 저장본이 오래된 경우에만 BigKinds를 실시간 호출합니다.
+
+저장본 ({prefix}{게임 타입 또는 default}.json):
+{
+    "game_type": "BlackSwan",
+    "fetched_at": 1735689600.0,
+    "terms": ["위기", "리스크", ...],            # 수집한 정규형 키워드 (= 저장본이 답할 수 있는 키워드)
+    "articles": [{news_id, title, content, provider, published_at, terms: [이 기사를 찾은 키워드]}]
+}
+
+요청 경로는 저장본을 컨테이너 메모리에 두고 NEWS_PREFETCH_REFRESH_SECONDS마다만 다시 읽으므로
+대부분의 채팅 요청은 외부 HTTP 호출 없이 처리됩니다.
+
+주기 실행 스케줄은 serverless.yml에서 NEWS_PREFETCH=enabled로 배포할 때만 연결되며,
+API 키나 저장 위치가 없으면 handler는 실패하지 않고 건너뜁니다.
+
+환경 변수:
+- BIGKINDS_API_KEY: BigKinds API 키 (수집 작업 / 실시간 호출)
+- NEWS_PREFETCH_S3_BUCKET / NEWS_PREFETCH_PREFIX: 저장 위치 (기본 prefix: news-prefetch/)
+- NEWS_PREFETCH_PATH: S3 대신 로컬 디렉터리에 저장 (로컬 개발용)
+- NEWS_PREFETCH_ARTICLES_PER_TERM: 키워드당 수집 기사 수 (기본: 10)
+- NEWS_PREFETCH_MAX_AGE_SECONDS: 이보다 오래된 저장본은 쓰지 않음 (기본: 10800)
+- NEWS_PREFETCH_REFRESH_SECONDS: 컨테이너가 저장본을 다시 읽는 간격 (기본: 300)
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import requests
+
+from embeddings import get_provider
+from keyword_engine import ECONOMIC_TERMS
+from news_index import NEWS_WINDOW_DAYS, NewsIndex
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+NEWS_PREFETCH_S3_BUCKET = os.environ.get("NEWS_PREFETCH_S3_BUCKET", "")
+NEWS_PREFETCH_PREFIX = os.environ.get("NEWS_PREFETCH_PREFIX", "news-prefetch/")
+NEWS_PREFETCH_PATH = os.environ.get("NEWS_PREFETCH_PATH", "")
+NEWS_PREFETCH_ARTICLES_PER_TERM = int(os.environ.get("NEWS_PREFETCH_ARTICLES_PER_TERM", "10"))
+NEWS_PREFETCH_MAX_AGE_SECONDS = int(os.environ.get("NEWS_PREFETCH_MAX_AGE_SECONDS", "10800"))
+NEWS_PREFETCH_REFRESH_SECONDS = int(os.environ.get("NEWS_PREFETCH_REFRESH_SECONDS", "300"))
+
+# 게임별 관련 키워드
+GAME_KEYWORDS: dict[str, list[str]] = {
+    'BlackSwan': ['위기', '리스크', '예측', '충격'],
+    'PrisonersDilemma': ['경쟁', '협력', '전략', '딜레마'],
+    'SignalDecoding': ['지표', '신호', '분석', '데이터'],
+}
+
+# 모든 질문 쿼리에 붙는 공통 키워드 (기사 선택 시 구분력이 없으므로 매칭에서 제외)
+GENERIC_TERMS = ('경제', '금융')
+
+DEFAULT_GAME = "default"
+
+
+def call_bigkinds_api(keywords: str, api_key: str, return_size: int = 3, timeout: int = 15) -> Optional[dict[str, Any]]:
+    """
+    BigKinds API 호출 (최근 NEWS_WINDOW_DAYS일, 주요 경제지, 최신순)
+    """
+    try:
+        url = "https://www.bigkinds.or.kr/api/news/search"
+
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=NEWS_WINDOW_DAYS)
+
+        params = {
+            'access_key': api_key,
+            'argument': {
+                'query': keywords,
+                'published_at': {
+                    'from': start_date.strftime('%Y-%m-%d'),
+                    'until': end_date.strftime('%Y-%m-%d')
+                },
+                'provider': ['서울경제', '한국경제', '매일경제', '연합뉴스'],
+                'category': ['경제', '사회', '정치'],
+                'sort': {'date': 'desc'},
+                'hilight': 200,
+                'return_from': 0,
+                'return_size': return_size
+            }
+        }
+
+        response = requests.post(url, json=params, timeout=timeout)
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.error(f"BigKinds API error: {response.status_code}")
+            return None
+
+    except Exception as e:
+        logger.error(f"BigKinds API call failed: {str(e)}")
+        return None
+
+
+def prefetch_terms(game_type: str) -> list[str]:
+    """게임 저장본에 수집할 정규형 키워드 (게임 키워드 + 경제 용어 사전)"""
+    terms = list(GAME_KEYWORDS.get(game_type, []))
+    terms += [term for term in ECONOMIC_TERMS if term not in terms]
+    return terms
+
+
+def _key(game_type: str) -> str:
+    return f"{NEWS_PREFETCH_PREFIX}{game_type or DEFAULT_GAME}.json"
+
+
+class NewsPrefetchStore:
+    """게임별 사전 수집 기사 저장본 (S3 또는 로컬 디렉터리, 컨테이너 메모리 캐시)"""
+
+    def __init__(self, bucket: str = NEWS_PREFETCH_S3_BUCKET, path: str = NEWS_PREFETCH_PATH):
+        self.bucket = bucket
+        self.path = path
+        self._cache: dict[str, tuple[float, Optional[dict[str, Any]]]] = {}  # 게임 → (읽은 시각, 저장본)
+        self._s3 = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.bucket or self.path)
+
+    def _client(self):
+        if self._s3 is None:
+            import boto3
+
+            self._s3 = boto3.client("s3")
+        return self._s3
+
+    def read(self, game_type: str) -> Optional[dict[str, Any]]:
+        key = _key(game_type)
+        try:
+            if self.bucket:
+                body = self._client().get_object(Bucket=self.bucket, Key=key)["Body"].read()
+            else:
+                body = (Path(self.path) / Path(key).name).read_bytes()
+            return json.loads(body)
+        except Exception as e:
+            logger.warning(f"⚠️  뉴스 저장본 읽기 실패 ({key}): {str(e)}")
+            return None
+
+    def write(self, game_type: str, data: dict[str, Any]) -> None:
+        key = _key(game_type)
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        if self.bucket:
+            self._client().put_object(Bucket=self.bucket, Key=key, Body=body, ContentType="application/json")
+        else:
+            Path(self.path).mkdir(parents=True, exist_ok=True)
+            (Path(self.path) / Path(key).name).write_bytes(body)
+        logger.info(f"💾 뉴스 저장본 기록: {key} ({len(data['articles'])}건)")
+
+    def get(self, game_type: str) -> Optional[dict[str, Any]]:
+        """저장본 (NEWS_PREFETCH_REFRESH_SECONDS 동안 메모리 캐시)"""
+        now = time.time()
+        cached = self._cache.get(game_type)
+        if cached is None or now - cached[0] >= NEWS_PREFETCH_REFRESH_SECONDS:
+            cached = (now, self.read(game_type))
+            self._cache[game_type] = cached
+        return cached[1]
+
+    def lookup(self, game_type: str, keywords: str, limit: int = 3) -> Optional[dict[str, Any]]:
+        """
+        저장본에서 쿼리에 맞는 최신 기사 (BigKinds 응답과 같은 형식)
+
+        저장본이 없거나 오래되었거나, 쿼리에 저장본이 답할 수 없는 키워드가 있거나,
+        맞는 기사가 없으면 None (→ 실시간 호출)
+        """
+        if not self.enabled:
+            return None
+        data = self.get(game_type)
+        if not data or time.time() - data["fetched_at"] > NEWS_PREFETCH_MAX_AGE_SECONDS:
+            return None
+
+        query = set(keywords.split()) - set(GENERIC_TERMS)
+        covered = set(data["terms"])
+        missing = query - covered
+        # 질문 고유 키워드가 있으면 그 키워드로 찾은 기사만, 없으면 게임 키워드 기사
+        specific = query & covered - set(GAME_KEYWORDS.get(game_type, []))
+        # 사전 밖 토큰(활용형 등)은 사전 용어가 함께 있을 때만 무시,
+        # 수집 실패한 사전 용어나 사전 용어 없는 질문은 실시간 검색
+        if missing & set(prefetch_terms(game_type)) or (missing and not specific):
+            logger.info(f"📰 저장본 미수집 키워드 {sorted(missing)} → 실시간 검색")
+            return None
+        required = specific or query
+
+        scored = []
+        for article in data["articles"]:
+            terms = set(article["terms"])
+            if terms & required:
+                scored.append((len(terms & query), article.get("published_at", ""), article))
+        if not scored:
+            return None
+        scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        logger.info(f"📰 뉴스 저장본 사용: {game_type or DEFAULT_GAME} [{keywords}]")
+        return {"return_object": {"documents": [article for _, _, article in scored[:limit]]}}
+
+
+def prefetch_game(
+    game_type: str,
+    api_key: str,
+    per_term: int = NEWS_PREFETCH_ARTICLES_PER_TERM,
+    fetched: Optional[dict[str, Optional[list[dict[str, Any]]]]] = None,
+) -> dict[str, Any]:
+    """
+    게임 키워드별 최신 기사 수집 (같은 기사는 하나로 합치고 찾은 키워드를 모두 기록)
+
+    fetched: 키워드 → 기사 목록 캐시 (여러 게임이 공유하는 경제 용어는 한 번만 호출)
+    """
+    fetched = {} if fetched is None else fetched
+    articles: dict[str, dict[str, Any]] = {}
+    terms = []
+    for term in prefetch_terms(game_type):
+        if term not in fetched:
+            response = call_bigkinds_api(term, api_key, return_size=per_term)
+            fetched[term] = None if response is None else response.get('return_object', {}).get('documents', [])
+        if fetched[term] is None:
+            # 실패한 키워드는 terms에서 빠지므로 요청 경로가 실시간 검색으로 처리
+            continue
+        terms.append(term)
+        for document in fetched[term]:
+            key = document.get('news_id') or f"{document.get('provider', '')}:{document.get('title', '')}"
+            article = articles.setdefault(key, {
+                'news_id': document.get('news_id', ''),
+                'title': document.get('title', ''),
+                'content': document.get('content', '')[:500],
+                'provider': document.get('provider', ''),
+                'published_at': document.get('published_at', ''),
+                'terms': [],
+            })
+            article['terms'].append(term)
+    return {
+        "game_type": game_type,
+        "fetched_at": time.time(),
+        "terms": terms,
+        "articles": sorted(articles.values(), key=lambda a: a['published_at'], reverse=True),
+    }
+
+
+def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """주기 실행: 모든 게임 타입(+ 게임 없음)의 저장본 갱신 (API 키나 저장 위치가 없으면 건너뜀)"""
+    api_key = os.environ.get('BIGKINDS_API_KEY')
+    store = NewsPrefetchStore()
+    if not api_key or not store.enabled:
+        # 설정 전에 스케줄이 켜져 있어도 매시간 실패하지 않도록 건너뜀
+        missing = "BIGKINDS_API_KEY" if not api_key else "NEWS_PREFETCH_S3_BUCKET 또는 NEWS_PREFETCH_PATH"
+        logger.warning(f"⚠️  {missing} 미설정 — 뉴스 사전 수집 건너뜀")
+        return {}
+
+    results = {}
+    fetched: dict[str, Optional[list[dict[str, Any]]]] = {}
+    for game_type in [*GAME_KEYWORDS, ""]:
+        data = prefetch_game(game_type, api_key, fetched=fetched)
+        store.write(game_type, data)
+        results[game_type or DEFAULT_GAME] = {"terms": len(data["terms"]), "articles": len(data["articles"])}
+
+    # 이번에 받은 기사를 뉴스 벡터 인덱스에 추가 (이미 있는 기사는 다시 임베딩하지 않음)
+    news_index = NewsIndex()
+    if news_index.enabled:
+        articles = [document for documents in fetched.values() if documents for document in documents]
+        results["news_index"] = {"version": news_index.refresh(articles, get_provider()).name}
+    logger.info(f"✅ 뉴스 사전 수집 완료: {json.dumps(results, ensure_ascii=False)}")
+    return results
@@ -0,0 +1,115 @@
+"""
+Supabase pgvector 검색 백엔드
+
+scripts/ingest.py가 적재한 qa_embeddings 테이블을 Postgres 안에서 검색합니다.
+쿼리 벡터를 PostgREST RPC(match_qa_embeddings)로 보내면 HNSW/ivfflat 인덱스로
+최근접 이웃을 찾아 상위 K개 행만 돌려주므로, 전체 벡터를 Lambda로 가져오지 않습니다.
+
+RPC 함수와 인덱스: scripts/match_qa_embeddings.sql
+
+커넥션은 컨테이너 재사용 시 keep-alive로 유지하며, 끊긴 커넥션은 한 번 다시 연결합니다.
+SUPABASE_URL을 로컬 HTTP 서버로 지정하면 오프라인 테스트가 가능합니다.
+
+환경 변수:
+- SUPABASE_URL / SUPABASE_ANON_KEY: PostgREST 엔드포인트와 키 (scripts/ingest.py와 동일)
+- PGVECTOR_RPC: 검색 RPC 함수 이름 (기본: match_qa_embeddings)
+- PGVECTOR_TIMEOUT_SECONDS: RPC 타임아웃 (기본: 3)
+"""
+
+import os
+import json
+import logging
+import http.client
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger()
+
+SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
+SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY", "")
+PGVECTOR_RPC = os.environ.get("PGVECTOR_RPC", "match_qa_embeddings")
+PGVECTOR_TIMEOUT_SECONDS = float(os.environ.get("PGVECTOR_TIMEOUT_SECONDS", "3"))
+
+
+class PgVectorSearch:
+    """PostgREST RPC로 pgvector 최근접 이웃 검색"""
+
+    def __init__(
+        self,
+        url: str = SUPABASE_URL,
+        key: str = SUPABASE_ANON_KEY,
+        rpc: str = PGVECTOR_RPC,
+        timeout: float = PGVECTOR_TIMEOUT_SECONDS,
+    ):
+        if not url or not key:
+            raise ValueError("❌ 환경 변수 누락: SUPABASE_URL, SUPABASE_ANON_KEY")
+        parts = urlsplit(url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+        self.path = f"{parts.path.rstrip('/')}/rest/v1/rpc/{rpc}"
+        self.key = key
+        self.timeout = timeout
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            conn_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self._conn = conn_class(self.netloc, timeout=self.timeout)
+        return self._conn
+
+    def _post(self, payload: dict[str, Any]) -> Any:
+        body = json.dumps(payload)
+        headers = {
+            "apikey": self.key,
+            "Authorization": f"Bearer {self.key}",
+            "Content-Type": "application/json",
+        }
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("POST", self.path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except TimeoutError:
+                conn.close()
+                self._conn = None
+                raise
+            except (http.client.HTTPException, OSError) as e:
+                # 유휴 상태에서 서버가 닫은 keep-alive 커넥션이면 한 번 다시 연결
+                conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+                logger.warning(f"⏳ pgvector 커넥션 재연결 ({str(e)})")
+                continue
+            if response.status >= 400:
+                raise RuntimeError(f"❌ pgvector RPC 오류 {response.status}: {data[:200].decode('utf-8', 'replace')}")
+            return json.loads(data)
+        raise RuntimeError("unreachable")
+
+    def search(
+        self,
+        embedding: list[float],
+        top_k: int,
+        threshold: float,
+        *,
+        embedding_model: Optional[str] = None,
+        embedding_dim: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """유사도 높은 순 상위 top_k개 중 threshold 이상인 [{id, question, answer, similarity}]"""
+        rows = self._post({
+            "query_embedding": embedding,
+            "match_count": top_k,
+            "match_threshold": threshold,
+            "filter_model": embedding_model,
+            "filter_dim": embedding_dim,
+        })
+        return [
+            {
+                "id": row["id"],
+                "question": row.get("question", ""),
+                "answer": row.get("answer", ""),
+                "similarity": float(row["similarity"]),
+            }
+            for row in rows
+        ]
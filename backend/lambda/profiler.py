@@ -0,0 +1,201 @@
+"""
+On-demand 샘플링 프로파일러
+
+핸들러 호출 중 일정 간격으로 실행 스레드의 스택을 샘플링하여
+collapsed-stack 형식(flamegraph.pl / speedscope 호환)으로 저장합니다.
+
+활성화 방법:
+- PROFILE_SAMPLE_RATE: 요청 중 프로파일링할 비율 (0.0 ~ 1.0, 기본: 0 = 비활성)
+- PROFILE_TOKEN: 설정 시 `X-Profile: <토큰>` 헤더가 있는 요청은 항상 프로파일링
+
+설정:
+- PROFILE_INTERVAL_MS: 샘플링 간격 (기본: 5ms)
+- PROFILE_OUTPUT_DIR: 로컬 출력 디렉터리 (기본: /tmp/profiles)
+- PROFILE_S3_BUCKET / PROFILE_S3_PREFIX: 설정 시 S3로 업로드
+
+두 설정이 모두 비어 있으면 `profiled`는 원래 함수를 그대로 반환하므로
+비활성 상태의 오버헤드는 없습니다.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Optional, Protocol
+
+logger = logging.getLogger()
+
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0") or 0)
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5") or 5)
+PROFILE_OUTPUT_DIR = os.environ.get("PROFILE_OUTPUT_DIR", "/tmp/profiles")
+PROFILE_S3_BUCKET = os.environ.get("PROFILE_S3_BUCKET", "")
+PROFILE_S3_PREFIX = os.environ.get("PROFILE_S3_PREFIX", "profiles/")
+PROFILE_HEADER = "x-profile"
+MAX_STACK_DEPTH = 128
+
+
+class ProfileSink(Protocol):
+    """프로파일 결과 저장소 인터페이스"""
+
+    def write(self, name: str, content: str) -> str:
+        ...
+
+
+class LocalDirectorySink:
+    """로컬 디렉터리에 프로파일 저장 (Lambda에서는 /tmp)"""
+
+    def __init__(self, directory: str = PROFILE_OUTPUT_DIR):
+        self.directory = Path(directory)
+
+    def write(self, name: str, content: str) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+
+class S3Sink:
+    """S3 버킷에 프로파일 업로드"""
+
+    def __init__(self, bucket: str, prefix: str = PROFILE_S3_PREFIX):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self.s3 = boto3.client("s3")
+
+    def write(self, name: str, content: str) -> str:
+        key = f"{self.prefix}{name}"
+        self.s3.put_object(Bucket=self.bucket, Key=key, Body=content.encode("utf-8"))
+        return f"s3://{self.bucket}/{key}"
+
+
+def default_sink() -> ProfileSink:
+    """환경 변수에 따라 기본 저장소 선택"""
+    if PROFILE_S3_BUCKET:
+        return S3Sink(PROFILE_S3_BUCKET)
+    return LocalDirectorySink()
+
+
+class SamplingProfiler:
+    """
+    대상 스레드의 스택을 백그라운드 스레드에서 주기적으로 수집
+
+    `sys._current_frames()`만 사용하므로 트레이싱 프로파일러와 달리
+    대상 코드의 실행 속도에 영향을 거의 주지 않습니다.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.interval = interval_ms / 1000.0
+        self.samples: Counter = Counter()
+        self._target_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self._target_thread_id = threading.get_ident()
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread_id)
+            if frame is not None:
+                self.samples[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame: Any) -> str:
+        """프레임 체인을 root;...;leaf 형식 문자열로 변환"""
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append(f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+    def collapsed(self) -> str:
+        """collapsed-stack 형식 출력 (`stack count` 한 줄씩)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def should_profile(event: dict[str, Any]) -> bool:
+    """요청 헤더 또는 샘플링 비율에 따라 프로파일링 여부 결정"""
+    if PROFILE_TOKEN:
+        headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+        if headers.get(PROFILE_HEADER) == PROFILE_TOKEN:
+            return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profiled(
+    func: Optional[Callable] = None,
+    *,
+    sink: Optional[ProfileSink] = None,
+    enabled: Optional[bool] = None,
+) -> Callable:
+    """
+    Lambda 핸들러용 프로파일링 데코레이터
+
+    비활성 상태(샘플링 비율 0, 토큰 없음)에서는 원래 함수를 그대로 반환합니다.
+    """
+    if enabled is None:
+        enabled = PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_TOKEN)
+
+    def decorate(fn: Callable) -> Callable:
+        if not enabled:
+            return fn
+
+        @wraps(fn)
+        def wrapper(event: dict[str, Any], context: Any) -> Any:
+            if not should_profile(event):
+                return fn(event, context)
+
+            profiler = SamplingProfiler()
+            profiler.start()
+            try:
+                return fn(event, context)
+            finally:
+                profiler.stop()
+                _write_profile(profiler, fn.__name__, context, sink)
+
+        return wrapper
+
+    if func is not None:
+        return decorate(func)
+    return decorate
+
+
+def _write_profile(
+    profiler: SamplingProfiler,
+    name: str,
+    context: Any,
+    sink: Optional[ProfileSink],
+) -> None:
+    """프로파일 결과 저장 (실패해도 요청에는 영향 없음)"""
+    request_id = getattr(context, "aws_request_id", None) or f"{os.getpid()}-{random.randrange(1 << 32):08x}"
+    filename = f"{name}-{datetime.now().strftime('%Y%m%dT%H%M%S')}-{request_id}.collapsed"
+    try:
+        location = (sink or default_sink()).write(filename, profiler.collapsed())
+        logger.info(
+            f"🔬 프로파일 저장: {location} "
+            f"({sum(profiler.samples.values())} samples, {profiler.elapsed * 1000:.0f}ms)"
+        )
+    except Exception as e:
+        logger.error(f"❌ 프로파일 저장 오류: {str(e)}")
@@ -0,0 +1,89 @@
+"""
+Q&A 컬렉션 조회
+
+qa-documents 테이블의 아이템은 `source` 속성(perso.ai, test, excel 등)으로 컬렉션이 나뉩니다.
+`source`를 파티션 키, `created_at`을 정렬 키로 하는 GSI를 통해
+테이블 전체 Scan 대신 해당 컬렉션만 Query로 읽습니다.
+
+GSI 생성: python scripts/create_collection_index.py
+
+컬렉션 데이터 버전:
+적재 스크립트는 쓰기를 마친 뒤 bump_collection_version()으로 컬렉션의 버전 아이템
+(id "__index_version__#<컬렉션>")의 revision을 1 올립니다. index.py는 이 값을 ETag에 넣어
+적재 후에는 CDN/브라우저가 이전 답변을 304로 재사용하지 않도록 합니다.
+버전 아이템의 source는 VERSION_SOURCE라서 어떤 컬렉션 Query에도 잡히지 않습니다.
+
+환경 변수:
+- COLLECTION_INDEX: GSI 이름 (기본: source-created_at-index)
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+from boto3.dynamodb.conditions import Key
+
+COLLECTION_INDEX = os.environ.get("COLLECTION_INDEX", "source-created_at-index")
+COLLECTION_ATTRIBUTE = "source"
+CREATED_AT_ATTRIBUTE = "created_at"
+VERSION_SOURCE = "__index_version__"
+
+
+def query_collection(
+    table: Any,
+    collection: str,
+    *,
+    projection: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    컬렉션의 아이템을 페이지 단위로 조회
+
+    created_after / created_before(ISO 8601)는 정렬 키 조건으로 적용되므로
+    범위 밖 아이템은 읽지도 않습니다.
+    """
+    condition = Key(COLLECTION_ATTRIBUTE).eq(collection)
+    if created_after and created_before:
+        condition &= Key(CREATED_AT_ATTRIBUTE).between(created_after, created_before)
+    elif created_after:
+        condition &= Key(CREATED_AT_ATTRIBUTE).gte(created_after)
+    elif created_before:
+        condition &= Key(CREATED_AT_ATTRIBUTE).lte(created_before)
+
+    kwargs: dict[str, Any] = {"IndexName": COLLECTION_INDEX, "KeyConditionExpression": condition}
+    if projection:
+        # 예약어(source 등)와 충돌하지 않도록 속성 이름을 치환
+        names = [name.strip() for name in projection.split(",")]
+        kwargs["ProjectionExpression"] = ", ".join(f"#p{i}" for i in range(len(names)))
+        kwargs["ExpressionAttributeNames"] = {f"#p{i}": name for i, name in enumerate(names)}
+
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def version_key(collection: str) -> dict[str, str]:
+    """컬렉션 버전 아이템의 키"""
+    return {"id": f"{VERSION_SOURCE}#{collection}"}
+
+
+def collection_version(table: Any, collection: str) -> int:
+    """컬렉션 데이터 버전 (적재한 적이 없으면 0)"""
+    item = table.get_item(Key=version_key(collection), ProjectionExpression="revision").get("Item")
+    return int(item["revision"]) if item else 0
+
+
+def bump_collection_version(table: Any, collection: str) -> int:
+    """적재/게시 후 컬렉션 데이터 버전을 원자적으로 1 올리고 새 버전 반환"""
+    response = table.update_item(
+        Key=version_key(collection),
+        UpdateExpression="ADD revision :one SET #source = :source, #created_at = :now",
+        ExpressionAttributeNames={"#source": COLLECTION_ATTRIBUTE, "#created_at": CREATED_AT_ATTRIBUTE},
+        ExpressionAttributeValues={":one": 1, ":source": VERSION_SOURCE, ":now": datetime.now().isoformat()},
+        ReturnValues="UPDATED_NEW",
+    )
+    return int(response["Attributes"]["revision"])
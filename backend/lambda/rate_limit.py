@@ -0,0 +1,257 @@
+"""
+클라이언트별 요청 제한 (Bedrock 호출 앞단 admission control)
+
+클라이언트(검증된 API 키, 없으면 IP)마다 경로별 토큰 버킷을 두고, 토큰이 없으면 Bedrock을 호출하지 않고
+바로 429 + Retry-After를 반환합니다. 한 클라이언트가 Bedrock 처리량 한도를 다 써서
+다른 사용자 요청까지 느려지는 것을 막습니다.
+
+버킷 (경로별로 따로):
+- embed: 질문 임베딩만 하는 Q&A 검색 (index.py)
+- generate: Claude 응답 생성 (enhanced-chatbot-handler.py, simple-chatbot-handler.py)
+
+토큰 버킷은 GCRA로 구현하여 버킷마다 값 하나(tat: 버킷이 다시 가득 차는 시각, ms)만 저장합니다.
+요청 하나는 tat를 interval(= 1 / rate)만큼 뒤로 미루고, tat - now가 burst * interval을 넘으면 거절합니다.
+
+저장 백엔드:
+- DynamoDB: RATE_LIMIT_TABLE 설정 시 (파티션 키 bucket_key, TTL 속성 expires_at)
+  읽기 없이 조건부 UpdateItem(원자적 증가) 한 번으로 판정하며, 여러 컨테이너가 같은 버킷을 공유
+  (컨테이너가 마지막으로 본 tat로 분기를 골라, 계속 요청하는 클라이언트도 보통 쓰기 한 번으로 끝남)
+- 메모리: RATE_LIMIT_TABLE 미설정 시 (로컬 개발/테스트용, 컨테이너 단위)
+저장소 오류 시에는 요청을 통과시킵니다 (제한 기능 장애가 서비스 장애가 되지 않도록).
+
+테이블 생성: python scripts/create_rate_limit_table.py
+
+환경 변수:
+- RATE_LIMIT_TABLE: DynamoDB 테이블명 (기본: 없음 → 메모리)
+- RATE_LIMIT_API_KEYS: 클라이언트 키로 인정할 X-Api-Key 값, 쉼표 구분 (기본: 없음 → API Gateway가 검증한 키만 인정)
+- RATE_LIMIT_EMBED_RATE / RATE_LIMIT_EMBED_BURST: embed 초당 요청 수 / 최대 버스트 (기본: 2 / 20, rate 0이면 제한 없음)
+- RATE_LIMIT_GENERATE_RATE / RATE_LIMIT_GENERATE_BURST: generate 초당 요청 수 / 최대 버스트 (기본: 0.2 / 5)
+"""
+
+import os
+import json
+import math
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger()
+
+RATE_LIMIT_TABLE = os.environ.get("RATE_LIMIT_TABLE", "")
+RATE_LIMIT_EMBED_RATE = float(os.environ.get("RATE_LIMIT_EMBED_RATE", "2"))
+RATE_LIMIT_EMBED_BURST = int(os.environ.get("RATE_LIMIT_EMBED_BURST", "20"))
+RATE_LIMIT_GENERATE_RATE = float(os.environ.get("RATE_LIMIT_GENERATE_RATE", "0.2"))
+RATE_LIMIT_GENERATE_BURST = int(os.environ.get("RATE_LIMIT_GENERATE_BURST", "5"))
+RATE_LIMIT_API_KEYS = frozenset(k.strip() for k in os.environ.get("RATE_LIMIT_API_KEYS", "").split(",") if k.strip())
+
+EMBED = "embed"
+GENERATE = "generate"
+MEMORY_PRUNE_SIZE = 10000  # 메모리 버킷이 이 수를 넘으면 가득 찬(= 기본 상태) 버킷 정리
+DYNAMO_ATTEMPTS = 3
+
+
+@dataclass
+class Limit:
+    rate: float  # 초당 토큰
+    burst: int  # 최대 토큰
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    @property
+    def interval_ms(self) -> int:
+        return max(1, math.ceil(1000 / self.rate))
+
+
+LIMITS = {
+    EMBED: Limit(RATE_LIMIT_EMBED_RATE, RATE_LIMIT_EMBED_BURST),
+    GENERATE: Limit(RATE_LIMIT_GENERATE_RATE, RATE_LIMIT_GENERATE_BURST),
+}
+
+
+def _key_hash(api_key: str) -> str:
+    return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def client_key(event: dict[str, Any], api_keys: frozenset[str] = RATE_LIMIT_API_KEYS) -> str:
+    """
+    요청 클라이언트 식별자 (검증된 API 키가 있으면 키, 없으면 IP)
+
+    X-Api-Key 헤더는 누구나 바꿔 보낼 수 있으므로 그대로 믿으면 요청마다 새 버킷을 받게 됩니다.
+    API Gateway가 검증한 키(requestContext.identity.apiKeyId, private 엔드포인트)나
+    api_keys(RATE_LIMIT_API_KEYS)에 등록된 키만 인정하고, 나머지는 IP로 식별합니다.
+
+    REST API(v1)는 requestContext.identity.sourceIp, HTTP API(v2)는 requestContext.http.sourceIp를 쓰고,
+    둘 다 없으면 X-Forwarded-For의 첫 주소를 씁니다.
+    """
+    headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+    context = event.get("requestContext") or {}
+    identity = context.get("identity") or {}
+
+    if identity.get("apiKeyId"):
+        return f"key:{identity['apiKeyId']}"
+    api_key = headers.get("x-api-key")
+    if api_key and api_key in api_keys:
+        return _key_hash(api_key)
+
+    ip = identity.get("sourceIp") or (context.get("http") or {}).get("sourceIp")
+    if not ip:
+        ip = headers.get("x-forwarded-for", "").split(",")[0].strip()
+    return f"ip:{ip or 'unknown'}"
+
+
+class MemoryRateLimitBackend:
+    """프로세스 메모리 버킷 (DynamoDB 대체용)"""
+
+    def __init__(self):
+        self._tat: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, interval_ms: int, burst: int, now_ms: int) -> int:
+        """토큰 하나 사용 (허용이면 0, 거절이면 다시 시도할 수 있을 때까지 남은 ms)"""
+        with self._lock:
+            tat = max(self._tat.get(key, now_ms), now_ms)
+            allowed_until = now_ms + (burst - 1) * interval_ms
+            if tat > allowed_until:
+                return tat - allowed_until
+            self._tat[key] = tat + interval_ms
+            if len(self._tat) > MEMORY_PRUNE_SIZE:
+                self._tat = {k: v for k, v in self._tat.items() if v > now_ms}
+            return 0
+
+
+class DynamoRateLimitBackend:
+    """
+    DynamoDB 버킷 (조건부 UpdateItem으로 원자적 판정)
+
+    1. 버킷이 비어 있지 않고 여유가 있으면 tat += interval (조건: now <= tat <= 허용 한도)
+    2. 버킷이 가득 찼거나(tat < now) 없으면 tat = now + interval
+    컨테이너가 마지막으로 본 tat로 첫 분기를 고르므로, 계속 요청하는 클라이언트는 바로 1로 한 번에 성공합니다.
+    tat는 줄어들지 않으므로 기억한 tat가 이미 한도를 넘었으면 쓰기 없이 거절합니다.
+    실패 시 반환된 기존 tat로 다음 분기를 고르고, tat가 한도를 넘었으면 거절합니다.
+    """
+
+    def __init__(self, table: Any):
+        self.table = table
+        self._tat: dict[str, int] = {}  # 버킷 → 이 컨테이너가 마지막으로 본 tat (실제 값 이하)
+
+    def _update(self, key: str, expression: str, condition: str, values: dict[str, Any]) -> tuple[bool, int]:
+        """(조건 만족 여부, 갱신 후 tat 또는 실패 시 기존 tat — 아이템이 없으면 -1)"""
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.table.update_item(
+                Key={"bucket_key": key},
+                UpdateExpression=expression,
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values,
+                ReturnValues="UPDATED_NEW",
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+            return True, int(response["Attributes"]["tat"])
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            old = e.response.get("Item", {}).get("tat")
+            if old is None:
+                return False, -1
+            return False, int(old["N"] if isinstance(old, dict) else old)
+
+    def _remember(self, key: str, tat: int, now_ms: int) -> None:
+        self._tat[key] = tat
+        if len(self._tat) > MEMORY_PRUNE_SIZE:
+            self._tat = {k: v for k, v in self._tat.items() if v > now_ms}
+
+    def acquire(self, key: str, interval_ms: int, burst: int, now_ms: int) -> int:
+        allowed_until = now_ms + (burst - 1) * interval_ms
+        # 버킷이 완전히 다시 찰 때까지 보관 (TTL은 초 단위)
+        expires_at = (allowed_until + interval_ms) // 1000 + 60
+        tat = self._tat.get(key, -1)
+        for _ in range(DYNAMO_ATTEMPTS):
+            if tat > allowed_until:
+                self._remember(key, tat, now_ms)
+                return tat - allowed_until
+            if tat >= now_ms:
+                ok, tat = self._update(
+                    key,
+                    "SET tat = tat + :interval, expires_at = :expires",
+                    "tat BETWEEN :now AND :until",
+                    {":interval": interval_ms, ":expires": expires_at, ":now": now_ms, ":until": allowed_until},
+                )
+            else:
+                ok, tat = self._update(
+                    key,
+                    "SET tat = :tat, expires_at = :expires",
+                    "attribute_not_exists(tat) OR tat < :now",
+                    {":tat": now_ms + interval_ms, ":expires": expires_at, ":now": now_ms},
+                )
+            if ok:
+                self._remember(key, tat, now_ms)
+                return 0
+        logger.warning(f"⚠️  요청 제한 판정 경합, 통과 처리: {key}")
+        return 0
+
+
+class RateLimiter:
+    """클라이언트 × 경로별 토큰 버킷"""
+
+    def __init__(self, backend: Any = None, limits: Optional[dict[str, Limit]] = None):
+        self.backend = backend or default_backend()
+        self.limits = limits or LIMITS
+
+    def check(self, event: dict[str, Any], bucket: str) -> Optional[int]:
+        """요청 허용이면 None, 거절이면 Retry-After 초"""
+        limit = self.limits[bucket]
+        if not limit.enabled:
+            return None
+        key = f"{client_key(event)}#{bucket}"
+        try:
+            wait_ms = self.backend.acquire(key, limit.interval_ms, limit.burst, int(time.time() * 1000))
+        except Exception as e:
+            logger.error(f"❌ 요청 제한 저장소 오류, 통과 처리: {str(e)}")
+            return None
+        if wait_ms <= 0:
+            return None
+        logger.warning(f"🚦 요청 제한: {key} ({wait_ms}ms 후 재시도)")
+        return max(1, math.ceil(wait_ms / 1000))
+
+
+def too_many_requests(retry_after: int, headers: Optional[dict[str, str]] = None) -> dict[str, Any]:
+    """429 응답 (Lambda 프록시 형식, 기존 CORS 헤더 유지)"""
+    return {
+        "statusCode": 429,
+        "headers": {
+            "Content-Type": "application/json",
+            **(headers or {}),
+            "Retry-After": str(retry_after),
+            "Access-Control-Expose-Headers": "Retry-After",
+            "Cache-Control": "no-store",
+        },
+        "body": json.dumps({
+            "error": "요청이 너무 많습니다. 잠시 후 다시 시도해 주세요.",
+            "retryAfter": retry_after,
+            "success": False,
+        }, ensure_ascii=False),
+    }
+
+
+_default_backend = None
+
+
+def default_backend() -> Any:
+    """RATE_LIMIT_TABLE 설정 여부에 따라 DynamoDB 또는 메모리 백엔드 (컨테이너 재사용 시 캐시)"""
+    global _default_backend
+    if _default_backend is None:
+        if RATE_LIMIT_TABLE:
+            import boto3
+
+            region = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+            _default_backend = DynamoRateLimitBackend(boto3.resource("dynamodb", region_name=region).Table(RATE_LIMIT_TABLE))
+        else:
+            logger.warning("⚠️  RATE_LIMIT_TABLE 미설정, 메모리 요청 제한 사용")
+            _default_backend = MemoryRateLimitBackend()
+    return _default_backend
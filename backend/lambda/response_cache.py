@@ -0,0 +1,126 @@
+"""
+의미 기반 응답 캐시
+
+Claude가 생성한 답변을 (게임 타입, 질문 임베딩) 기준으로 컨테이너 메모리에 보관하고,
+새 질문이 캐시된 질문과 코사인 유사도 임계값 이상이며 답변 생성에 쓰인
+RAG 소스(뉴스/퀴즈 컨텍스트)가 그대로일 때 생성 없이 재사용합니다.
+
+- TTL: 만료된 항목은 조회 시 제거
+- 크기 제한: 최대 항목 수 초과 시 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- 통계: hits / misses / hit_rate / evictions (stats())
+
+환경 변수:
+- RESPONSE_CACHE_THRESHOLD: 재사용 최소 코사인 유사도 (기본: 0.95)
+- RESPONSE_CACHE_TTL_SECONDS: 항목 유지 시간 (기본: 600)
+- RESPONSE_CACHE_MAX_ENTRIES: 최대 항목 수 (기본: 256)
+"""
+
+import os
+import time
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger()
+
+RESPONSE_CACHE_THRESHOLD = float(os.environ.get("RESPONSE_CACHE_THRESHOLD", "0.95"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "600"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+
+def sources_fingerprint(knowledge_base: dict[str, Any]) -> str:
+    """RAG 소스 내용의 해시 (소스가 바뀌면 캐시된 답변을 쓰지 않음)"""
+    sources = [
+        {key: source.get(key) for key in ("type", "title", "content", "url")}
+        for source in knowledge_base.get("sources", [])
+    ]
+    return hashlib.sha256(json.dumps(sources, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    namespace: str
+    vector: np.ndarray
+    question: str
+    answer: str
+    sources_key: str
+    expires_at: float
+
+
+class SemanticResponseCache:
+    """네임스페이스(게임 타입)별 의미 유사도 캐시"""
+
+    def __init__(
+        self,
+        threshold: float = RESPONSE_CACHE_THRESHOLD,
+        ttl_seconds: int = RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, namespace: str, embedding: list[float], sources_key: str) -> Optional[CacheEntry]:
+        """임계값 이상으로 가장 유사하고 소스가 같은 항목 (없으면 None)"""
+        query = self._normalize(embedding)
+        now = time.time()
+        best_id, best_score = None, self.threshold
+
+        for entry_id, entry in list(self._entries.items()):
+            if entry.expires_at <= now:
+                del self._entries[entry_id]
+                self.evictions += 1
+                continue
+            if entry.namespace != namespace or entry.sources_key != sources_key or entry.vector.shape != query.shape:
+                continue
+            score = float(np.dot(entry.vector, query))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(best_id)
+        logger.info(f"♻️  응답 캐시 적중 (유사도 {best_score:.3f})")
+        return self._entries[best_id]
+
+    def store(self, namespace: str, embedding: list[float], question: str, answer: str, sources_key: str) -> None:
+        self._entries[self._next_id] = CacheEntry(
+            namespace=namespace,
+            vector=self._normalize(embedding),
+            question=question,
+            answer=answer,
+            sources_key=sources_key,
+            expires_at=time.time() + self.ttl_seconds,
+        )
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+        }
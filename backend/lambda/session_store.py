@@ -0,0 +1,171 @@
+"""
+대화 세션 저장소
+
+Claude 핸들러의 멀티턴 대화를 서버에 보관합니다.
+프롬프트에는 최근 몇 턴만 원문으로 넣고, 그보다 오래된 턴은 한 줄씩 압축한
+누적 요약으로 대체하여 대화가 길어져도 프롬프트 크기(= 지연 시간)가 일정하게 유지됩니다.
+
+저장 백엔드:
+- DynamoDB: SESSION_TABLE 설정 시 (파티션 키 session_id, TTL 속성 expires_at)
+- 메모리: SESSION_TABLE 미설정 시 (로컬 개발/테스트용, 컨테이너 단위로만 유지)
+
+테이블 생성: python scripts/create_session_table.py
+
+환경 변수:
+- SESSION_TABLE: DynamoDB 테이블명 (기본: 없음 → 메모리)
+- SESSION_TTL_SECONDS: 마지막 대화 후 세션 유지 시간 (기본: 86400)
+- SESSION_RECENT_TURNS: 원문으로 유지할 최근 턴 수 (기본: 4)
+- SESSION_MAX_PROMPT_TOKENS: 프롬프트에 넣을 대화 기록 토큰 상한 (기본: 1500)
+- SESSION_SUMMARY_MAX_TOKENS: 누적 요약 토큰 상한 (기본: 300)
+"""
+
+import os
+import re
+import time
+import uuid
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger()
+
+SESSION_TABLE = os.environ.get("SESSION_TABLE", "")
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", "86400"))
+SESSION_RECENT_TURNS = int(os.environ.get("SESSION_RECENT_TURNS", "4"))
+SESSION_MAX_PROMPT_TOKENS = int(os.environ.get("SESSION_MAX_PROMPT_TOKENS", "1500"))
+SESSION_SUMMARY_MAX_TOKENS = int(os.environ.get("SESSION_SUMMARY_MAX_TOKENS", "300"))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (한국어는 대략 1~2자당 1토큰이므로 보수적으로 2자당 1토큰)"""
+    return len(text) // 2 + 1
+
+
+def compress_turn(question: str, answer: str) -> str:
+    """턴 하나를 요약 한 줄로 압축 (질문 앞부분 + 답변 첫 문장)"""
+    first_sentence = _SENTENCE_END.split(answer.strip(), maxsplit=1)[0]
+    return f"- Q: {question.strip()[:80]} → A: {first_sentence.strip()[:120]}"
+
+
+@dataclass
+class Session:
+    session_id: str
+    summary: str = ""
+    turns: list[dict[str, str]] = field(default_factory=list)  # [{question, answer}]
+
+    def add_turn(self, question: str, answer: str) -> None:
+        """턴 추가 후 오래된 턴은 요약으로 이동"""
+        self.turns.append({"question": question, "answer": answer})
+        while len(self.turns) > SESSION_RECENT_TURNS:
+            oldest = self.turns.pop(0)
+            self._append_summary(compress_turn(oldest["question"], oldest["answer"]))
+
+    def _append_summary(self, line: str) -> None:
+        lines = [l for l in self.summary.split("\n") if l] + [line]
+        # 상한을 넘으면 가장 오래된 요약부터 제거
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > SESSION_SUMMARY_MAX_TOKENS:
+            lines.pop(0)
+        self.summary = "\n".join(lines)
+
+    def history_messages(self, max_tokens: int = SESSION_MAX_PROMPT_TOKENS) -> list[dict[str, str]]:
+        """
+        Claude messages 형식의 최근 대화 (user/assistant 교대, 토큰 상한 내 최신 턴부터)
+
+        요약은 상한에서 먼저 차감되며 system 프롬프트에 넣습니다 (summary 속성).
+        """
+        budget = max_tokens - (estimate_tokens(self.summary) if self.summary else 0)
+        selected: list[dict[str, str]] = []
+        for turn in reversed(self.turns):
+            cost = estimate_tokens(turn["question"]) + estimate_tokens(turn["answer"])
+            if cost > budget:
+                break
+            budget -= cost
+            selected.insert(0, turn)
+
+        messages = []
+        for turn in selected:
+            messages.append({"role": "user", "content": turn["question"]})
+            messages.append({"role": "assistant", "content": turn["answer"]})
+        return messages
+
+
+class MemorySessionBackend:
+    """프로세스 메모리 세션 저장 (DynamoDB 대체용)"""
+
+    def __init__(self):
+        self._items: dict[str, dict[str, Any]] = {}
+
+    def get(self, session_id: str) -> Optional[dict[str, Any]]:
+        item = self._items.get(session_id)
+        if item and item["expires_at"] <= time.time():
+            del self._items[session_id]
+            return None
+        return item
+
+    def put(self, item: dict[str, Any]) -> None:
+        self._items[item["session_id"]] = item
+
+
+class DynamoSessionBackend:
+    """DynamoDB 세션 저장 (만료는 테이블 TTL이 처리, 삭제 지연 대비 읽을 때도 확인)"""
+
+    def __init__(self, table: Any):
+        self.table = table
+
+    def get(self, session_id: str) -> Optional[dict[str, Any]]:
+        item = self.table.get_item(Key={"session_id": session_id}).get("Item")
+        if item and int(item.get("expires_at", 0)) <= time.time():
+            return None
+        return item
+
+    def put(self, item: dict[str, Any]) -> None:
+        self.table.put_item(Item=item)
+
+
+class SessionStore:
+    """세션 로드/저장"""
+
+    def __init__(self, backend: Any = None):
+        self.backend = backend or default_backend()
+
+    def load(self, session_id: Optional[str]) -> Session:
+        """세션 조회 (ID가 없거나 만료되었으면 새 세션)"""
+        if session_id:
+            item = self.backend.get(session_id)
+            if item:
+                return Session(
+                    session_id=session_id,
+                    summary=item.get("summary", ""),
+                    turns=list(item.get("turns", [])),
+                )
+        return Session(session_id=session_id or uuid.uuid4().hex)
+
+    def save(self, session: Session) -> None:
+        now = int(time.time())
+        self.backend.put({
+            "session_id": session.session_id,
+            "summary": session.summary,
+            "turns": session.turns,
+            "updated_at": now,
+            "expires_at": now + SESSION_TTL_SECONDS,
+        })
+
+
+_default_backend = None
+
+
+def default_backend() -> Any:
+    """SESSION_TABLE 설정 여부에 따라 DynamoDB 또는 메모리 백엔드 (컨테이너 재사용 시 캐시)"""
+    global _default_backend
+    if _default_backend is None:
+        if SESSION_TABLE:
+            import boto3
+
+            region = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+            _default_backend = DynamoSessionBackend(boto3.resource("dynamodb", region_name=region).Table(SESSION_TABLE))
+        else:
+            logger.warning("⚠️  SESSION_TABLE 미설정, 메모리 세션 사용")
+            _default_backend = MemorySessionBackend()
+    return _default_backend
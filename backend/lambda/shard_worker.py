@@ -0,0 +1,96 @@
+"""
+AWS Lambda Handler - 샤드 검색 워커
+
+샤드 하나의 스냅샷만 메모리에 올려 두고, 코디네이터(index.py, SEARCH_BACKEND=sharded)가
+보낸 쿼리 임베딩으로 Top-K를 계산해 반환합니다. 샤드마다 함수를 하나씩 배포합니다 (shards.py 참고).
+
+요청 형식 (Lambda invoke payload):
+{
+    "shard": 0,
+    "collection": "perso.ai",
+    "embedding": [0.01, ...],
+    "top_k": 3,
+    "threshold": 0.7,
+    "created_after": null
+}
+
+응답 형식:
+{"shard": 0, "version": "v20250101T000000Z", "results": [{id, question, answer, similarity}]}
+
+환경 변수:
+- SHARD_ID: 이 함수가 담당하는 샤드 번호
+- SNAPSHOT_PATH: 스냅샷 루트 (기본: 배포 패키지의 snapshot/, <컬렉션>/shard-<i> 하위 디렉터리)
+- SNAPSHOT_S3_BUCKET / SNAPSHOT_S3_PREFIX: 설정 시 콜드 스타트에 /tmp로 내려받아 사용
+- SNAPSHOT_REFRESH_SECONDS: 웜 컨테이너가 샤드 LATEST를 다시 읽는 간격 (기본: 60, 새 버전이면 교체)
+- SNAPSHOT_IDLE_SECONDS: 이 시간 동안 요청이 없는 컬렉션(이전 세대 등)의 인덱스를 닫고 /tmp에서 삭제 (기본: 600)
+"""
+
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Any
+
+from shards import shard_dir
+from snapshot import LatestSnapshot, SnapshotIndex
+
+# 로깅 설정
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 설정
+SHARD_ID = int(os.environ.get("SHARD_ID", "0"))
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", str(Path(__file__).parent / "snapshot"))
+SNAPSHOT_S3_BUCKET = os.environ.get("SNAPSHOT_S3_BUCKET", "")
+SNAPSHOT_S3_PREFIX = os.environ.get("SNAPSHOT_S3_PREFIX", "snapshots/qa/")
+SNAPSHOT_TMP_DIR = "/tmp/qa-snapshot"
+SNAPSHOT_IDLE_SECONDS = float(os.environ.get("SNAPSHOT_IDLE_SECONDS", "600"))
+
+_snapshots: dict[str, LatestSnapshot] = {}
+_last_used: dict[str, float] = {}
+
+
+def evict_idle(now: float, keep: str) -> None:
+    """SNAPSHOT_IDLE_SECONDS 동안 쓰지 않은 컬렉션 인덱스 정리 (게시로 바뀐 이전 세대 source 등)"""
+    for collection in [c for c, used in _last_used.items() if c != keep and now - used >= SNAPSHOT_IDLE_SECONDS]:
+        _last_used.pop(collection)
+        _snapshots.pop(collection).close()
+        logger.info(f"🧹 샤드 {SHARD_ID} 유휴 인덱스 정리: {collection}")
+
+
+def get_index(collection: str) -> SnapshotIndex:
+    """이 샤드의 컬렉션 스냅샷 (컨테이너 재사용 시 캐시, SNAPSHOT_REFRESH_SECONDS마다 새 버전 확인)"""
+    now = time.time()
+    evict_idle(now, keep=collection)
+    if collection not in _snapshots:
+        relative = f"{collection}/{shard_dir(SHARD_ID)}"
+        if SNAPSHOT_S3_BUCKET:
+            _snapshots[collection] = LatestSnapshot(f"{SNAPSHOT_TMP_DIR}/{relative}", SNAPSHOT_S3_BUCKET, f"{SNAPSHOT_S3_PREFIX}{relative}/")
+        else:
+            _snapshots[collection] = LatestSnapshot(str(Path(SNAPSHOT_PATH) / relative))
+    _last_used[collection] = now
+    return _snapshots[collection].get()
+
+
+def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """샤드 Top-K 검색 (오류는 예외 대신 error 필드로 반환하여 코디네이터가 샤드 실패로 처리)"""
+    try:
+        if int(event.get("shard", SHARD_ID)) != SHARD_ID:
+            raise ValueError(f"샤드 번호 불일치: 요청 {event.get('shard')}, 담당 {SHARD_ID}")
+
+        index = get_index(event["collection"])
+        embedding = event["embedding"]
+        if len(embedding) != index.dim:
+            raise ValueError(f"임베딩 차원 불일치: 요청 {len(embedding)}, 스냅샷 {index.dim}")
+
+        results = index.search(
+            embedding,
+            int(event["top_k"]),
+            float(event.get("threshold", 0.0)),
+            created_after=event.get("created_after"),
+        )
+        return {"shard": SHARD_ID, "version": index.version, "results": results}
+
+    except Exception as e:
+        logger.error(f"❌ 샤드 {SHARD_ID} 검색 오류: {str(e)}", exc_info=True)
+        return {"shard": SHARD_ID, "error": str(e)}
@@ -0,0 +1,162 @@
+"""
+샤드 분할 scatter-gather 검색
+
+한 Lambda의 메모리에 담을 수 있는 벡터 수를 넘는 컬렉션은 스냅샷을 N개 샤드로 나눠
+샤드마다 별도 워커(shard_worker.py Lambda 또는 로컬 스냅샷)가 검색하고,
+코디네이터(index.py, SEARCH_BACKEND=sharded)가 쿼리 임베딩을 모든 샤드에 동시에 보낸 뒤
+샤드별 Top-K를 합쳐 전체 Top-K를 만듭니다.
+
+- 샤드 배정: 부모 ID 해시 (패러프레이즈는 부모와 같은 샤드 → 샤드 안에서 부모 단위 중복 제거 유지)
+- 샤드 타임아웃: SHARD_TIMEOUT_SECONDS 안에 응답한 샤드 결과만으로 부분 응답 (partial=True)
+- 스냅샷 내보내기: python scripts/export_snapshot.py --collection perso.ai --shards 4
+
+환경 변수:
+- SHARD_COUNT: 샤드 수 (기본: 1)
+- SHARD_FUNCTION: 샤드 워커 Lambda 이름 템플릿, {shard}가 샤드 번호로 치환
+  (비어 있으면 SNAPSHOT_PATH/<컬렉션>/shard-<i>를 이 프로세스에서 스레드로 검색)
+- SHARD_TIMEOUT_SECONDS: 샤드 응답 대기 시간 (기본: 1.5)
+"""
+
+import os
+import json
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger()
+
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", "1"))
+SHARD_FUNCTION = os.environ.get("SHARD_FUNCTION", "")
+SHARD_TIMEOUT_SECONDS = float(os.environ.get("SHARD_TIMEOUT_SECONDS", "1.5"))
+
+
+def shard_of(item_id: str, shards: int) -> int:
+    """아이템 ID의 샤드 번호 (프로세스/실행과 무관하게 고정)"""
+    digest = hashlib.sha1(str(item_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def shard_dir(shard: int) -> str:
+    """컬렉션 스냅샷 루트 아래 샤드 디렉터리 이름"""
+    return f"shard-{shard}"
+
+
+@dataclass
+class GatherResult:
+    results: list[dict[str, Any]]
+    answered: int
+    shards: int
+
+    @property
+    def partial(self) -> bool:
+        return self.answered < self.shards
+
+
+class LocalShardWorker:
+    """이 프로세스에 연 샤드 스냅샷 검색 (numpy 행렬 연산은 GIL을 풀어 스레드로 병렬 실행)"""
+
+    def __init__(self, shard: int, snapshot: Any):
+        self.shard = shard
+        self.snapshot = snapshot  # snapshot.LatestSnapshot (검색할 때마다 새 버전 확인)
+
+    def search(self, collection: str, embedding: list[float], top_k: int, threshold: float, created_after: Optional[str]) -> list[dict[str, Any]]:
+        return self.snapshot.get().search(embedding, top_k, threshold, created_after=created_after)
+
+    def close(self) -> None:
+        self.snapshot.close()
+
+
+class LambdaShardWorker:
+    """샤드 워커 Lambda 동기 호출 (shard_worker.handler)"""
+
+    def __init__(self, shard: int, function_name: str, client: Any):
+        self.shard = shard
+        self.function_name = function_name
+        self.client = client
+
+    def search(self, collection: str, embedding: list[float], top_k: int, threshold: float, created_after: Optional[str]) -> list[dict[str, Any]]:
+        response = self.client.invoke(
+            FunctionName=self.function_name,
+            Payload=json.dumps({
+                "shard": self.shard,
+                "collection": collection,
+                "embedding": embedding,
+                "top_k": top_k,
+                "threshold": threshold,
+                "created_after": created_after,
+            }).encode("utf-8"),
+        )
+        payload = json.loads(response["Payload"].read())
+        if response.get("FunctionError") or "error" in payload:
+            raise RuntimeError(f"❌ 샤드 {self.shard} 오류: {payload.get('error') or payload.get('errorMessage')}")
+        return payload["results"]
+
+    def close(self) -> None:
+        """인덱스는 워커 Lambda가 가지고 있으므로 닫을 것 없음"""
+
+
+class ScatterGather:
+    """모든 샤드에 동시에 질의하고 샤드별 Top-K를 합쳐 전체 Top-K 반환"""
+
+    def __init__(self, workers: list[Any], timeout: float = SHARD_TIMEOUT_SECONDS):
+        self.workers = workers
+        self.timeout = timeout
+        # 타임아웃된 샤드 호출은 끝날 때까지 스레드를 점유하므로 샤드 수의 두 배까지 허용
+        self._pool = ThreadPoolExecutor(max_workers=2 * len(workers), thread_name_prefix="shard")
+
+    def search(
+        self,
+        collection: str,
+        embedding: list[float],
+        top_k: int,
+        threshold: float,
+        created_after: Optional[str] = None,
+    ) -> GatherResult:
+        futures = {
+            self._pool.submit(worker.search, collection, embedding, top_k, threshold, created_after): worker.shard
+            for worker in self.workers
+        }
+        done, pending = wait(futures, timeout=self.timeout)
+
+        merged: dict[str, dict[str, Any]] = {}
+        answered = 0
+        for future in done:
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"❌ 샤드 {futures[future]} 검색 실패: {str(e)}")
+                continue
+            answered += 1
+            for result in results:
+                current = merged.get(result["id"])
+                if current is None or result["similarity"] > current["similarity"]:
+                    merged[result["id"]] = result
+
+        if pending:
+            logger.warning(f"⚠️  샤드 {sorted(futures[f] for f in pending)} 응답 시간 초과 ({self.timeout}초), 부분 결과 사용")
+        results = sorted(merged.values(), key=lambda r: r["similarity"], reverse=True)[:top_k]
+        return GatherResult(results=results, answered=answered, shards=len(self.workers))
+
+    def close(self) -> None:
+        """워커의 샤드 인덱스를 닫고 스레드 풀 종료 (진행 중인 샤드 호출은 기다리지 않음)"""
+        for worker in self.workers:
+            worker.close()
+        self._pool.shutdown(wait=False)
+
+
+def lambda_workers(shards: int = SHARD_COUNT, function_template: str = SHARD_FUNCTION) -> list[LambdaShardWorker]:
+    """샤드 워커 Lambda 목록 (타임아웃은 코디네이터가 관리하므로 SDK 재시도 없음)"""
+    import boto3
+    from botocore.config import Config
+
+    client = boto3.client(
+        "lambda",
+        config=Config(
+            read_timeout=SHARD_TIMEOUT_SECONDS + 1,
+            retries={"max_attempts": 0},
+            max_pool_connections=2 * shards,
+        ),
+    )
+    return [LambdaShardWorker(shard, function_template.format(shard=shard), client) for shard in range(shards)]
@@ -1,12 +1,25 @@
 import json
 import boto3
 import logging
+import uuid
 from datetime import datetime
 
+from intent_classifier import canned_response
+from profiler import profiled
+from rate_limit import GENERATE, RateLimiter, too_many_requests
+from session_store import Session, SessionStore
+
 # 로깅 설정
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# 대화 세션 (최근 턴 + 누적 요약)
+session_store = SessionStore()
+
+# 클라이언트별 요청 제한 (generate 버킷)
+rate_limiter = RateLimiter()
+
+@profiled
 def lambda_handler(event, context):
     """
     간단하고 효과적인 Claude 챗봇 Lambda 핸들러
@@ -17,7 +30,7 @@ def lambda_handler(event, context):
         'Content-Type': 'application/json',
         'Access-Control-Allow-Origin': '*',
         'Access-Control-Allow-Methods': 'POST, OPTIONS',
-        'Access-Control-Allow-Headers': 'Content-Type'
+        'Access-Control-Allow-Headers': 'Content-Type, X-Api-Key'
     }
     
     # OPTIONS 요청 처리
@@ -34,6 +47,7 @@ def lambda_handler(event, context):
         user_question = body.get('question', '')
         game_type = body.get('gameType', '')
         question_text = body.get('questionText', '')
+        session_id = body.get('sessionId')
         
         if not user_question:
             return {
@@ -45,16 +59,45 @@ def lambda_handler(event, context):
                 }, ensure_ascii=False)
             }
         
+        session = load_session(session_id)
+        
+        # 정형 의도는 템플릿으로 바로 응답 (모델 호출 생략)
+        canned = canned_response(user_question, game_type)
+        if canned:
+            intent, response_text = canned
+            logger.info(f"Intent fast path: {intent.name} ({intent.confidence:.2f})")
+            save_turn(session, user_question, response_text)
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': json.dumps({
+                    'response': response_text,
+                    'intent': intent.name,
+                    'sessionId': session.session_id,
+                    'timestamp': datetime.now().isoformat(),
+                    'success': True
+                }, ensure_ascii=False)
+            }
+        
+        # 클라이언트별 요청 제한 (Claude 호출 전, 템플릿 응답은 제한하지 않음)
+        retry_after = rate_limiter.check(event, GENERATE)
+        if retry_after:
+            return too_many_requests(retry_after, headers)
+        
         logger.info(f"Question: {user_question[:100]}... (Game: {game_type})")
         
         # Claude 응답 생성
-        claude_response = generate_claude_response(user_question, game_type, question_text)
+        claude_response = generate_claude_response(user_question, game_type, question_text, session)
+        # 대체 응답은 다음 프롬프트의 대화 기록으로 쓰이지 않도록 저장하지 않음
+        if not isinstance(claude_response, FallbackResponse):
+            save_turn(session, user_question, claude_response)
         
         return {
             'statusCode': 200,
             'headers': headers,
             'body': json.dumps({
                 'response': claude_response,
+                'sessionId': session.session_id,
                 'timestamp': datetime.now().isoformat(),
                 'success': True
             }, ensure_ascii=False)
@@ -71,9 +114,35 @@ def lambda_handler(event, context):
             }, ensure_ascii=False)
         }
 
-def generate_claude_response(user_question, game_type, question_text):
+class FallbackResponse(str):
+    """
+    Claude 실패 시 대체 응답 (세션 대화 기록에는 남기지 않음)
+    """
+
+def load_session(session_id):
+    """
+    대화 세션 조회 (저장소 오류 시 새 세션으로 진행)
+    """
+    try:
+        return session_store.load(session_id)
+    except Exception as e:
+        logger.error(f"Session load error: {str(e)}")
+        return Session(session_id=session_id or uuid.uuid4().hex)
+
+def save_turn(session, user_question, claude_response):
+    """
+    이번 턴을 세션에 기록 (저장 실패는 응답에 영향 없음)
+    """
+    try:
+        session.add_turn(user_question, claude_response)
+        session_store.save(session)
+    except Exception as e:
+        logger.error(f"Session save error: {str(e)}")
+
+def generate_claude_response(user_question, game_type, question_text, session=None):
     """
     Claude를 사용한 응답 생성
+    session이 있으면 누적 요약(system)과 최근 턴(messages)을 토큰 상한 내에서 포함
     """
     try:
         # Bedrock 클라이언트 초기화
@@ -105,6 +174,13 @@ def generate_claude_response(user_question, game_type, question_text):
         
         user_prompt += "\n\n위 질문에 대해 경제학적 관점에서 도움이 되는 답변을 해주세요."
 
+        # 이전 대화 (요약 + 최근 턴)
+        history = []
+        if session:
+            if session.summary:
+                system_prompt += f"\n\n이전 대화 요약:\n{session.summary}"
+            history = session.history_messages()
+
         # Claude 모델 호출
         model_id = "anthropic.claude-3-sonnet-20240229-v1:0"
         
@@ -112,7 +188,7 @@ def generate_claude_response(user_question, game_type, question_text):
             "anthropic_version": "bedrock-2023-05-31",
             "max_tokens": 800,
             "system": system_prompt,
-            "messages": [
+            "messages": history + [
                 {
                     "role": "user",
                     "content": user_prompt
@@ -167,4 +243,4 @@ def generate_simple_response(user_question, game_type):
         'SignalDecoding': f"'{user_question}'에 대한 질문이군요. 경제 신호 해석은 다양한 지표와 데이터를 종합적으로 분석하는 것이 핵심입니다. 시장의 신호를 정확히 읽어내는 것이 중요한 경제적 판단의 기초가 됩니다. 구체적으로 어떤 신호나 지표가 궁금하신지 알려주세요."
     }
     
-    return responses.get(game_type, f"'{user_question}'에 대한 질문을 주셨네요. 경제적 관점에서 분석해보면, 다양한 요인들을 종합적으로 고려해야 합니다. 더 구체적인 질문이 있으시면 자세히 답변해드리겠습니다.")
\ No newline at end of file
+    return FallbackResponse(responses.get(game_type, f"'{user_question}'에 대한 질문을 주셨네요. 경제적 관점에서 분석해보면, 다양한 요인들을 종합적으로 고려해야 합니다. 더 구체적인 질문이 있으시면 자세히 답변해드리겠습니다."))
\ No newline at end of file
@@ -0,0 +1,528 @@
+"""
+Q&A 인덱스 스냅샷
+
+DynamoDB 테이블을 매 컨테이너마다 스캔하는 대신, 오프라인에서 한 번 내보낸
+스냅샷 파일을 memory-map으로 열어 바로 검색합니다.
+
+스냅샷 디렉터리 구조 (<root>/<version>/):
+- vectors.bin: L2 정규화된 임베딩 행렬 (row-major, float32 또는 float16)
+- ids.json: 행 번호 순서의 [{id, question, created_at, offset, length}] (answers.bin 내 위치)
+  패러프레이즈 행은 parent_id / parent_question을 추가로 가지며 검색 결과는 부모 Q&A로 반환
+  문서 청크 행은 chunk / chunk_start / chunk_end를 추가로 가지며 검색 시 인접 청크를 병합 (chunker.py)
+  뉴스 스냅샷(news_index.py) 행은 provider를 추가로 가짐
+- answers.bin: UTF-8 답변을 이어 붙인 blob
+- manifest.json: 버전, 개수, 차원, dtype, 임베딩 모델, 파일별 sha256, 전체 checksum
+
+<root>/LATEST 파일에는 최신 버전 이름이 기록됩니다.
+웜 컨테이너는 LatestSnapshot으로 SNAPSHOT_REFRESH_SECONDS마다 LATEST를 다시 읽어 새 버전으로 교체합니다.
+
+로드한 스냅샷에는 변경분(deltas.py)을 메모리에서 바로 반영할 수 있습니다.
+삭제/변경된 원본 행은 live 마스크로 가리고, 추가/변경된 행은 작은 overlay 행렬에 쌓으며
+행 번호는 원본 → overlay 순으로 이어집니다.
+"""
+
+import os
+import json
+import mmap
+import time
+import shutil
+import hashlib
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from chunker import CHUNK_FIELDS, collapse_hits
+
+logger = logging.getLogger()
+
+VECTORS_FILE = "vectors.bin"
+IDS_FILE = "ids.json"
+ANSWERS_FILE = "answers.bin"
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+SUPPORTED_DTYPES = ("float32", "float16")
+SEARCH_OVERFETCH = 4  # 부모 단위 중복 제거를 위해 top_k의 몇 배를 후보로 볼지
+SNAPSHOT_REFRESH_SECONDS = float(os.environ.get("SNAPSHOT_REFRESH_SECONDS", "60"))
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _combined_checksum(file_hashes: dict[str, str]) -> str:
+    return hashlib.sha256("".join(f"{name}:{h}\n" for name, h in sorted(file_hashes.items())).encode()).hexdigest()
+
+
+def _copy_chunk_fields(item: dict[str, Any], entry: dict[str, Any]) -> None:
+    """문서 청크 위치 필드 복사 (chunker.py)"""
+    if item.get("chunk") is not None:
+        entry.update({name: int(item[name]) for name in CHUNK_FIELDS})
+
+
+class SnapshotWriter:
+    """
+    스냅샷을 한 아이템씩 기록 (메모리 사용량 일정, 여러 writer를 동시에 열어 샤드별로 나눠 쓸 수 있음)
+
+    Args:
+        root: 스냅샷 루트 디렉터리
+        embedding_model / embedding_dim: 검색 시 쿼리 모델과 비교할 메타데이터
+        version: 버전 이름 (기본: UTC 타임스탬프)
+        dtype: float32 또는 float16
+        extra: manifest에 함께 기록할 값
+    """
+
+    def __init__(
+        self,
+        root: str,
+        *,
+        embedding_model: str,
+        embedding_dim: int,
+        version: Optional[str] = None,
+        dtype: str = "float32",
+        extra: Optional[dict[str, Any]] = None,
+    ):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"❌ 지원하지 않는 dtype: {dtype} ({SUPPORTED_DTYPES})")
+
+        self.root = Path(root)
+        self.version = version or datetime.now(timezone.utc).strftime("v%Y%m%dT%H%M%SZ")
+        self.out_dir = self.root / self.version
+        self.out_dir.mkdir(parents=True, exist_ok=False)
+        self.embedding_model = embedding_model
+        self.embedding_dim = embedding_dim
+        self.dtype = dtype
+        self.extra = extra or {}
+        self.entries: list[dict[str, Any]] = []
+        self._offset = 0
+        self._vectors = (self.out_dir / VECTORS_FILE).open("wb")
+        self._answers = (self.out_dir / ANSWERS_FILE).open("wb")
+
+    def add(self, item: dict[str, Any]) -> bool:
+        """{id, question, answer, embedding, created_at[, parent_id, parent_question, chunk 필드]} 기록 (스킵하면 False)"""
+        vector = np.asarray([float(x) for x in item["embedding"]], dtype=np.float32)
+        if vector.shape != (self.embedding_dim,):
+            logger.warning(f"⚠️  차원 불일치, 스킵: {item.get('id')} ({vector.shape[0]}차원)")
+            return False
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return False
+        self._vectors.write((vector / norm).astype(self.dtype).tobytes())
+
+        answer = str(item.get("answer", "")).encode("utf-8")
+        self._answers.write(answer)
+        entry = {
+            "id": str(item["id"]),
+            "question": str(item.get("question", "")),
+            "created_at": str(item.get("created_at", "")),
+            "offset": self._offset,
+            "length": len(answer),
+        }
+        if item.get("parent_id"):
+            entry["parent_id"] = str(item["parent_id"])
+            entry["parent_question"] = str(item.get("parent_question", ""))
+        if item.get("version"):
+            entry["version"] = str(item["version"])  # 변경분 순서 (deltas.py)
+        if item.get("provider"):
+            entry["provider"] = str(item["provider"])  # 뉴스 스냅샷의 언론사 (news_index.py)
+        _copy_chunk_fields(item, entry)
+        self.entries.append(entry)
+        self._offset += len(answer)
+        return True
+
+    def close(self) -> Path:
+        """ID 테이블과 manifest를 쓰고 LATEST 갱신 (manifest는 마지막에 써서 미완성 스냅샷을 열지 않게 함)"""
+        self._vectors.close()
+        self._answers.close()
+        out_dir = self.out_dir
+        (out_dir / IDS_FILE).write_text(json.dumps(self.entries, ensure_ascii=False), encoding="utf-8")
+
+        file_hashes = {name: _sha256(out_dir / name) for name in (VECTORS_FILE, IDS_FILE, ANSWERS_FILE)}
+        manifest = {
+            "version": self.version,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "count": len(self.entries),
+            "dim": self.embedding_dim,
+            "dtype": self.dtype,
+            "embedding_model": self.embedding_model,
+            "files": file_hashes,
+            "checksum": _combined_checksum(file_hashes),
+            **self.extra,
+        }
+        (out_dir / MANIFEST_FILE).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        (self.root / LATEST_FILE).write_text(self.version, encoding="utf-8")
+
+        logger.info(f"✅ 스냅샷 저장: {out_dir} ({len(self.entries)}개, {self.embedding_dim}차원, {self.dtype})")
+        return out_dir
+
+
+def write_snapshot(
+    items: Iterable[dict[str, Any]],
+    root: str,
+    *,
+    embedding_model: str,
+    embedding_dim: int,
+    version: Optional[str] = None,
+    dtype: str = "float32",
+    extra: Optional[dict[str, Any]] = None,
+) -> Path:
+    """아이템을 스냅샷 하나로 저장 (인자는 SnapshotWriter 참고)"""
+    writer = SnapshotWriter(
+        root,
+        embedding_model=embedding_model,
+        embedding_dim=embedding_dim,
+        version=version,
+        dtype=dtype,
+        extra=extra,
+    )
+    for item in items:
+        writer.add(item)
+    return writer.close()
+
+
+def upload_snapshot(snapshot_dir: Path, bucket: str, prefix: str) -> None:
+    """스냅샷 파일을 <prefix><버전>/에 업로드 후 <prefix>LATEST 갱신 (LATEST는 마지막에 써서 반쯤 올라간 버전을 가리키지 않게 함)"""
+    import boto3
+
+    s3 = boto3.client("s3")
+    version = snapshot_dir.name
+    for name in (VECTORS_FILE, IDS_FILE, ANSWERS_FILE, MANIFEST_FILE):
+        s3.upload_file(str(snapshot_dir / name), bucket, f"{prefix}{version}/{name}")
+    s3.put_object(Bucket=bucket, Key=f"{prefix}{LATEST_FILE}", Body=version.encode("utf-8"))
+    logger.info(f"☁️  업로드 완료: s3://{bucket}/{prefix}{version}")
+
+
+def download_snapshot(bucket: str, prefix: str, target_root: str) -> str:
+    """
+    S3 <prefix>LATEST가 가리키는 스냅샷을 target_root/<버전>으로 내려받기 (이미 있으면 재사용)
+
+    manifest를 마지막에 내려받으므로 중간에 실패한 디렉터리는 다음 호출에서 다시 받습니다.
+    """
+    import boto3
+
+    s3 = boto3.client("s3")
+    version = s3.get_object(Bucket=bucket, Key=f"{prefix}{LATEST_FILE}")["Body"].read().decode("utf-8").strip()
+    target = Path(target_root) / version
+    if not (target / MANIFEST_FILE).exists():
+        target.mkdir(parents=True, exist_ok=True)
+        for name in (VECTORS_FILE, IDS_FILE, ANSWERS_FILE, MANIFEST_FILE):
+            s3.download_file(bucket, f"{prefix}{version}/{name}", str(target / name))
+        logger.info(f"⬇️  스냅샷 다운로드: s3://{bucket}/{prefix}{version}")
+    return str(target)
+
+
+def prune_snapshots(bucket: str, prefix: str, keep: int) -> list[str]:
+    """
+    S3 <prefix> 아래 버전 중 최신 keep개와 LATEST가 가리키는 버전만 남기고 삭제, 삭제한 버전 반환
+
+    방금 LATEST를 읽고 이전 버전을 내려받는 중인 컨테이너가 있을 수 있으므로 keep은 2 이상을 권장합니다.
+    """
+    import boto3
+
+    s3 = boto3.client("s3")
+    latest = s3.get_object(Bucket=bucket, Key=f"{prefix}{LATEST_FILE}")["Body"].read().decode("utf-8").strip()
+    versions = sorted(
+        common["Prefix"][len(prefix):].rstrip("/")
+        for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=prefix, Delimiter="/")
+        for common in page.get("CommonPrefixes", [])
+    )
+    expired = [version for version in versions[:-max(keep, 1)] if version != latest]
+    for version in expired:
+        objects = [{"Key": f"{prefix}{version}/{name}"} for name in (VECTORS_FILE, IDS_FILE, ANSWERS_FILE, MANIFEST_FILE)]
+        s3.delete_objects(Bucket=bucket, Delete={"Objects": objects, "Quiet": True})
+    if expired:
+        logger.info(f"🗑️  이전 스냅샷 {len(expired)}개 삭제: s3://{bucket}/{prefix} ({expired[0]} ~ {expired[-1]})")
+    return expired
+
+
+def resolve_snapshot_dir(path: str) -> Path:
+    """루트 디렉터리면 LATEST가 가리키는 버전, 버전 디렉터리면 그대로 반환"""
+    root = Path(path)
+    if (root / MANIFEST_FILE).exists():
+        return root
+    latest = root / LATEST_FILE
+    if latest.exists():
+        return root / latest.read_text(encoding="utf-8").strip()
+    raise FileNotFoundError(f"❌ 스냅샷을 찾을 수 없습니다: {path}")
+
+
+class SnapshotIndex:
+    """memory-map으로 연 스냅샷 위의 코사인 유사도 검색"""
+
+    def __init__(self, path: str, verify: bool = False):
+        self.dir = resolve_snapshot_dir(path)
+        self.manifest = json.loads((self.dir / MANIFEST_FILE).read_text(encoding="utf-8"))
+        if verify:
+            self.verify()
+
+        self.version = self.manifest["version"]
+        self.dim = int(self.manifest["dim"])
+        self.entries: list[dict[str, Any]] = json.loads((self.dir / IDS_FILE).read_text(encoding="utf-8"))
+        count = len(self.entries)
+
+        if count:
+            self.vectors = np.memmap(self.dir / VECTORS_FILE, dtype=self.manifest["dtype"], mode="r", shape=(count, self.dim))
+        else:
+            self.vectors = np.zeros((0, self.dim), dtype=self.manifest["dtype"])
+        self._answers_file = (self.dir / ANSWERS_FILE).open("rb")
+        size = os.fstat(self._answers_file.fileno()).st_size
+        self._answers = mmap.mmap(self._answers_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._created_at: Optional[np.ndarray] = None
+
+        # 변경분 overlay
+        self._row_of: Optional[dict[str, int]] = None
+        self._live: Optional[np.ndarray] = None  # 원본 행 live 마스크 (삭제 전에는 None)
+        self._overlay_vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._overlay_entries: list[dict[str, Any]] = []
+        self._overlay_answers: list[str] = []
+        self._tombstones: dict[str, str] = {}  # 삭제된 id → 삭제 변경분 version
+        logger.info(f"📦 스냅샷 로드: {self.version} ({count}개, {self.dim}차원, {self.manifest['dtype']})")
+
+    def close(self) -> None:
+        """memory-map과 파일 핸들 해제 (교체된 인덱스의 디렉터리를 지우기 전에 호출)"""
+        if isinstance(self._answers, mmap.mmap):
+            self._answers.close()
+        self._answers = b""
+        self._answers_file.close()
+        self.vectors = np.zeros((0, self.dim), dtype=self.manifest["dtype"])
+        self.entries = []
+        self._row_of = None
+        self._live = None
+        self._created_at = None
+
+    def verify(self) -> None:
+        """파일별 sha256과 전체 checksum 확인"""
+        file_hashes = {name: _sha256(self.dir / name) for name in self.manifest["files"]}
+        if file_hashes != self.manifest["files"] or _combined_checksum(file_hashes) != self.manifest["checksum"]:
+            raise ValueError(f"❌ 스냅샷 checksum 불일치: {self.dir}")
+
+    def __len__(self) -> int:
+        dead = 0 if self._live is None else int((~self._live).sum())
+        return len(self.entries) - dead + len(self._overlay_entries)
+
+    def entry(self, row: int) -> dict[str, Any]:
+        base = len(self.entries)
+        return self.entries[row] if row < base else self._overlay_entries[row - base]
+
+    def answer(self, row: int) -> str:
+        base = len(self.entries)
+        if row >= base:
+            return self._overlay_answers[row - base]
+        entry = self.entries[row]
+        return bytes(self._answers[entry["offset"]:entry["offset"] + entry["length"]]).decode("utf-8")
+
+    def rows_created_after(self, created_after: str) -> np.ndarray:
+        """created_at이 created_after 이상인 행 번호"""
+        if self._created_at is None:
+            self._created_at = np.array([entry.get("created_at", "") for entry in self.entries])
+        rows = np.nonzero(self._created_at >= created_after)[0]
+        base = len(self.entries)
+        overlay = [base + i for i, entry in enumerate(self._overlay_entries) if entry.get("created_at", "") >= created_after]
+        return np.concatenate([rows, np.array(overlay, dtype=rows.dtype)]) if overlay else rows
+
+    def scores(self, query: list[float], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """코사인 유사도 (rows 지정 시 해당 행만 계산, 삭제된 행은 -inf)"""
+        base = len(self.entries)
+        base_rows = None if rows is None else rows[rows < base]
+        vectors = self.vectors if base_rows is None else self.vectors[base_rows]
+        overlay = self._overlay_vectors if rows is None else self._overlay_vectors[rows[rows >= base] - base]
+        q = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm == 0 or len(vectors) + len(overlay) == 0:
+            return np.zeros(len(vectors) + len(overlay), dtype=np.float32)
+        q = q / norm
+
+        scores = vectors.dot(q.astype(vectors.dtype)).astype(np.float32)
+        if self._live is not None:
+            live = self._live if base_rows is None else self._live[base_rows]
+            scores[~live] = -np.inf
+        if len(overlay):
+            scores = np.concatenate([scores, overlay.dot(q)])
+        return scores
+
+    def _rows_by_id(self) -> dict[str, int]:
+        if self._row_of is None:
+            self._row_of = {entry["id"]: row for row, entry in enumerate(self.entries)}
+        return self._row_of
+
+    def _current_version(self, item_id: str) -> str:
+        row = self._rows_by_id().get(item_id)
+        if row is not None:
+            return self.entry(row).get("version", "")
+        return self._tombstones.get(item_id, "")
+
+    def _remove(self, item_id: str) -> bool:
+        row_of = self._rows_by_id()
+        row = row_of.pop(item_id, None)
+        if row is None:
+            return False
+        base = len(self.entries)
+        if row < base:
+            if self._live is None:
+                self._live = np.ones(base, dtype=bool)
+            self._live[row] = False
+            return True
+        # overlay 행은 실제로 빼고 뒤쪽 행 번호를 당김
+        index = row - base
+        self._overlay_vectors = np.delete(self._overlay_vectors, index, axis=0)
+        del self._overlay_entries[index]
+        del self._overlay_answers[index]
+        for moved, entry in enumerate(self._overlay_entries[index:], start=row):
+            row_of[entry["id"]] = moved
+        return True
+
+    def upsert(self, item: dict[str, Any], version: str = "") -> bool:
+        """
+        아이템 추가/교체 ({id, question, answer, embedding, created_at[, parent_id, parent_question]})
+
+        version이 현재 행(또는 삭제 기록)보다 오래되었으면 무시하고 False를 반환합니다.
+        """
+        item_id = str(item["id"])
+        if version and version <= self._current_version(item_id):
+            return False
+        vector = np.asarray([float(x) for x in item["embedding"]], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if vector.shape != (self.dim,) or norm == 0:
+            logger.warning(f"⚠️  변경분 임베딩 형식 오류, 스킵: {item_id}")
+            return False
+
+        self._remove(item_id)
+        self._tombstones.pop(item_id, None)
+        entry = {
+            "id": item_id,
+            "question": str(item.get("question", "")),
+            "created_at": str(item.get("created_at", "")),
+            "version": version,
+        }
+        if item.get("parent_id"):
+            entry["parent_id"] = str(item["parent_id"])
+            entry["parent_question"] = str(item.get("parent_question", ""))
+        _copy_chunk_fields(item, entry)
+        self._overlay_vectors = np.vstack([self._overlay_vectors, (vector / norm)[None, :]])
+        self._overlay_entries.append(entry)
+        self._overlay_answers.append(str(item.get("answer", "")))
+        self._rows_by_id()[item_id] = len(self.entries) + len(self._overlay_entries) - 1
+        return True
+
+    def delete(self, item_id: str, version: str = "") -> bool:
+        """아이템 삭제 (version이 현재보다 오래되었으면 무시, 실제로 지운 행이 있으면 True)"""
+        item_id = str(item_id)
+        if version and version <= self._current_version(item_id):
+            return False
+        self._tombstones[item_id] = version
+        return self._remove(item_id)
+
+    def iter_items(self) -> Iterator[dict[str, Any]]:
+        """삭제되지 않은 모든 행을 write_snapshot 입력 형식으로 (변경분 압축용)"""
+        for row in sorted(self._rows_by_id().values()):
+            entry = self.entry(row)
+            base = len(self.entries)
+            vector = self.vectors[row] if row < base else self._overlay_vectors[row - base]
+            yield {**entry, "answer": self.answer(row), "embedding": np.asarray(vector, dtype=np.float32)}
+
+    def search(
+        self,
+        query: list[float],
+        top_k: int,
+        threshold: float = 0.0,
+        created_after: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        유사도 상위 top_k개 중 threshold 이상인 결과 (created_after는 점수 계산 전에 적용)
+
+        패러프레이즈 행은 부모 Q&A로 합쳐지므로 부모마다 가장 높은 점수 하나만 반환하고,
+        문서 청크 행은 함께 걸린 인접 청크를 이어 붙여 문서마다 하나로 반환합니다.
+        """
+        rows = self.rows_created_after(created_after) if created_after else None
+        scores = self.scores(query, rows)
+        if scores.size == 0:
+            return []
+        # 같은 부모가 여러 번 나올 수 있으므로 여유 있게 후보 선택
+        k = min(top_k * SEARCH_OVERFETCH, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        hits = []
+        for position in top:
+            similarity = float(scores[position])
+            if similarity < threshold:
+                break
+            row = int(rows[position]) if rows is not None else int(position)
+            hits.append({**self.entry(row), "answer": self.answer(row), "similarity": similarity})
+        return collapse_hits(hits, top_k)
+
+
+class LatestSnapshot:
+    """
+    LATEST가 가리키는 스냅샷 인덱스 (컨테이너 재사용 시 refresh_seconds마다 새 버전 확인)
+
+    bucket이 있으면 S3 <prefix>LATEST 버전을 root 아래로 내려받고, 없으면 root/LATEST를 읽습니다.
+    버전이 바뀌면 새 인덱스로 교체하고 이전 인덱스는 닫습니다 (S3에서 받은 이전 버전 디렉터리도 삭제).
+    check는 새 인덱스를 쓰기 전에 호출되며 (임베딩 모델 확인 등), 갱신 중 실패하면 이전 인덱스를 계속 씁니다.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        bucket: str = "",
+        prefix: str = "",
+        refresh_seconds: float = SNAPSHOT_REFRESH_SECONDS,
+        check: Optional[Any] = None,
+    ):
+        self.root = root
+        self.bucket = bucket
+        self.prefix = prefix
+        self.refresh_seconds = refresh_seconds
+        self.check = check
+        self._index: Optional[SnapshotIndex] = None
+        self._checked_at = 0.0
+
+    def _latest_dir(self) -> Path:
+        if self.bucket:
+            return resolve_snapshot_dir(download_snapshot(self.bucket, self.prefix, self.root))
+        return resolve_snapshot_dir(self.root)
+
+    def _swap(self, snapshot_dir: Path) -> None:
+        index = SnapshotIndex(str(snapshot_dir))
+        if self.check:
+            try:
+                self.check(index)
+            except Exception:
+                index.close()
+                raise
+        previous, self._index = self._index, index
+        if previous is not None:
+            previous.close()
+            if self.bucket:
+                shutil.rmtree(previous.dir, ignore_errors=True)
+            logger.info(f"🔄 스냅샷 교체: {previous.version} → {index.version} ({self.root})")
+
+    def get(self) -> SnapshotIndex:
+        """현재 인덱스 (처음 로드 실패는 예외, 이후 확인 실패는 경고 후 기존 인덱스 사용)"""
+        now = time.time()
+        if self._index is None:
+            self._checked_at = now
+            self._swap(self._latest_dir())
+        elif now - self._checked_at >= self.refresh_seconds:
+            self._checked_at = now
+            try:
+                snapshot_dir = self._latest_dir()
+                if snapshot_dir != self._index.dir:
+                    self._swap(snapshot_dir)
+            except Exception as e:
+                logger.warning(f"⚠️  새 스냅샷 확인 실패, 기존 버전 사용 ({self.root}): {str(e)}")
+        return self._index
+
+    def close(self) -> None:
+        """인덱스를 닫고 S3에서 내려받은 디렉터리 삭제"""
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        if self.bucket:
+            shutil.rmtree(self.root, ignore_errors=True)
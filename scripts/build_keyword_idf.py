@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+키워드 엔진 IDF 가중치 생성 (backend/lambda/keyword_engine.py)
+
+기사 코퍼스에서 용어별 문서 빈도를 세어 IDF를 계산합니다.
+용어 추출은 Lambda와 같은 KeywordEngine을 사용하므로 동의어는 정규형으로 합쳐서 셉니다.
+
+코퍼스 형식:
+- .jsonl: 한 줄에 기사 하나 ({"title": ..., "content": ...}, BigKinds documents 필드와 동일)
+- 그 외: 한 줄에 기사 하나인 텍스트
+
+IDF = ln((N + 1) / (df + 1)) + 1  (코퍼스에 없는 용어는 df = 0 값을 default_idf로 사용)
+
+실행:
+python scripts/build_keyword_idf.py data/articles.jsonl
+python scripts/build_keyword_idf.py data/articles.jsonl data/more.txt --min-df 3 --out backend/lambda/keyword_idf.json
+"""
+
+import sys
+import json
+import math
+import logging
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Iterator
+
+# Lambda 공용 모듈 (keyword_engine.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from keyword_engine import KeywordEngine
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUT = str(Path(__file__).resolve().parent.parent / "backend" / "lambda" / "keyword_idf.json")
+
+
+def read_documents(path: str) -> Iterator[str]:
+    """코퍼스 파일에서 기사 텍스트를 하나씩 읽기"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if path.endswith(".jsonl"):
+                record = json.loads(line)
+                yield f"{record.get('title', '')} {record.get('content', '')}"
+            else:
+                yield line
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="키워드 IDF 가중치 생성")
+    parser.add_argument("corpus", nargs="+", help="기사 코퍼스 파일 (.jsonl 또는 텍스트)")
+    parser.add_argument("--min-df", type=int, default=2, help="저장할 최소 문서 빈도 (기본: 2)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="출력 JSON 경로")
+    args = parser.parse_args()
+
+    engine = KeywordEngine()
+    df: Counter = Counter()
+    documents = 0
+    for path in args.corpus:
+        for text in read_documents(path):
+            documents += 1
+            df.update(term for term, _, _ in engine.terms(text))
+        logger.info(f"📖 {path} 처리 완료 (누적 {documents}개 기사)")
+
+    idf = {
+        term: round(math.log((documents + 1) / (count + 1)) + 1, 4)
+        for term, count in sorted(df.items())
+        if count >= args.min_df
+    }
+    output = {
+        "documents": documents,
+        "default_idf": round(math.log(documents + 1) + 1, 4),
+        "idf": idf,
+    }
+    Path(args.out).write_text(json.dumps(output, ensure_ascii=False, indent=1), encoding="utf-8")
+    logger.info(f"✅ {len(idf)}개 용어 IDF 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+qa-documents 테이블에 컬렉션 GSI 추가
+
+파티션 키 `source`(컬렉션), 정렬 키 `created_at`으로 GSI를 만들어
+Lambda와 적재 스크립트가 테이블 전체 Scan 대신 컬렉션 단위 Query를 사용하도록 합니다.
+기존 아이템(perso.ai, test, excel)은 이미 두 속성을 가지고 있어 별도 백필이 필요 없습니다.
+(created_at이 없는 아이템은 GSI에 포함되지 않으므로 적재 스크립트가 항상 기록합니다)
+
+실행:
+python scripts/create_collection_index.py
+python scripts/create_collection_index.py --wait
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+import boto3
+from dotenv import load_dotenv
+
+# Lambda 공용 모듈 (qa_store.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from qa_store import COLLECTION_ATTRIBUTE, COLLECTION_INDEX, CREATED_AT_ATTRIBUTE
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+AWS_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
+
+
+def index_status(client, table_name: str) -> str:
+    """GSI 상태 (없으면 빈 문자열)"""
+    table = client.describe_table(TableName=table_name)["Table"]
+    for index in table.get("GlobalSecondaryIndexes", []):
+        if index["IndexName"] == COLLECTION_INDEX:
+            return index["IndexStatus"]
+    return ""
+
+
+def create_index(client, table_name: str) -> None:
+    """온디맨드 테이블 기준으로 GSI 생성 요청 (프로비저닝 테이블이면 처리량 지정 필요)"""
+    billing = client.describe_table(TableName=table_name)["Table"].get("BillingModeSummary", {})
+    index = {
+        "IndexName": COLLECTION_INDEX,
+        "KeySchema": [
+            {"AttributeName": COLLECTION_ATTRIBUTE, "KeyType": "HASH"},
+            {"AttributeName": CREATED_AT_ATTRIBUTE, "KeyType": "RANGE"},
+        ],
+        # 검색에 임베딩/답변이 모두 필요하므로 전체 속성 프로젝션
+        "Projection": {"ProjectionType": "ALL"},
+    }
+    if billing.get("BillingMode") != "PAY_PER_REQUEST":
+        index["ProvisionedThroughput"] = {"ReadCapacityUnits": 5, "WriteCapacityUnits": 5}
+
+    client.update_table(
+        TableName=table_name,
+        AttributeDefinitions=[
+            {"AttributeName": COLLECTION_ATTRIBUTE, "AttributeType": "S"},
+            {"AttributeName": CREATED_AT_ATTRIBUTE, "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexUpdates=[{"Create": index}],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="컬렉션 GSI 생성")
+    parser.add_argument("--wait", action="store_true", help="GSI가 ACTIVE가 될 때까지 대기")
+    args = parser.parse_args()
+
+    client = boto3.client("dynamodb", region_name=AWS_REGION)
+    status = index_status(client, DYNAMODB_TABLE)
+    if status:
+        logger.info(f"ℹ️  {COLLECTION_INDEX} 이미 존재 ({status})")
+    else:
+        create_index(client, DYNAMODB_TABLE)
+        logger.info(f"🔨 {DYNAMODB_TABLE}에 {COLLECTION_INDEX} 생성 요청")
+        status = "CREATING"
+
+    while args.wait and status != "ACTIVE":
+        time.sleep(15)
+        status = index_status(client, DYNAMODB_TABLE)
+        logger.info(f"⏳ {COLLECTION_INDEX}: {status}")
+
+    logger.info("✅ 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+변경분 로그 테이블 생성 + Q&A 테이블 스트림 활성화 (backend/lambda/deltas.py)
+
+1. DELTA_TABLE: 파티션 키 collection, 정렬 키 seq, 온디맨드 과금, expires_at TTL
+2. DYNAMODB_TABLE: DynamoDB Streams (NEW_AND_OLD_IMAGES) 활성화
+   → 출력되는 스트림 ARN을 배포 시 QA_TABLE_STREAM_ARN으로 지정하고 DELTA_SYNC=enabled로 배포
+     (delta_handler.handler / compact_handler 트리거, SNAPSHOT_S3_BUCKET도 필요)
+
+실행:
+python scripts/create_delta_table.py
+DELTA_TABLE=qa-deltas-dev python scripts/create_delta_table.py
+"""
+
+import os
+import logging
+
+import boto3
+from dotenv import load_dotenv
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+AWS_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
+DELTA_TABLE = os.environ.get("DELTA_TABLE", "qa-deltas")
+
+
+def main() -> None:
+    client = boto3.client("dynamodb", region_name=AWS_REGION)
+
+    existing = client.list_tables()["TableNames"]
+    if DELTA_TABLE in existing:
+        logger.info(f"ℹ️  {DELTA_TABLE} 이미 존재")
+    else:
+        client.create_table(
+            TableName=DELTA_TABLE,
+            KeySchema=[
+                {"AttributeName": "collection", "KeyType": "HASH"},
+                {"AttributeName": "seq", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "collection", "AttributeType": "S"},
+                {"AttributeName": "seq", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        logger.info(f"🔨 {DELTA_TABLE} 생성 중...")
+        client.get_waiter("table_exists").wait(TableName=DELTA_TABLE)
+
+    ttl = client.describe_time_to_live(TableName=DELTA_TABLE)["TimeToLiveDescription"]
+    if ttl["TimeToLiveStatus"] == "DISABLED":
+        client.update_time_to_live(
+            TableName=DELTA_TABLE,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": "expires_at"},
+        )
+    logger.info(f"✅ {DELTA_TABLE} 준비 완료 (TTL: expires_at)")
+
+    table = client.describe_table(TableName=DYNAMODB_TABLE)["Table"]
+    stream = table.get("StreamSpecification", {})
+    if not stream.get("StreamEnabled"):
+        client.update_table(
+            TableName=DYNAMODB_TABLE,
+            StreamSpecification={"StreamEnabled": True, "StreamViewType": "NEW_AND_OLD_IMAGES"},
+        )
+        logger.info(f"🔨 {DYNAMODB_TABLE} 스트림 활성화 중...")
+        client.get_waiter("table_exists").wait(TableName=DYNAMODB_TABLE)
+        table = client.describe_table(TableName=DYNAMODB_TABLE)["Table"]
+    elif stream.get("StreamViewType") != "NEW_AND_OLD_IMAGES":
+        raise SystemExit(f"❌ {DYNAMODB_TABLE} 스트림 타입이 {stream.get('StreamViewType')}입니다 (NEW_AND_OLD_IMAGES 필요)")
+
+    logger.info(f"✅ {DYNAMODB_TABLE} 스트림 ARN: {table['LatestStreamArn']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+인덱스 세대 포인터 테이블 생성 (backend/lambda/generations.py)
+
+파티션 키 collection, 온디맨드 과금. 컬렉션마다 아이템 하나(라이브 세대 포인터)만 저장합니다.
+
+테이블 이름에는 기본값이 없습니다. 같은 GENERATION_TABLE을 Lambda 배포(serverless.yml)와
+적재 스크립트(insert_perso_qa.py, index_generations.py, export_snapshot.py)에 함께 설정해야
+새 세대가 실제로 검색됩니다. 둘 다 비워 두면 세대 없이 컬렉션에 바로 쓰고 읽습니다.
+
+실행:
+GENERATION_TABLE=qa-generations python scripts/create_generation_table.py
+"""
+
+import os
+import sys
+import logging
+
+import boto3
+from dotenv import load_dotenv
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+AWS_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+GENERATION_TABLE = os.environ.get("GENERATION_TABLE", "")
+
+
+def main() -> None:
+    if not GENERATION_TABLE:
+        logger.error("❌ GENERATION_TABLE 미설정 (Lambda 배포와 같은 포인터 테이블 이름을 설정하세요)")
+        sys.exit(1)
+
+    client = boto3.client("dynamodb", region_name=AWS_REGION)
+
+    existing = client.list_tables()["TableNames"]
+    if GENERATION_TABLE in existing:
+        logger.info(f"ℹ️  {GENERATION_TABLE} 이미 존재")
+    else:
+        client.create_table(
+            TableName=GENERATION_TABLE,
+            KeySchema=[{"AttributeName": "collection", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "collection", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        logger.info(f"🔨 {GENERATION_TABLE} 생성 중...")
+        client.get_waiter("table_exists").wait(TableName=GENERATION_TABLE)
+    logger.info(f"✅ {GENERATION_TABLE} 준비 완료")
+    logger.info(f"ℹ️  serverless 배포와 적재 스크립트 모두 GENERATION_TABLE={GENERATION_TABLE}로 실행하세요")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+요청 제한 테이블 생성 (backend/lambda/rate_limit.py)
+
+파티션 키 bucket_key, 온디맨드 과금, expires_at 속성으로 TTL을 켜서
+다시 가득 찬 클라이언트 버킷은 DynamoDB가 자동 삭제합니다.
+
+실행:
+python scripts/create_rate_limit_table.py
+RATE_LIMIT_TABLE=rate-limits-dev python scripts/create_rate_limit_table.py
+"""
+
+import os
+import logging
+
+import boto3
+from dotenv import load_dotenv
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+AWS_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+RATE_LIMIT_TABLE = os.environ.get("RATE_LIMIT_TABLE", "rate-limits")
+
+
+def main() -> None:
+    client = boto3.client("dynamodb", region_name=AWS_REGION)
+
+    existing = client.list_tables()["TableNames"]
+    if RATE_LIMIT_TABLE in existing:
+        logger.info(f"ℹ️  {RATE_LIMIT_TABLE} 이미 존재")
+    else:
+        client.create_table(
+            TableName=RATE_LIMIT_TABLE,
+            KeySchema=[{"AttributeName": "bucket_key", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "bucket_key", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        logger.info(f"🔨 {RATE_LIMIT_TABLE} 생성 중...")
+        client.get_waiter("table_exists").wait(TableName=RATE_LIMIT_TABLE)
+
+    ttl = client.describe_time_to_live(TableName=RATE_LIMIT_TABLE)["TimeToLiveDescription"]
+    if ttl["TimeToLiveStatus"] == "DISABLED":
+        client.update_time_to_live(
+            TableName=RATE_LIMIT_TABLE,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": "expires_at"},
+        )
+    logger.info(f"✅ {RATE_LIMIT_TABLE} 준비 완료 (TTL: expires_at)")
+
+
+if __name__ == "__main__":
+    main()
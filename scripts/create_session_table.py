@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+대화 세션 테이블 생성 (backend/lambda/session_store.py)
+
+파티션 키 session_id, 온디맨드 과금, expires_at 속성으로 TTL을 켜서
+만료된 세션은 DynamoDB가 자동 삭제합니다.
+
+실행:
+python scripts/create_session_table.py
+SESSION_TABLE=chat-sessions-dev python scripts/create_session_table.py
+"""
+
+import os
+import logging
+
+import boto3
+from dotenv import load_dotenv
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+AWS_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+SESSION_TABLE = os.environ.get("SESSION_TABLE", "chat-sessions")
+
+
+def main() -> None:
+    client = boto3.client("dynamodb", region_name=AWS_REGION)
+
+    existing = client.list_tables()["TableNames"]
+    if SESSION_TABLE in existing:
+        logger.info(f"ℹ️  {SESSION_TABLE} 이미 존재")
+    else:
+        client.create_table(
+            TableName=SESSION_TABLE,
+            KeySchema=[{"AttributeName": "session_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "session_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        logger.info(f"🔨 {SESSION_TABLE} 생성 중...")
+        client.get_waiter("table_exists").wait(TableName=SESSION_TABLE)
+
+    ttl = client.describe_time_to_live(TableName=SESSION_TABLE)["TimeToLiveDescription"]
+    if ttl["TimeToLiveStatus"] == "DISABLED":
+        client.update_time_to_live(
+            TableName=SESSION_TABLE,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": "expires_at"},
+        )
+    logger.info(f"✅ {SESSION_TABLE} 준비 완료 (TTL: expires_at)")
+
+
+if __name__ == "__main__":
+    main()
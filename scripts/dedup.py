@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+적재 전 유사 중복 질문 병합 (MinHash + LSH)
+
+스프레드시트에는 같은 질문이 조금씩 다른 표현으로 반복되는 경우가 많아
+그대로 적재하면 벡터 수와 검색 비용만 늘어납니다.
+임베딩 전에 질문 텍스트의 MinHash 서명으로 유사 중복을 찾아
+처음 나온 행(대표 행)만 남기고, 병합된 클러스터를 보고합니다.
+
+방식:
+1. 질문 정규화 후 문자 3-gram shingle 집합 생성
+2. MinHash 서명 (NUM_PERM개 해시) → LSH 밴드별 버킷에 등록
+3. 같은 버킷을 공유하는 대표 행과 실제 Jaccard 유사도가 threshold 이상이고
+   질문의 숫자(연도, 금액 등)와 정규화한 답변이 모두 같을 때만 병합
+
+"2023년 기준금리" / "2024년 기준금리"처럼 묻는 사실이 다른 질문은 글자가 거의 같아도 병합하지 않으며,
+유사하지만 답변이 다른 행은 남긴 채 보고서에 답변 불일치로만 기록합니다.
+병합된 행은 적재 시 삭제되므로 기본값은 비활성이며, 보고서로 결과를 확인한 뒤 켜세요.
+
+행은 스트리밍으로 처리되며 대표 행의 서명만 메모리에 유지합니다.
+
+환경 변수:
+- DEDUP_THRESHOLD: 병합 기준 Jaccard 유사도 (기본: 0 → 비활성, 권장 0.8)
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from ingest_engine import normalize_question
+
+logger = logging.getLogger(__name__)
+
+DEDUP_THRESHOLD = float(os.environ.get("DEDUP_THRESHOLD", "0"))
+NUM_PERM = 64
+BANDS = 16  # 밴드당 4행 → Jaccard 0.8 쌍이 후보로 잡힐 확률 약 99.9%
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """공백/문장부호를 제거한 정규화 질문의 문자 n-gram 집합"""
+    compact = re.sub(r"[\s?？!.,~]", "", normalize_question(text))
+    if len(compact) <= size:
+        return {compact}
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+
+def numbers(text: str) -> tuple[str, ...]:
+    """질문의 숫자 토큰 (연도, 금액, 비율 — 다르면 다른 사실을 묻는 질문)"""
+    return tuple(re.findall(r"\d+(?:[.,]\d+)*", text))
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class MinHasher:
+    """(a·x + b) mod p 형태의 해시 NUM_PERM개로 MinHash 서명 생성"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        params = hashlib.sha256(f"minhash-{seed}".encode()).digest()
+        rng = int.from_bytes(params, "big")
+        self.params = []
+        for _ in range(num_perm):
+            rng = (rng * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = rng % _MERSENNE_PRIME or 1
+            rng = (rng * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            self.params.append((a, rng % _MERSENNE_PRIME))
+
+    def signature(self, items: set[str]) -> tuple[int, ...]:
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in items]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.params
+        )
+
+
+@dataclass
+class Cluster:
+    canonical: dict
+    duplicates: list[dict] = field(default_factory=list)
+    similarities: list[float] = field(default_factory=list)
+    conflicts: list[dict] = field(default_factory=list)  # 유사하지만 답변이 달라 병합하지 않은 행
+
+    @property
+    def answer_conflict(self) -> bool:
+        """유사한 질문 중 답변이 대표 행과 달라 따로 남긴 행이 있는지"""
+        return bool(self.conflicts)
+
+
+class NearDuplicateFilter:
+    """스트리밍 유사 중복 제거 (대표 행과 답변이 다른 행은 병합하지 않고 통과)"""
+
+    def __init__(self, threshold: float = DEDUP_THRESHOLD, num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError(f"❌ num_perm({num_perm})은 bands({bands})의 배수여야 합니다")
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self._buckets: list[dict[tuple[int, ...], list[int]]] = [{} for _ in range(bands)]
+        self._shingles: list[set[str]] = []
+        self._numbers: list[tuple[str, ...]] = []
+        self._answers: list[str] = []
+        self.clusters: list[Cluster] = []
+
+    def _find(
+        self, items: set[str], signature: tuple[int, ...], digits: tuple[str, ...], answer: str
+    ) -> tuple[Optional[tuple[int, float]], Optional[int]]:
+        """
+        (병합할 대표 행, 답변만 달라 병합하지 않은 대표 행)
+
+        숫자가 같고 Jaccard가 threshold 이상인 대표 행 중 답변이 같은 가장 유사한 행에 병합합니다.
+        """
+        candidates: set[int] = set()
+        for band, buckets in enumerate(self._buckets):
+            key = signature[band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            candidates.update(buckets.get(key, ()))
+        best, conflict = None, None
+        for index in sorted(candidates):
+            if self._numbers[index] != digits:
+                continue
+            similarity = jaccard(items, self._shingles[index])
+            if similarity < self.threshold:
+                continue
+            if self._answers[index] != answer:
+                conflict = index if conflict is None else conflict
+            elif best is None or similarity > best[1]:
+                best = (index, similarity)
+        return best, conflict
+
+    def filter(self, rows: Iterable[dict]) -> Iterator[dict]:
+        for row in rows:
+            items = shingles(row["question"])
+            signature = self.hasher.signature(items)
+            digits = numbers(normalize_question(row["question"]))
+            answer = normalize_question(row["answer"])
+            match, conflict = self._find(items, signature, digits, answer)
+            if match:
+                cluster = self.clusters[match[0]]
+                cluster.duplicates.append(row)
+                cluster.similarities.append(round(match[1], 3))
+                continue
+            if conflict is not None:
+                self.clusters[conflict].conflicts.append(row)
+
+            index = len(self.clusters)
+            self.clusters.append(Cluster(canonical=row))
+            self._shingles.append(items)
+            self._numbers.append(digits)
+            self._answers.append(answer)
+            for band, buckets in enumerate(self._buckets):
+                key = signature[band * self.rows_per_band:(band + 1) * self.rows_per_band]
+                buckets.setdefault(key, []).append(index)
+            yield row
+
+    @property
+    def merged(self) -> list[Cluster]:
+        return [c for c in self.clusters if c.duplicates]
+
+    def summary(self) -> str:
+        merged = self.merged
+        rows = sum(len(c.duplicates) for c in merged)
+        conflicts = sum(len(c.conflicts) for c in self.clusters)
+        return f"유사 중복 {rows}개 행을 {len(merged)}개 클러스터로 병합 (답변이 달라 남긴 유사 행 {conflicts}개)"
+
+    def write_report(self, path: str) -> None:
+        """
+        병합/답변 불일치 클러스터를 JSONL로 저장
+
+        (대표 질문, 병합된 질문, 유사도, 답변이 달라 병합하지 않은 질문)
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for cluster in self.clusters:
+                if not cluster.duplicates and not cluster.conflicts:
+                    continue
+                f.write(json.dumps({
+                    "canonical_id": cluster.canonical.get("id"),
+                    "canonical_question": cluster.canonical["question"],
+                    "merged_questions": [d["question"] for d in cluster.duplicates],
+                    "similarities": cluster.similarities,
+                    "answer_conflict": cluster.answer_conflict,
+                    "conflicting_questions": [d["question"] for d in cluster.conflicts],
+                }, ensure_ascii=False) + "\n")
+        logger.info(f"📝 중복 병합 보고서 저장: {path}")
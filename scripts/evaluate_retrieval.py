@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+검색 정확도/지연 평가 도구
+
+라벨링된 질문 세트로 검색 백엔드 설정을 비교하여
+정확도를 유지하는 가장 빠른 설정과 임계값을 고르는 데 사용합니다.
+
+평가 세트 (JSONL, 한 줄에 하나):
+{"question": "퍼소 AI가 뭐예요?", "expected_ids": ["perso-1"]}
+{"question": "오늘 날씨 어때?", "expected_ids": []}     # 데이터셋 밖 질문 → 답하지 않아야 정답
+
+백엔드 지정 (--backend, 여러 번 사용 가능):
+- dynamodb: 컬렉션을 한 번 읽은 뒤 index.py와 같은 방식(전체 코사인 비교)으로 검색
+- snapshot=<경로>: scripts/export_snapshot.py로 만든 스냅샷 (float32/float16)
+
+지표:
+- top1 / topK: 데이터셋 내 질문 중 1위 / K위 안에 정답 ID가 있는 비율
+- 임계값별 answered(답변 비율), correct(정답 답변 비율), false(오답 또는 범위 밖 질문에 답한 비율)
+- 검색 지연 p50 / p95 / 평균 (임베딩 시간 제외, 질문 임베딩은 한 번만 계산해 재사용)
+
+실행:
+python scripts/evaluate_retrieval.py data/eval.jsonl --backend dynamodb --backend snapshot=/tmp/qa-snapshot
+python scripts/evaluate_retrieval.py data/eval.jsonl --backend snapshot=/tmp/qa-snapshot --thresholds 0.6,0.65,0.7,0.75 --json report.json
+"""
+
+import os
+import sys
+import json
+import time
+import math
+import logging
+import argparse
+import statistics
+from pathlib import Path
+from typing import Any, Callable
+
+from dotenv import load_dotenv
+
+# Lambda 공용 모듈 (embeddings.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from embeddings import EmbeddingProvider, get_provider
+from qa_store import query_collection
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+AWS_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
+DEFAULT_THRESHOLDS = "0.5,0.55,0.6,0.65,0.7,0.75,0.8,0.85,0.9"
+DEFAULT_TOP_K = 3
+
+# (쿼리 임베딩, k) → [(id, similarity)] 유사도 내림차순
+SearchFn = Callable[[list[float], int], list[tuple[str, float]]]
+
+
+def load_eval_set(path: str) -> list[dict]:
+    """평가 세트 읽기"""
+    cases = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            cases.append({
+                "question": record["question"],
+                "expected_ids": [str(i) for i in record.get("expected_ids", [])],
+            })
+    logger.info(f"📋 평가 질문 {len(cases)}개 (범위 밖 {sum(1 for c in cases if not c['expected_ids'])}개)")
+    return cases
+
+
+def dynamodb_backend(provider: EmbeddingProvider, collection: str) -> SearchFn:
+    """index.py의 DynamoDB 방식 (전체 코사인 비교) 재현"""
+    import boto3
+
+    table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(DYNAMODB_TABLE)
+    items: list[tuple[str, list[float], float]] = []
+    projection = "id, parent_id, embedding, embedding_model, embedding_dim"
+    for item in query_collection(table, collection, projection=projection):
+        if "embedding" in item and provider.matches(item):
+            vector = [float(x) for x in item["embedding"]]
+            # 패러프레이즈 아이템은 부모 ID로 채점
+            items.append((item.get("parent_id") or item["id"], vector, math.sqrt(sum(x * x for x in vector))))
+    logger.info(f"📊 DynamoDB에서 {len(items)}개 문서 로드")
+
+    def search(query: list[float], k: int) -> list[tuple[str, float]]:
+        q_norm = math.sqrt(sum(x * x for x in query))
+        scored = []
+        for item_id, vector, norm in items:
+            if norm == 0 or q_norm == 0:
+                continue
+            scored.append((item_id, sum(a * b for a, b in zip(query, vector)) / (norm * q_norm)))
+        scored.sort(key=lambda x: x[1], reverse=True)
+        best: dict[str, float] = {}
+        for item_id, score in scored:
+            best.setdefault(item_id, score)
+        return list(best.items())[:k]
+
+    return search
+
+
+def snapshot_backend(provider: EmbeddingProvider, path: str) -> SearchFn:
+    """스냅샷 memory-map 검색"""
+    from snapshot import SnapshotIndex
+
+    index = SnapshotIndex(path, verify=True)
+    if not provider.matches({"embedding_model": index.manifest["embedding_model"], "embedding_dim": index.dim}):
+        raise ValueError(f"❌ 스냅샷 임베딩 모델 불일치 (현재: {provider.key})")
+
+    def search(query: list[float], k: int) -> list[tuple[str, float]]:
+        return [(r["id"], r["similarity"]) for r in index.search(query, k, threshold=-1.0)]
+
+    return search
+
+
+def build_backend(spec: str, provider: EmbeddingProvider, collection: str) -> SearchFn:
+    """--backend 값 → 검색 함수"""
+    name, _, arg = spec.partition("=")
+    if name == "dynamodb":
+        return dynamodb_backend(provider, collection)
+    if name == "snapshot":
+        return snapshot_backend(provider, arg)
+    raise ValueError(f"❌ 알 수 없는 백엔드: {spec}")
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def evaluate(
+    search: SearchFn,
+    cases: list[dict],
+    embeddings: list[list[float]],
+    top_k: int,
+    thresholds: list[float],
+) -> dict[str, Any]:
+    """백엔드 하나를 평가"""
+    latencies = []
+    top1 = topk = 0
+    in_domain = sum(1 for c in cases if c["expected_ids"])
+    per_threshold = {t: {"answered": 0, "correct": 0, "false": 0} for t in thresholds}
+
+    for case, embedding in zip(cases, embeddings):
+        started = time.perf_counter()
+        results = search(embedding, top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        expected = set(case["expected_ids"])
+        ids = [item_id for item_id, _ in results]
+        if expected:
+            top1 += bool(ids[:1] and ids[0] in expected)
+            topk += bool(expected.intersection(ids))
+
+        best_id, best_score = results[0] if results else (None, -1.0)
+        for t, counts in per_threshold.items():
+            if best_score < t:
+                continue
+            counts["answered"] += 1
+            if best_id in expected:
+                counts["correct"] += 1
+            else:
+                counts["false"] += 1
+
+    total = len(cases) or 1
+    return {
+        "top1": top1 / (in_domain or 1),
+        "topk": topk / (in_domain or 1),
+        "thresholds": {
+            str(t): {key: value / total for key, value in counts.items()}
+            for t, counts in per_threshold.items()
+        },
+        "latency_ms": {
+            "p50": percentile(latencies, 0.5) if latencies else 0.0,
+            "p95": percentile(latencies, 0.95) if latencies else 0.0,
+            "mean": statistics.fmean(latencies) if latencies else 0.0,
+        },
+    }
+
+
+def print_report(name: str, report: dict[str, Any], top_k: int) -> None:
+    latency = report["latency_ms"]
+    print(f"\n=== {name} ===")
+    print(f"top1 {report['top1']:.1%}  top{top_k} {report['topk']:.1%}  "
+          f"latency p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms  mean {latency['mean']:.2f}ms")
+    print(f"{'threshold':>10} {'answered':>9} {'correct':>8} {'false':>7}")
+    for t, row in report["thresholds"].items():
+        print(f"{float(t):>10.2f} {row['answered']:>9.1%} {row['correct']:>8.1%} {row['false']:>7.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="검색 백엔드 정확도/지연 평가")
+    parser.add_argument("eval_set", help="평가 세트 JSONL")
+    parser.add_argument("--backend", action="append", default=[], help="dynamodb 또는 snapshot=<경로> (여러 번 지정 가능)")
+    parser.add_argument("--collection", default="perso.ai", help="dynamodb 백엔드가 검색할 컬렉션")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help=f"top-K 정확도의 K (기본: {DEFAULT_TOP_K})")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="쉼표로 구분한 임계값 목록")
+    parser.add_argument("--json", dest="json_out", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    provider = get_provider()
+    cases = load_eval_set(args.eval_set)
+    thresholds = [float(t) for t in args.thresholds.split(",") if t.strip()]
+
+    logger.info(f"🔢 질문 임베딩 중 ({provider.key})...")
+    embeddings = [provider.embed(case["question"]) for case in cases]
+
+    reports = {}
+    for spec in args.backend or ["dynamodb"]:
+        reports[spec] = evaluate(build_backend(spec, provider, args.collection), cases, embeddings, args.top_k, thresholds)
+        print_report(spec, reports[spec], args.top_k)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(reports, ensure_ascii=False, indent=2), encoding="utf-8")
+        logger.info(f"💾 결과 저장: {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+DynamoDB → Q&A 인덱스 스냅샷 내보내기
+
+용도:
+1. qa-documents 테이블에서 컬렉션 하나를 GSI Query로 읽기 (페이지 단위)
+2. 현재 임베딩 모델(EMBEDDING_MODEL_ID / EMBEDDING_DIMENSIONS)로 만든 아이템만 선택
+3. <out>/<컬렉션>/<버전>/에 스냅샷 저장 (정규화 행렬 + ID/오프셋 테이블 + 답변 blob + checksum)
+4. (선택) S3 업로드 → Lambda가 콜드 스타트에 /tmp로 내려받아 memory-map
+
+--shards N이면 부모 ID 해시로 아이템을 나눠 <out>/<컬렉션>/shard-<i>/<버전>에 샤드별 스냅샷을 저장합니다
+(샤드 워커: backend/lambda/shard_worker.py, 코디네이터: SEARCH_BACKEND=sharded).
+
+GENERATION_TABLE이 설정되어 있으면 컬렉션 이름을 라이브 세대 source("perso.ai@<세대>")로 바꿔 내보냅니다
+(index.py가 그 이름으로 스냅샷을 찾음). 세대 적재 스크립트(insert_perso_qa.py, index_generations.py publish)는
+게시 전에 export_generation()으로 새 세대 스냅샷을 먼저 올립니다.
+
+실행:
+python scripts/export_snapshot.py --collection perso.ai --out backend/lambda/snapshot
+python scripts/export_snapshot.py --collection perso.ai --out /tmp/qa-snapshot --dtype float16 --s3-bucket my-bucket
+python scripts/export_snapshot.py --collection perso.ai --shards 4 --s3-bucket my-bucket
+"""
+
+import os
+import sys
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import boto3
+from dotenv import load_dotenv
+
+# Lambda 공용 모듈 (embeddings.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from embeddings import get_provider
+from generations import SOURCE_SEPARATOR, generation_source
+from qa_store import bump_collection_version, query_collection
+from shards import SHARD_COUNT, shard_dir, shard_of
+from snapshot import SnapshotWriter, upload_snapshot, write_snapshot
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+AWS_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
+SNAPSHOT_S3_PREFIX = os.environ.get("SNAPSHOT_S3_PREFIX", "snapshots/qa/")
+SNAPSHOT_S3_BUCKET = os.environ.get("SNAPSHOT_S3_BUCKET", "")
+SEARCH_BACKEND = os.environ.get("SEARCH_BACKEND", "dynamodb")  # Lambda와 같은 값
+GENERATION_TABLE = os.environ.get("GENERATION_TABLE", "")  # Lambda와 같은 값 (없으면 세대 없이 컬렉션 이름 그대로)
+SNAPSHOT_BACKENDS = ("snapshot", "sharded")
+
+
+def export_collection(
+    table: Any,
+    collection: str,
+    provider: Any,
+    out_root: str,
+    *,
+    dtype: str = "float32",
+    version: Optional[str] = None,
+    shards: int = 1,
+    s3_bucket: Optional[str] = None,
+) -> list[tuple[Path, str]]:
+    """컬렉션(source) 하나를 스냅샷으로 저장 (s3_bucket이면 업로드), [(스냅샷 디렉터리, S3 경로)] 반환"""
+    skipped = 0
+
+    def matching_items() -> Iterator[dict]:
+        nonlocal skipped
+        items = query_collection(
+            table,
+            collection,
+            projection="id, question, answer, embedding, embedding_model, embedding_dim, created_at, parent_id, parent_question, chunk, chunk_start, chunk_end",
+        )
+        for item in items:
+            if "embedding" in item and provider.matches(item):
+                yield item
+            else:
+                skipped += 1
+
+    out = str(Path(out_root) / collection)
+    logger.info(f"📤 {DYNAMODB_TABLE}[{collection}] → {out} (임베딩: {provider.key}, 샤드: {shards})")
+    extra = {"source_table": DYNAMODB_TABLE, "collection": collection}
+    if shards > 1:
+        # 모든 샤드를 한 번의 Query에서 같은 버전 이름으로 동시에 기록
+        writers: list[SnapshotWriter] = []
+        for shard in range(shards):
+            writers.append(SnapshotWriter(
+                str(Path(out) / shard_dir(shard)),
+                embedding_model=provider.model_id,
+                embedding_dim=provider.dimensions,
+                version=writers[0].version if writers else version,
+                dtype=dtype,
+                extra={**extra, "shard": shard, "shards": shards},
+            ))
+        for item in matching_items():
+            writers[shard_of(item.get("parent_id") or item["id"], shards)].add(item)
+        targets = [(writer.close(), f"{collection}/{shard_dir(shard)}") for shard, writer in enumerate(writers)]
+    else:
+        snapshot_dir = write_snapshot(
+            matching_items(),
+            out,
+            embedding_model=provider.model_id,
+            embedding_dim=provider.dimensions,
+            version=version,
+            dtype=dtype,
+            extra=extra,
+        )
+        targets = [(snapshot_dir, collection)]
+    if skipped:
+        logger.warning(f"⚠️  임베딩 없음/모델 불일치로 {skipped}개 아이템 제외")
+
+    if s3_bucket:
+        for snapshot_dir, collection_path in targets:
+            upload_snapshot(snapshot_dir, s3_bucket, f"{SNAPSHOT_S3_PREFIX}{collection_path}/")
+    return targets
+
+
+def snapshot_bucket_for_generations() -> Optional[str]:
+    """
+    세대 게시 전에 스냅샷을 올릴 S3 버킷 (SEARCH_BACKEND가 스냅샷 계열이 아니면 None)
+
+    배포 패키지에 넣은 스냅샷(SNAPSHOT_PATH)은 포인터 전환을 따라갈 수 없으므로 버킷이 없으면 오류입니다.
+    """
+    if SEARCH_BACKEND not in SNAPSHOT_BACKENDS:
+        return None
+    if not SNAPSHOT_S3_BUCKET:
+        raise ValueError(f"❌ SEARCH_BACKEND={SEARCH_BACKEND}에서 세대를 게시하려면 SNAPSHOT_S3_BUCKET이 필요합니다")
+    return SNAPSHOT_S3_BUCKET
+
+
+def export_generation(table: Any, collection: str, generation: str, provider: Any) -> None:
+    """스냅샷 계열 백엔드면 세대 스냅샷("<컬렉션>@<세대>")을 내보내 S3에 업로드 (게시 전에 호출)"""
+    bucket = snapshot_bucket_for_generations()
+    if bucket is None:
+        return
+    shards = SHARD_COUNT if SEARCH_BACKEND == "sharded" else 1
+    with tempfile.TemporaryDirectory(prefix="qa-snapshot-") as out_root:
+        export_collection(table, generation_source(collection, generation), provider, out_root, shards=shards, s3_bucket=bucket)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DynamoDB Q&A 컬렉션을 스냅샷으로 내보내기")
+    parser.add_argument("--collection", default="perso.ai", help="내보낼 컬렉션 (source 값)")
+    parser.add_argument("--out", default="backend/lambda/snapshot", help="스냅샷 루트 디렉터리")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32", help="행렬 저장 타입")
+    parser.add_argument("--version", default=None, help="버전 이름 (기본: UTC 타임스탬프)")
+    parser.add_argument("--shards", type=int, default=1, help="샤드 수 (1이면 샤드 없이 저장)")
+    parser.add_argument("--s3-bucket", default=SNAPSHOT_S3_BUCKET or None, help="업로드할 S3 버킷")
+    args = parser.parse_args()
+
+    provider = get_provider()
+    table = boto3.resource("dynamodb", region_name=AWS_REGION).Table(DYNAMODB_TABLE)
+
+    collection = args.collection
+    if GENERATION_TABLE and SOURCE_SEPARATOR not in collection:
+        # index.py와 같은 포인터를 읽어 라이브 세대 이름으로 내보냄 (index_generations가 이 모듈을 import하므로 지연 import)
+        from index_generations import open_pointers
+
+        collection = open_pointers().live_source(collection)
+        if collection != args.collection:
+            logger.info(f"🔀 {args.collection} 라이브 세대: {collection}")
+
+    export_collection(
+        table,
+        collection,
+        provider,
+        args.out,
+        dtype=args.dtype,
+        version=args.version,
+        shards=args.shards,
+        s3_bucket=args.s3_bucket,
+    )
+    if args.shards > 1:
+        # sharded 백엔드의 ETag는 컬렉션 데이터 버전을 쓰므로 새 샤드를 내보낸 뒤 올림
+        bump_collection_version(table, collection.split(SOURCE_SEPARATOR)[0])
+
+
+if __name__ == "__main__":
+    main()
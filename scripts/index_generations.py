@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Q&A 인덱스 세대 관리 (backend/lambda/generations.py)
+
+적재 스크립트(insert_perso_qa.py)는 새 세대를 "<컬렉션>@<세대>" 네임스페이스에 쓰고 검증한 뒤
+포인터를 바꿔 게시합니다. 이 스크립트는 그 외 운영 작업을 담당합니다.
+
+명령:
+- status: 라이브 세대, 롤백 가능한 이전 세대, 빌드 목록과 세대별 아이템 수
+- publish <세대>: 이미 만든 세대를 라이브로 전환 (검증 후)
+- rollback: 직전 라이브 세대로 되돌리기 (포인터만 바뀌므로 즉시 적용, 웜 컨테이너는 GENERATION_POLL_SECONDS 안에 전환)
+- gc: 보관 범위(--keep)를 벗어난 세대 아이템을 컬렉션 Query + 배치 삭제로 한꺼번에 정리
+  (--legacy: 세대 도입 전 컬렉션 이름 그대로 저장된 아이템도 삭제, Lambda에 GENERATION_TABLE을 설정한 뒤에만 사용)
+
+SEARCH_BACKEND가 snapshot / sharded면 publish 전에 세대 스냅샷을 SNAPSHOT_S3_BUCKET에 먼저 올립니다
+(export_snapshot.export_generation, Lambda와 같은 SEARCH_BACKEND / SHARD_COUNT / SNAPSHOT_S3_BUCKET을 설정할 것).
+
+포인터 테이블 생성: python scripts/create_generation_table.py
+GENERATION_TABLE은 Lambda 배포(serverless.yml)와 같은 값을 설정하세요. 없으면 세대 명령을 쓸 수 없습니다.
+
+실행:
+python scripts/index_generations.py status
+python scripts/index_generations.py rollback --collection perso.ai
+python scripts/index_generations.py gc --keep 1 --legacy
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+from typing import Any, Optional
+
+import boto3
+from dotenv import load_dotenv
+
+# Lambda 공용 모듈 (generations.py, qa_store.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from botocore.exceptions import ClientError
+
+from embeddings import get_provider
+from export_snapshot import export_generation
+from generations import GENERATION_KEEP, DynamoPointerBackend, GenerationPointers, generation_source
+from qa_store import bump_collection_version, query_collection
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+AWS_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
+GENERATION_TABLE = os.environ.get("GENERATION_TABLE", "")  # serverless.yml 기본값과 같이 비어 있으면 세대 미사용
+COLLECTION = os.environ.get("DEFAULT_COLLECTION", "perso.ai")
+VERIFY_ATTEMPTS = 5  # GSI는 최종 일관성이므로 방금 쓴 아이템이 보일 때까지 재확인
+VERIFY_DELAY_SECONDS = 2.0
+
+
+def open_pointers(dynamodb: Any = None) -> GenerationPointers:
+    """DynamoDB 포인터 테이블 (GENERATION_TABLE 미설정이거나 테이블이 없으면 ValueError)"""
+    if not GENERATION_TABLE:
+        raise ValueError("❌ GENERATION_TABLE 미설정 (Lambda 배포와 같은 포인터 테이블 이름을 설정하세요)")
+    dynamodb = dynamodb or boto3.resource("dynamodb", region_name=AWS_REGION)
+    table = dynamodb.Table(GENERATION_TABLE)
+    try:
+        table.load()
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ResourceNotFoundException":
+            raise ValueError(
+                f"❌ 포인터 테이블 {GENERATION_TABLE} 없음: python scripts/create_generation_table.py 로 먼저 생성하세요"
+            ) from e
+        raise
+    return GenerationPointers(DynamoPointerBackend(table), poll_seconds=0)
+
+
+def verify_generation(table: Any, collection: str, generation: str, expected: Optional[int], provider: Any) -> int:
+    """
+    세대 아이템 검증 (아이템 수 + 모두 현재 임베딩 모델/차원) 후 아이템 수 반환
+
+    expected가 없으면 아이템이 하나 이상인지만 확인합니다.
+    """
+    source = generation_source(collection, generation)
+    for attempt in range(VERIFY_ATTEMPTS):
+        items = list(query_collection(table, source, projection="id, embedding_model, embedding_dim"))
+        mismatched = [item["id"] for item in items if not provider.matches(item)]
+        if mismatched:
+            raise ValueError(f"❌ {source}: 임베딩 모델/차원이 다른 아이템 {len(mismatched)}개 (예: {mismatched[0]})")
+        if items and (expected is None or len(items) >= expected):
+            if expected is not None and len(items) > expected:
+                raise ValueError(f"❌ {source}: 아이템 {len(items)}개 (예상 {expected}개)")
+            logger.info(f"🔎 {source} 검증 완료: {len(items)}개")
+            return len(items)
+        if attempt < VERIFY_ATTEMPTS - 1:
+            time.sleep(VERIFY_DELAY_SECONDS)
+    raise ValueError(f"❌ {source}: 아이템 {len(items)}개 (예상 {expected if expected is not None else '1개 이상'})")
+
+
+def collect_garbage(
+    table: Any,
+    pointers: GenerationPointers,
+    collection: str,
+    keep: int = GENERATION_KEEP,
+    legacy: bool = False,
+) -> int:
+    """보관 범위 밖 세대(와 legacy면 세대 도입 전 아이템)를 배치 삭제 후 포인터에서 제거, 삭제 아이템 수 반환"""
+    generations = pointers.garbage(collection, keep)
+    sources = [generation_source(collection, generation) for generation in generations]
+    if legacy and pointers.get(collection)["generation"]:
+        sources.append(collection)
+
+    deleted = 0
+    for source in sources:
+        count = 0
+        with table.batch_writer() as batch:
+            for item in query_collection(table, source, projection="id"):
+                batch.delete_item(Key={"id": item["id"]})
+                count += 1
+        logger.info(f"🗑️  {source}: {count}개 삭제")
+        deleted += count
+    if generations:
+        pointers.forget(collection, generations)
+    return deleted
+
+
+def status(table: Any, pointers: GenerationPointers, collection: str) -> None:
+    item = pointers.get(collection)
+    print(f"📌 {collection} 라이브 세대: {item['generation'] or '(없음, 컬렉션 이름 그대로 검색)'}")
+    print(f"   롤백 가능: {', '.join(reversed(item['history'])) or '-'}")
+    for generation in item["builds"]:
+        count = sum(1 for _ in query_collection(table, generation_source(collection, generation), projection="id"))
+        marker = "*" if generation == item["generation"] else " "
+        print(f" {marker} {generation}: {count}개")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Q&A 인덱스 세대 조회/게시/롤백/정리")
+    parser.add_argument("command", choices=["status", "publish", "rollback", "gc"])
+    parser.add_argument("generation", nargs="?", help="publish할 세대")
+    parser.add_argument("--collection", default=COLLECTION, help=f"컬렉션 (기본: {COLLECTION})")
+    parser.add_argument("--keep", type=int, default=GENERATION_KEEP,
+                        help=f"gc 시 보관할 이전 세대 수 (기본: {GENERATION_KEEP})")
+    parser.add_argument("--legacy", action="store_true", help="gc 시 세대 도입 전 아이템도 삭제")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    table = dynamodb.Table(DYNAMODB_TABLE)
+    pointers = open_pointers(dynamodb)
+
+    if args.command == "status":
+        status(table, pointers, args.collection)
+    elif args.command == "publish":
+        if not args.generation:
+            raise ValueError("❌ publish할 세대를 지정하세요")
+        provider = get_provider(bedrock_client=boto3.client("bedrock-runtime", region_name=AWS_REGION))
+        verify_generation(table, args.collection, args.generation, None, provider)
+        export_generation(table, args.collection, args.generation, provider)
+        pointers.publish(args.collection, args.generation)
+        bump_collection_version(table, args.collection)
+    elif args.command == "rollback":
+        pointers.rollback(args.collection)
+        bump_collection_version(table, args.collection)  # 되돌린 세대로 ETag도 바뀌도록
+    else:
+        deleted = collect_garbage(table, pointers, args.collection, args.keep, args.legacy)
+        print(f"🧹 이전 세대 아이템 {deleted}개 삭제")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"❌ 오류 발생: {str(e)}", exc_info=True)
+        sys.exit(1)
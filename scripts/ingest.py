@@ -3,34 +3,30 @@
 Q&A 데이터 임베딩 스크립트
 
 용도:
-1. Q&A.xlsx 파일 읽기
-2. 각 질문을 임베딩 벡터로 변환
-3. Supabase pgvector에 저장
+1. Q&A 파일 스트리밍 읽기 (xlsx / csv / jsonl)
+2. 고정 크기 청크 단위로 질문을 임베딩 벡터로 변환 (청크당 embeddings 요청 1회)
+3. Supabase pgvector에 JSON 배열로 일괄 upsert (청크당 POST 1회)
+
+여러 청크를 비동기 커넥션 풀로 동시에 처리하며, 429/5xx 응답은 재시도합니다.
+OPENAI_BASE_URL / SUPABASE_URL을 로컬 HTTP 서버로 지정하거나 EMBEDDING_MODEL_ID=local-hash를
+사용하면 오프라인 실행이 가능합니다. qa_embeddings에는 embedding_model, embedding_dim 열이 필요합니다.
+적재 후 DYNAMODB_TABLE의 "pgvector" 데이터 버전을 올려 검색 API(SEARCH_BACKEND=pgvector)의 ETag를 갱신합니다.
+테스트(httpx.MockTransport로 두 서비스를 대신함): python -m pytest tests/test_ingest.py
 
 실행:
 python scripts/ingest.py
+python scripts/ingest.py data/qa.jsonl --chunk-size 200
 """
 
 import os
 import sys
+import random
+import asyncio
+import argparse
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 import logging
 
-try:
-    import openpyxl
-except ImportError:
-    print("⚠️  openpyxl 필요. 설치 중...")
-    os.system("pip install openpyxl")
-    import openpyxl
-
-try:
-    from openai import OpenAI
-except ImportError:
-    print("⚠️  openai 필요. 설치 중...")
-    os.system("pip install openai")
-    from openai import OpenAI
-
 try:
     import httpx
 except ImportError:
@@ -40,6 +36,13 @@ except ImportError:
 
 from dotenv import load_dotenv
 
+# Lambda 공용 모듈 (embeddings.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from embeddings import OpenAIProvider, get_provider
+from qa_store import bump_collection_version
+from readers import DEFAULT_CHUNK_SIZE, ColumnMapping, chunked, read_rows
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -51,93 +54,159 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 # 설정
-EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL_ID", "text-embedding-3-small")
+MAX_CONCURRENCY = int(os.environ.get("INGEST_CONCURRENCY", "4"))  # 동시에 처리할 청크 수
+MAX_RETRIES = 5
+RETRY_STATUS = {429, 500, 502, 503, 504}
+DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")  # 데이터 버전 아이템 위치 (index.py와 동일)
+PGVECTOR_VERSION_KEY = "pgvector"  # index.py와 동일
 EXCEL_FILE = "data/Q&A.xlsx"  # 또는 사용자가 지정한 경로
 SHEET_NAME = 0  # 첫 번째 시트
 
 
 class QAIngestor:
-    def __init__(self):
-        """클라이언트 초기화"""
-        self.openai = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """클라이언트 초기화 (transport: 테스트용 HTTP 전송 계층, 기본: 실제 네트워크)"""
+        self.transport = transport
+        self.provider = get_provider(EMBEDDING_MODEL)  # EMBEDDING_DIMENSIONS로 축소 차원 지정
         self.supabase_url = os.environ.get("SUPABASE_URL")
         self.supabase_key = os.environ.get("SUPABASE_ANON_KEY")
 
-        if not all([self.openai.api_key, self.supabase_url, self.supabase_key]):
-            raise ValueError("❌ 환경 변수 누락: OPENAI_API_KEY, SUPABASE_URL, SUPABASE_ANON_KEY")
-
-    def read_excel(self, file_path: str) -> list[dict]:
-        """Excel 파일에서 Q&A 데이터 읽기"""
-        logger.info(f"📂 엑셀 파일 읽는 중: {file_path}")
-
-        if not Path(file_path).exists():
-            raise FileNotFoundError(f"❌ 파일을 찾을 수 없습니다: {file_path}")
-
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb[wb.sheetnames[SHEET_NAME]]
-
-        rows = []
-        for i, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            # 열 이름 자동 감지 (Q&A 또는 Question/Answer 등)
-            if row[0] is None or row[1] is None:
-                continue
-
-            rows.append({
-                "id": i - 1,
-                "question": str(row[0]).strip(),
-                "answer": str(row[1]).strip(),
-            })
-
-        logger.info(f"✅ {len(rows)}개의 Q&A 쌍 읽음")
-        return rows
-
-    def embed_text(self, text: str) -> list[float]:
-        """텍스트를 임베딩 벡터로 변환"""
-        response = self.openai.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=text
-        )
-        return response.data[0].embedding
-
-    def upsert_to_supabase(self, qa_data: list[dict]) -> None:
-        """Supabase에 데이터 저장"""
-        logger.info(f"💾 Supabase에 {len(qa_data)}개 데이터 저장 중...")
-
-        url = f"{self.supabase_url}/rest/v1/qa_embeddings"
-        headers = {
-            "Authorization": f"Bearer {self.supabase_key}",
-            "Content-Type": "application/json",
-            "Prefer": "resolution=merge-duplicates",  # upsert
-        }
-
-        with httpx.Client() as client:
-            for i, row in enumerate(qa_data):
-                # 임베딩 생성
-                embedding = self.embed_text(row["question"])
-
-                payload = {
-                    "id": row["id"],
-                    "question": row["question"],
-                    "answer": row["answer"],
-                    "embedding": embedding,
-                }
-
-                try:
-                    response = client.post(url, json=payload, headers=headers)
-                    response.raise_for_status()
-                    logger.info(f"✅ [{i+1}/{len(qa_data)}] '{row['question'][:50]}...' 저장됨")
-                except Exception as e:
-                    logger.error(f"❌ [{i+1}/{len(qa_data)}] 저장 실패: {str(e)}")
+        if not all([self.supabase_url, self.supabase_key]):
+            raise ValueError("❌ 환경 변수 누락: SUPABASE_URL, SUPABASE_ANON_KEY")
+        if isinstance(self.provider, OpenAIProvider) and not self.provider.api_key:
+            raise ValueError("❌ 환경 변수 누락: OPENAI_API_KEY")
+
+    def read_rows(self, file_path: str, mapping: Optional[ColumnMapping] = None) -> Iterator[dict]:
+        """원본 파일에서 Q&A 행을 하나씩 읽기"""
+        for row in read_rows(file_path, mapping, sheet=SHEET_NAME):
+            yield {
+                "id": row["row_number"],
+                "question": row["question"],
+                "answer": row["answer"],
+            }
+
+    async def _post(self, client: httpx.AsyncClient, url: str, payload: object, headers: dict) -> httpx.Response:
+        """POST + 429/5xx/네트워크 오류 재시도 (Retry-After 우선, 없으면 지수 백오프)"""
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = await client.post(url, json=payload, headers=headers)
+            except httpx.TransportError as e:
+                if attempt == MAX_RETRIES:
                     raise
+                delay = random.uniform(0, 2 ** attempt)
+                logger.warning(f"⏳ 연결 오류 ({str(e)}), {delay:.1f}초 후 재시도")
+            else:
+                if response.status_code not in RETRY_STATUS or attempt == MAX_RETRIES:
+                    response.raise_for_status()
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else random.uniform(0, 2 ** attempt)
+                logger.warning(f"⏳ {response.status_code} 응답, {delay:.1f}초 후 재시도 ({attempt + 1}/{MAX_RETRIES})")
+            await asyncio.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    async def embed_batch(self, client: httpx.AsyncClient, texts: list[str]) -> list[list[float]]:
+        """여러 텍스트를 임베딩 (OpenAI는 요청 한 번, 그 외 프로바이더는 스레드에서 실행)"""
+        if not isinstance(self.provider, OpenAIProvider):
+            return await asyncio.to_thread(self.provider.embed_batch, texts)
+
+        response = await self._post(
+            client,
+            self.provider.url,
+            self.provider.request_body(texts),
+            {"Authorization": f"Bearer {self.provider.api_key}"},
+        )
+        return self.provider.parse_response(response.json())
+
+    async def upsert_batch(self, client: httpx.AsyncClient, rows: list[dict]) -> None:
+        """qa_embeddings에 JSON 배열로 일괄 upsert"""
+        await self._post(
+            client,
+            f"{self.supabase_url}/rest/v1/qa_embeddings",
+            rows,
+            {
+                "apikey": self.supabase_key,
+                "Authorization": f"Bearer {self.supabase_key}",
+                "Prefer": "resolution=merge-duplicates,return=minimal",  # upsert
+            },
+        )
 
-        logger.info("✅ 모든 데이터 저장 완료!")
+    async def _process_chunk(self, client: httpx.AsyncClient, chunk: list[dict]) -> int:
+        embeddings = await self.embed_batch(client, [row["question"] for row in chunk])
+        await self.upsert_batch(client, [
+            {
+                "id": row["id"],
+                "question": row["question"],
+                "answer": row["answer"],
+                "embedding": embedding,
+                **self.provider.metadata(),
+            }
+            for row, embedding in zip(chunk, embeddings)
+        ])
+        return len(chunk)
+
+    async def upsert_to_supabase_async(self, qa_data: Iterable[dict], chunk_size: int) -> int:
+        """청크를 최대 MAX_CONCURRENCY개까지 동시에 임베딩/저장"""
+        if isinstance(self.provider, OpenAIProvider):
+            chunk_size = min(chunk_size, self.provider.max_batch_size)  # 요청당 최대 입력 수
+        limits = httpx.Limits(max_connections=MAX_CONCURRENCY * 2, max_keepalive_connections=MAX_CONCURRENCY * 2)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        saved = 0
+
+        async def worker(index: int, chunk: list[dict]) -> None:
+            nonlocal saved
+            try:
+                count = await self._process_chunk(client, chunk)
+                saved += count
+                logger.info(f"✅ 청크 {index} 저장됨 ({len(chunk)}개, 누적 {saved}개)")
+            finally:
+                semaphore.release()
+
+        async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(60.0), transport=self.transport) as client:
+            tasks = []
+            for index, chunk in enumerate(chunked(qa_data, chunk_size), start=1):
+                # 동시 처리 중인 청크 수를 제한하여 읽기가 앞서 나가지 않도록 함
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(worker(index, chunk)))
+                failed = [t for t in tasks if t.done() and t.exception()]
+                if failed:
+                    break
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            raise errors[0]
+        return saved
+
+    def upsert_to_supabase(self, qa_data: Iterable[dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """Supabase에 데이터 저장 (청크 단위 배치 임베딩 + 일괄 upsert)"""
+        logger.info(f"💾 Supabase에 데이터 저장 중... (청크 {chunk_size}개, 동시 {MAX_CONCURRENCY}개)")
+        saved = asyncio.run(self.upsert_to_supabase_async(qa_data, chunk_size))
+        logger.info(f"✅ 모든 데이터 저장 완료! ({saved}개)")
+
+    def bump_version(self) -> None:
+        """검색 API ETag 갱신용 데이터 버전 올리기 (DynamoDB에 접근할 수 없으면 경고만)"""
+        try:
+            import boto3
 
-    def run(self, file_path: Optional[str] = None) -> None:
+            table = boto3.resource("dynamodb", region_name=os.environ.get("BEDROCK_REGION", "ap-northeast-1")).Table(DYNAMODB_TABLE)
+            version = bump_collection_version(table, PGVECTOR_VERSION_KEY)
+            logger.info(f"🔖 pgvector 데이터 버전: {version}")
+        except Exception as e:
+            logger.warning(f"⚠️  데이터 버전 갱신 실패, 검색 API의 INDEX_VERSION을 직접 바꾸세요: {str(e)}")
+
+    def run(
+        self,
+        file_path: Optional[str] = None,
+        mapping: Optional[ColumnMapping] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
         """전체 처리 흐름"""
         try:
             path = file_path or EXCEL_FILE
-            qa_data = self.read_excel(path)
-            self.upsert_to_supabase(qa_data)
+            self.upsert_to_supabase(self.read_rows(path, mapping), chunk_size)
+            self.bump_version()
             logger.info("🎉 임베딩 완료!")
 
         except Exception as e:
@@ -145,9 +214,24 @@ class QAIngestor:
             sys.exit(1)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Q&A 파일을 Supabase pgvector에 적재")
+    parser.add_argument("file", nargs="?", default=EXCEL_FILE, help="xlsx / csv / jsonl 파일 경로")
+    parser.add_argument("--question-column", default=os.environ.get("INGEST_QUESTION_COLUMN"),
+                        help="질문 열 번호(0부터) 또는 헤더 이름 (기본: 0)")
+    parser.add_argument("--answer-column", default=os.environ.get("INGEST_ANSWER_COLUMN"),
+                        help="답변 열 번호(0부터) 또는 헤더 이름 (기본: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"한 번에 처리할 행 수 (기본: {DEFAULT_CHUNK_SIZE})")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    # 커맨드라인 인자로 파일 경로 받기
-    excel_file = sys.argv[1] if len(sys.argv) > 1 else EXCEL_FILE
+    args = parse_args()
+    mapping = ColumnMapping(
+        question=ColumnMapping.parse(args.question_column, 0),
+        answer=ColumnMapping.parse(args.answer_column, 1),
+    )
 
     ingestor = QAIngestor()
-    ingestor.run(excel_file)
+    ingestor.run(args.file, mapping, args.chunk_size)
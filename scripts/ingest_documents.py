@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+긴 문서(기사, 정책 문서 등)를 청크로 나눠 DynamoDB에 임베딩 적재
+
+용도:
+1. 문서 스트리밍 읽기 (.txt / .md 파일, 그 파일들이 든 디렉터리, 한 줄에 문서 하나인 .jsonl)
+2. 문장 경계를 지키며 목표 크기 청크로 분할, 인접 청크는 일부 겹침 (backend/lambda/chunker.py)
+3. 테이블의 기존 콘텐츠 해시와 비교하여 신규/변경 청크만 임베딩 (워커 풀 + 속도 제한)
+   해시에는 문서 내 위치도 포함하므로, 앞부분 수정으로 위치만 밀린 청크도 새 위치로 다시 저장됩니다
+   (검색 시 chunk_start / chunk_end로 인접 청크를 이어 붙이기 때문)
+4. DynamoDB에 배치 저장, 문서가 짧아지거나 사라져 없어진 청크는 삭제
+
+파일은 블록 단위로 읽고 청크는 하나씩 임베딩/저장 파이프라인으로 흘려보내므로
+문서 크기와 무관하게 메모리 사용량이 일정합니다.
+
+청크 아이템은 parent_id(문서 ID) / parent_question(문서 제목)과 문서 내 위치(chunk, chunk_start, chunk_end)를
+가지며, 검색 시 같은 문서에서 함께 걸린 인접 청크는 이어 붙여 하나의 결과로 반환됩니다.
+
+.jsonl 형식: {"id": "policy-2024-01", "title": "...", "text": "..."} (id 생략 시 제목으로 생성)
+
+실행:
+python scripts/ingest_documents.py data/docs/
+python scripts/ingest_documents.py data/articles.jsonl --source news-archive --chunk-chars 600 --overlap-chars 100
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import boto3
+from dotenv import load_dotenv
+
+# Lambda 공용 모듈 (chunker.py, embeddings.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from chunker import CHUNK_CHARS, CHUNK_OVERLAP_CHARS, chunk_text
+from embeddings import get_provider
+from ingest_engine import BulkIngestor, SyncPlan, content_hash, stable_id
+from qa_store import bump_collection_version
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+BEDROCK_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
+SOURCE = os.environ.get("INGEST_SOURCE", "documents")  # 컬렉션 (삭제 대상 범위도 이 값으로 한정)
+READ_BLOCK_CHARS = 64 * 1024
+TEXT_SUFFIXES = (".txt", ".md")
+
+
+def read_blocks(path: Path) -> Iterator[str]:
+    """텍스트 파일을 고정 크기 블록으로 읽기"""
+    with path.open(encoding="utf-8") as f:
+        while block := f.read(READ_BLOCK_CHARS):
+            yield block
+
+
+def read_documents(path: str) -> Iterator[dict]:
+    """
+    문서 스트리밍 읽기 → {id, title, blocks}
+
+    blocks는 본문 텍스트 블록 이터레이터이며, 다음 문서로 넘어가기 전에 모두 소비해야 합니다.
+    """
+    root = Path(path)
+    if not root.exists():
+        raise FileNotFoundError(f"❌ 파일을 찾을 수 없습니다: {path}")
+
+    if root.suffix.lower() in (".jsonl", ".ndjson"):
+        with root.open(encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                text = record.get("text") or record.get("content") or ""
+                title = str(record.get("title") or f"{root.stem} #{line_number}")
+                yield {"id": str(record.get("id") or stable_id(title, prefix="doc")), "title": title, "blocks": [text]}
+        return
+
+    files = sorted(p for p in root.rglob("*") if p.suffix.lower() in TEXT_SUFFIXES) if root.is_dir() else [root]
+    for file in files:
+        relative = file.relative_to(root).as_posix() if root.is_dir() else file.name
+        yield {"id": stable_id(relative, prefix="doc"), "title": file.stem, "blocks": read_blocks(file)}
+
+
+class DocumentIngestor:
+    def __init__(self, source: str = SOURCE):
+        """클라이언트 초기화"""
+        self.source = source
+        self.bedrock = boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+        self.table = boto3.resource("dynamodb", region_name=BEDROCK_REGION).Table(DYNAMODB_TABLE)
+        self.provider = get_provider(bedrock_client=self.bedrock)  # EMBEDDING_MODEL_ID / EMBEDDING_DIMENSIONS
+        self.documents = 0
+        self.chunks = 0
+        logger.info(f"✅ AWS 클라이언트 초기화 완료 (리전: {BEDROCK_REGION}, 임베딩: {self.provider.key})")
+
+    def chunk_rows(self, documents: Iterable[dict], chunk_chars: int, overlap_chars: int) -> Iterator[dict]:
+        """문서 → 청크 행 (청크 ID는 문서 ID + 청크 번호, 임베딩 입력은 제목 + 청크)"""
+        for document in documents:
+            self.documents += 1
+            for chunk in chunk_text(document["blocks"], chunk_chars, overlap_chars):
+                self.chunks += 1
+                yield {
+                    "id": f"{document['id']}-c{chunk.index:04d}",
+                    "question": document["title"],
+                    "answer": chunk.text,
+                    "parent_id": document["id"],
+                    "parent_question": document["title"],
+                    "chunk": chunk.index,
+                    "chunk_start": chunk.start,
+                    "chunk_end": chunk.end,
+                    "text": f"{document['title']}\n{chunk.text.strip()}",
+                    # 위치가 바뀐 청크도 변경으로 봐야 저장된 chunk_start / chunk_end가 원문과 어긋나지 않음
+                    "content_hash": content_hash(
+                        document["title"], f"{chunk.start}:{chunk.end}\n{chunk.text}", self.provider.key
+                    ),
+                }
+
+    def run(self, path: str, chunk_chars: int = CHUNK_CHARS, overlap_chars: int = CHUNK_OVERLAP_CHARS) -> None:
+        """전체 처리 흐름 (증분 동기화)"""
+        engine = BulkIngestor(self.table, self.provider.embed)
+        plan = SyncPlan(engine.fetch_hashes(self.source))
+        synced_at = datetime.now().isoformat()
+
+        logger.info(f"💾 {path} → {DYNAMODB_TABLE}[{self.source}] (청크 {chunk_chars}자, 겹침 {overlap_chars}자)")
+        rows = self.chunk_rows(read_documents(path), chunk_chars, overlap_chars)
+        stats = engine.run(
+            plan.filter(rows),
+            build_item=lambda row, embedding: {
+                **{k: v for k, v in row.items() if k != "text"},
+                "embedding": embedding,
+                **self.provider.metadata(),
+                "source": self.source,
+                "created_at": synced_at,
+            },
+            text_key="text",
+        )
+        if stats.failed:
+            raise RuntimeError(f"❌ {stats.failed}개 청크 저장 실패 (다시 실행하면 실패한 청크만 재처리)")
+
+        removed = plan.removed
+        if removed:
+            deleted = engine.delete_keys({"id": item_id} for item_id in removed)
+            logger.info(f"🗑️  원본에서 사라진 {deleted}개 청크 삭제")
+
+        if plan.new or plan.changed or removed:
+            # 검색 API의 ETag가 바뀌어 CDN이 이전 답변을 재사용하지 않음
+            version = bump_collection_version(self.table, self.source)
+            logger.info(f"🔖 {self.source} 데이터 버전: {version}")
+
+        print(f"📄 문서 {self.documents}개 → 청크 {self.chunks}개")
+        print(f"📋 동기화 결과: {plan.summary()}")
+        logger.info("🎉 문서 적재 완료!")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="긴 문서를 청크로 나눠 DynamoDB에 증분 적재")
+    parser.add_argument("path", help=".txt / .md 파일, 디렉터리 또는 .jsonl 파일")
+    parser.add_argument("--source", default=SOURCE, help=f"컬렉션 (source 값, 기본: {SOURCE})")
+    parser.add_argument("--chunk-chars", type=int, default=CHUNK_CHARS,
+                        help=f"청크 목표 크기, 문자 수 (기본: {CHUNK_CHARS})")
+    parser.add_argument("--overlap-chars", type=int, default=CHUNK_OVERLAP_CHARS,
+                        help=f"인접 청크 겹침 크기, 문자 수 (기본: {CHUNK_OVERLAP_CHARS})")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        DocumentIngestor(args.source).run(args.path, args.chunk_chars, args.overlap_chars)
+    except Exception as e:
+        logger.error(f"❌ 오류 발생: {str(e)}", exc_info=True)
+        sys.exit(1)
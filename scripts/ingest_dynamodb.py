@@ -3,28 +3,29 @@
 DynamoDB에 Q&A 데이터 임베딩 스크립트
 
 용도:
-1. Q&A.xlsx 파일 읽기
-2. 각 질문을 Bedrock Titan Embeddings로 변환
-3. DynamoDB에 저장
+1. Q&A 파일 스트리밍 읽기 (xlsx / csv / jsonl)
+2. (선택) 유사 중복 질문 병합 (MinHash LSH, 숫자/답변이 같은 행만 병합 — scripts/dedup.py)
+3. 테이블의 기존 콘텐츠 해시와 비교하여 신규/변경 행만 선별
+4. 선별된 질문을 임베딩 프로바이더로 변환 (워커 풀 + 속도 제한, 기본: Bedrock Titan)
+5. DynamoDB에 배치 저장, 원본에서 사라진 행은 삭제
+
+ID는 질문 텍스트에서 결정적으로 생성되므로 재실행해도 중복되지 않습니다.
+증분 적재 도입 전에 저장된 아이템(uuid ID, source 없음)이 있으면 먼저
+scripts/migrate_legacy_items.py를 한 번 실행해 고정 ID로 이전하세요 (그렇지 않으면 전체가 중복 저장됨).
 
 실행:
 python scripts/ingest_dynamodb.py data/Q&A.xlsx
+python scripts/ingest_dynamodb.py data/qa.csv --question-column 질문 --answer-column 답변
+python scripts/ingest_dynamodb.py data/Q&A.xlsx --dedup-threshold 0.8 --dedup-report dedup.jsonl   # 중복 병합 켜기
 """
 
 import os
 import sys
-import json
 import logging
-import uuid
+import argparse
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
-
-try:
-    import openpyxl
-except ImportError:
-    print("⚠️  openpyxl 필요. 설치 중...")
-    os.system("pip install openpyxl")
-    import openpyxl
+from typing import Iterable, Iterator, Optional
 
 try:
     import boto3
@@ -35,6 +36,15 @@ except ImportError:
 
 from dotenv import load_dotenv
 
+# Lambda 공용 모듈 (embeddings.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from dedup import DEDUP_THRESHOLD, NearDuplicateFilter
+from embeddings import get_provider
+from ingest_engine import BulkIngestor, SyncPlan, content_hash, stable_id
+from qa_store import bump_collection_version
+from readers import ColumnMapping, read_rows
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -47,10 +57,10 @@ load_dotenv()
 
 # 설정
 BEDROCK_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
-BEDROCK_MODEL_ID = os.environ.get("BEDROCK_MODEL_ID", "amazon.titan-embed-text-v1")
 DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
 EXCEL_FILE = "data/Q&A.xlsx"
 SHEET_NAME = 0  # 첫 번째 시트
+SOURCE = os.environ.get("INGEST_SOURCE", "excel")  # 삭제 대상 범위를 이 스크립트의 아이템으로 한정
 
 
 class QAIngestor:
@@ -59,81 +69,84 @@ class QAIngestor:
         self.bedrock = boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
         self.dynamodb = boto3.resource("dynamodb", region_name=BEDROCK_REGION)
         self.table = self.dynamodb.Table(DYNAMODB_TABLE)
-        logger.info(f"✅ AWS 클라이언트 초기화 완료 (리전: {BEDROCK_REGION})")
-
-    def read_excel(self, file_path: str) -> list[dict]:
-        """Excel 파일에서 Q&A 데이터 읽기"""
-        logger.info(f"📂 엑셀 파일 읽는 중: {file_path}")
-
-        if not Path(file_path).exists():
-            raise FileNotFoundError(f"❌ 파일을 찾을 수 없습니다: {file_path}")
-
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb[wb.sheetnames[SHEET_NAME]]
-
-        rows = []
-        for i, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-            if row[0] is None or row[1] is None:
-                continue
-
-            rows.append({
-                "id": str(uuid.uuid4()),  # 고유 ID 생성
-                "question": str(row[0]).strip(),
-                "answer": str(row[1]).strip(),
-            })
-
-        logger.info(f"✅ {len(rows)}개의 Q&A 쌍 읽음")
-        return rows
+        self.provider = get_provider(bedrock_client=self.bedrock)  # EMBEDDING_MODEL_ID / EMBEDDING_DIMENSIONS
+        logger.info(f"✅ AWS 클라이언트 초기화 완료 (리전: {BEDROCK_REGION}, 임베딩: {self.provider.key})")
+
+    def read_rows(self, file_path: str, mapping: Optional[ColumnMapping] = None) -> Iterator[dict]:
+        """원본 파일에서 Q&A 행을 하나씩 읽어 ID/콘텐츠 해시 부여"""
+        for row in read_rows(file_path, mapping, sheet=SHEET_NAME):
+            yield {
+                "id": stable_id(row["question"]),  # 질문 텍스트 기반 고정 ID
+                "question": row["question"],
+                "answer": row["answer"],
+                "content_hash": content_hash(row["question"], row["answer"], self.provider.key),
+            }
 
     def embed_text(self, text: str) -> list[float]:
-        """Bedrock Titan Embeddings으로 텍스트 임베딩"""
+        """임베딩 프로바이더로 텍스트 임베딩"""
         try:
-            response = self.bedrock.invoke_model(
-                modelId=BEDROCK_MODEL_ID,
-                contentType="application/json",
-                accept="application/json",
-                body=json.dumps({"inputText": text})
-            )
-            response_body = json.loads(response["body"].read())
-            embedding = response_body["embedding"]
+            embedding = self.provider.embed(text)
             logger.debug(f"  ✅ 임베딩 생성: {len(embedding)}차원")
             return embedding
         except Exception as e:
             logger.error(f"❌ 임베딩 생성 오류: {str(e)}")
             raise
 
-    def upsert_to_dynamodb(self, qa_data: list[dict]) -> None:
-        """DynamoDB에 데이터 저장"""
-        logger.info(f"💾 DynamoDB에 {len(qa_data)}개 데이터 저장 중...")
-
-        for i, row in enumerate(qa_data, start=1):
-            try:
-                # 임베딩 생성
-                embedding = self.embed_text(row["question"])
-
-                # DynamoDB에 저장
-                item = {
-                    "id": row["id"],
-                    "question": row["question"],
-                    "answer": row["answer"],
-                    "embedding": embedding,  # List of floats
-                }
-
-                self.table.put_item(Item=item)
-                logger.info(f"✅ [{i}/{len(qa_data)}] '{row['question'][:50]}...' 저장됨")
-
-            except Exception as e:
-                logger.error(f"❌ [{i}/{len(qa_data)}] 저장 실패: {str(e)}")
-                raise
-
+    def upsert_to_dynamodb(self, qa_data: Iterable[dict], dedup: Optional[NearDuplicateFilter] = None) -> None:
+        """DynamoDB와 증분 동기화 (신규/변경 행만 임베딩, 사라진 행 삭제)"""
+        engine = BulkIngestor(self.table, self.embed_text)
+        plan = SyncPlan(engine.fetch_hashes(SOURCE))
+        synced_at = datetime.now().isoformat()
+
+        # 병합된 중복 행은 SyncPlan에 보이지 않으므로 이전에 저장된 것도 삭제 대상이 됨
+        if dedup:
+            qa_data = dedup.filter(qa_data)
+
+        logger.info("💾 변경된 행을 DynamoDB에 저장 중...")
+        stats = engine.run(
+            plan.filter(qa_data),
+            build_item=lambda row, embedding: {
+                "id": row["id"],
+                "question": row["question"],
+                "answer": row["answer"],
+                "embedding": embedding,
+                **self.provider.metadata(),
+                "content_hash": row["content_hash"],
+                "source": SOURCE,
+                "created_at": synced_at,
+            },
+        )
+        if stats.failed:
+            raise RuntimeError(f"❌ {stats.failed}개 항목 저장 실패 (다시 실행하면 실패한 행만 재처리)")
+
+        removed = plan.removed
+        if removed:
+            deleted = engine.delete_keys({"id": item_id} for item_id in removed)
+            logger.info(f"🗑️  원본에서 사라진 {deleted}개 항목 삭제")
+
+        if plan.new or plan.changed or removed:
+            # 검색 API의 ETag가 바뀌어 CDN이 이전 답변을 재사용하지 않음
+            version = bump_collection_version(self.table, SOURCE)
+            logger.info(f"🔖 {SOURCE} 데이터 버전: {version}")
+
+        if dedup:
+            print(f"🧬 {dedup.summary()}")
+        print(f"📋 동기화 결과: {plan.summary()}")
         logger.info("✅ 모든 데이터 저장 완료!")
 
-    def run(self, file_path: Optional[str] = None) -> None:
+    def run(
+        self,
+        file_path: Optional[str] = None,
+        mapping: Optional[ColumnMapping] = None,
+        dedup: Optional[NearDuplicateFilter] = None,
+        dedup_report: Optional[str] = None,
+    ) -> None:
         """전체 처리 흐름"""
         try:
             path = file_path or EXCEL_FILE
-            qa_data = self.read_excel(path)
-            self.upsert_to_dynamodb(qa_data)
+            self.upsert_to_dynamodb(self.read_rows(path, mapping), dedup)
+            if dedup and dedup_report:
+                dedup.write_report(dedup_report)
             logger.info("🎉 임베딩 완료!")
 
         except Exception as e:
@@ -141,9 +154,27 @@ class QAIngestor:
             sys.exit(1)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Q&A 파일을 DynamoDB에 증분 적재")
+    parser.add_argument("file", nargs="?", default=EXCEL_FILE, help="xlsx / csv / jsonl 파일 경로")
+    parser.add_argument("--question-column", default=os.environ.get("INGEST_QUESTION_COLUMN"),
+                        help="질문 열 번호(0부터) 또는 헤더 이름 (기본: 0)")
+    parser.add_argument("--answer-column", default=os.environ.get("INGEST_ANSWER_COLUMN"),
+                        help="답변 열 번호(0부터) 또는 헤더 이름 (기본: 1)")
+    parser.add_argument("--dedup-threshold", type=float, default=DEDUP_THRESHOLD,
+                        help=f"유사 중복 병합 기준 Jaccard 유사도, 0이면 끔 (기본: {DEDUP_THRESHOLD}, 권장: 0.8)")
+    parser.add_argument("--dedup-report", help="병합/답변 불일치 클러스터를 저장할 JSONL 경로")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    # 커맨드라인 인자로 파일 경로 받기
-    excel_file = sys.argv[1] if len(sys.argv) > 1 else EXCEL_FILE
+    args = parse_args()
+    mapping = ColumnMapping(
+        question=ColumnMapping.parse(args.question_column, 0),
+        answer=ColumnMapping.parse(args.answer_column, 1),
+    )
+
+    dedup = NearDuplicateFilter(args.dedup_threshold) if args.dedup_threshold > 0 else None
 
     ingestor = QAIngestor()
-    ingestor.run(excel_file)
+    ingestor.run(args.file, mapping, dedup, args.dedup_report)
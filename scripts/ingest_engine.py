@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+DynamoDB 벌크 적재 엔진
+
+ingest_dynamodb.py, insert_perso_qa.py, insert_test_data.py가 공통으로 사용합니다.
+
+구성:
+1. TokenBucket: Bedrock 호출 속도 제한 (초당 요청 수)
+2. 워커 풀: 제한된 수의 스레드로 임베딩 병렬 생성
+3. ThrottlingException 발생 시 지수 백오프 + jitter 재시도
+4. DynamoDB batch_write_item (최대 25개) 단위 저장, 미처리 항목 재시도
+5. 증분 동기화: 안정적인 ID + 콘텐츠 해시로 신규/변경 행만 임베딩, 사라진 행 삭제
+
+환경 변수:
+- INGEST_WORKERS: 임베딩 워커 수 (기본: 4)
+- INGEST_RATE: 초당 Bedrock 호출 수 (기본: 5)
+"""
+
+import os
+import re
+import time
+import hashlib
+import random
+import logging
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from botocore.exceptions import ClientError
+
+# Lambda 공용 모듈 (qa_store.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from qa_store import query_collection
+
+logger = logging.getLogger(__name__)
+
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", "4"))
+INGEST_RATE = float(os.environ.get("INGEST_RATE", "5"))
+BATCH_WRITE_LIMIT = 25  # DynamoDB batch_write_item 최대 항목 수
+MAX_RETRIES = 6
+BASE_BACKOFF = 0.5
+MAX_BACKOFF = 20.0
+THROTTLING_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+}
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷 (rate: 초당 토큰, capacity: 최대 버스트)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """토큰을 얻을 때까지 대기"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait_time = (tokens - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    def drain(self) -> None:
+        """스로틀링 감지 시 남은 버스트를 비워 다른 워커도 속도를 늦추게 함"""
+        with self.lock:
+            self.tokens = min(self.tokens, 0.0)
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """AWS 스로틀링 오류 여부"""
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in THROTTLING_CODES
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """지수 백오프 (full jitter)"""
+    return random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * (2 ** attempt)))
+
+
+def to_dynamodb(value: Any) -> Any:
+    """float → Decimal 변환 (DynamoDB resource는 float을 허용하지 않음)"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, list):
+        return [to_dynamodb(v) for v in value]
+    if isinstance(value, dict):
+        return {k: to_dynamodb(v) for k, v in value.items()}
+    return value
+
+
+def normalize_question(text: str) -> str:
+    """ID 생성용 질문 정규화 (공백/대소문자 통일)"""
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def stable_id(question: str, prefix: str = "qa") -> str:
+    """질문 텍스트에서 결정적 ID 생성 (재실행해도 동일)"""
+    digest = hashlib.sha1(normalize_question(question).encode("utf-8")).hexdigest()
+    return f"{prefix}-{digest[:16]}"
+
+
+def content_hash(question: str, answer: str, embedding_model: str) -> str:
+    """질문·답변·임베딩 모델이 같으면 같은 해시 → 재임베딩 불필요"""
+    payload = "\x1f".join([question, answer, embedding_model])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SyncPlan:
+    """
+    원본 데이터와 테이블 내용의 차이 (스트리밍 방식)
+
+    `filter()`로 행을 흘려보내면 신규/변경 행만 통과시키고,
+    모든 행을 소비한 뒤 `removed`로 원본에서 사라진 ID를 얻습니다.
+    각 행에는 "id"와 "content_hash"가 있어야 합니다.
+    """
+
+    def __init__(self, existing: dict[str, str]):
+        self.existing = existing
+        self.seen: set[str] = set()
+        self.new = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.duplicates = 0
+
+    def filter(self, rows: Iterable[dict]) -> Iterator[dict]:
+        for row in rows:
+            if row["id"] in self.seen:
+                self.duplicates += 1
+                logger.warning(f"⚠️  중복 질문 스킵: '{row['question'][:50]}'")
+                continue
+            self.seen.add(row["id"])
+            stored = self.existing.get(row["id"])
+            if stored is None:
+                self.new += 1
+                yield row
+            elif stored != row["content_hash"]:
+                self.changed += 1
+                yield row
+            else:
+                self.unchanged += 1
+
+    @property
+    def removed(self) -> list[str]:
+        return sorted(set(self.existing) - self.seen)
+
+    def summary(self) -> str:
+        return (
+            f"신규 {self.new}개, 변경 {self.changed}개, 유지 {self.unchanged}개, "
+            f"삭제 {len(self.removed)}개, 중복 {self.duplicates}개"
+        )
+
+
+@dataclass
+class IngestStats:
+    written: int = 0
+    failed: int = 0
+
+
+class BulkIngestor:
+    """
+    임베딩 병렬 생성 + DynamoDB 배치 쓰기 엔진
+
+    Args:
+        table: boto3 DynamoDB Table 리소스
+        embed_fn: 텍스트 → 임베딩 함수 (오류 시 예외 발생)
+        workers: 임베딩 워커 수
+        rate: 초당 임베딩 호출 수
+    """
+
+    def __init__(
+        self,
+        table: Any,
+        embed_fn: Callable[[str], list[float]],
+        *,
+        workers: int = INGEST_WORKERS,
+        rate: float = INGEST_RATE,
+    ):
+        self.table = table
+        self.client = table.meta.client
+        self.embed_fn = embed_fn
+        self.workers = workers
+        self.limiter = TokenBucket(rate)
+
+    def embed(self, text: str) -> list[float]:
+        """속도 제한 + 스로틀링 재시도가 적용된 임베딩"""
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                return self.embed_fn(text)
+            except Exception as e:
+                if not is_throttling_error(e) or attempt == MAX_RETRIES:
+                    raise
+                self.limiter.drain()
+                delay = backoff_delay(attempt)
+                logger.warning(f"⏳ Bedrock 스로틀링, {delay:.1f}초 후 재시도 ({attempt + 1}/{MAX_RETRIES})")
+                time.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    def write_batch(self, items: list[dict]) -> None:
+        """batch_write_item으로 저장, UnprocessedItems는 백오프 후 재시도"""
+        requests = [{"PutRequest": {"Item": to_dynamodb(item)}} for item in items]
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = self.client.batch_write_item(RequestItems={self.table.name: requests})
+            except Exception as e:
+                if not is_throttling_error(e) or attempt == MAX_RETRIES:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+            requests = response.get("UnprocessedItems", {}).get(self.table.name, [])
+            if not requests:
+                return
+            time.sleep(backoff_delay(attempt))
+        raise RuntimeError(f"❌ {len(requests)}개 항목 저장 실패 (UnprocessedItems)")
+
+    def fetch_hashes(self, source: str) -> dict[str, str]:
+        """source(컬렉션)가 같은 기존 아이템의 {id: content_hash} 조회 (GSI Query, 임베딩은 읽지 않음)"""
+        return {
+            item["id"]: item.get("content_hash", "")
+            for item in query_collection(self.table, source, projection="id, content_hash")
+        }
+
+    def delete_keys(self, keys: Iterable[dict]) -> int:
+        """키 목록을 batch_write_item DeleteRequest로 일괄 삭제"""
+        deleted = 0
+        with self.table.batch_writer() as batch:
+            for key in keys:
+                batch.delete_item(Key=key)
+                deleted += 1
+        return deleted
+
+    def run(
+        self,
+        rows: Iterable[dict],
+        build_item: Optional[Callable[[dict, list[float]], dict]] = None,
+        text_key: str = "question",
+    ) -> IngestStats:
+        """
+        행을 임베딩하여 저장
+
+        Args:
+            rows: 적재할 행 (이터레이터 가능)
+            build_item: (행, 임베딩) → DynamoDB 아이템 (기본: 행 + embedding)
+            text_key: 임베딩할 텍스트 필드
+        """
+        build_item = build_item or (lambda row, embedding: {**row, "embedding": embedding})
+        stats = IngestStats()
+        pending: list[dict] = []
+        in_flight: dict[Future, dict] = {}
+
+        def flush() -> None:
+            if not pending:
+                return
+            self.write_batch(pending)
+            stats.written += len(pending)
+            logger.info(f"✅ {stats.written}개 저장됨 (배치 {len(pending)}개)")
+            pending.clear()
+
+        def collect(done: set[Future]) -> None:
+            for future in done:
+                row = in_flight.pop(future)
+                try:
+                    item = build_item(row, future.result())
+                except Exception as e:
+                    stats.failed += 1
+                    logger.error(f"❌ 임베딩 실패, 스킵: '{str(row.get(text_key, ''))[:50]}' ({str(e)})")
+                    continue
+                pending.append(item)
+                if len(pending) >= BATCH_WRITE_LIMIT:
+                    flush()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for row in rows:
+                # 제출 대기열을 제한하여 대용량 입력에서도 메모리 사용량 유지
+                while len(in_flight) >= self.workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                in_flight[executor.submit(self.embed, row[text_key])] = row
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            flush()
+
+        logger.info(f"📈 저장 {stats.written}개, 실패 {stats.failed}개")
+        return stats
@@ -1,17 +1,50 @@
 #!/usr/bin/env python3
 """
-Perso.ai Q&A 데이터를 DynamoDB에 삽입
+Perso.ai Q&A 데이터를 DynamoDB에 삽입 (GENERATION_TABLE 설정 시 blue/green 세대 게시)
+
+GENERATION_TABLE이 없으면 (serverless.yml 기본값) 기존처럼 perso.ai 컬렉션에 바로 덮어씁니다.
+
+GENERATION_TABLE이 있으면 라이브 아이템을 지우거나 덮어쓰지 않고 새 세대("perso.ai@<세대>" 네임스페이스)에
+전부 쓴 뒤, 아이템 수와 임베딩 모델을 검증하고 컬렉션 포인터를 원자적으로 바꿔 게시합니다 (backend/lambda/generations.py).
+SEARCH_BACKEND가 snapshot / sharded면 게시 전에 세대 스냅샷을 SNAPSHOT_S3_BUCKET에 먼저 올립니다.
+적재 중에도 index.py는 이전 세대로 온전히 응답하며, 게시 후 보관 범위를 벗어난 세대는 배치 삭제합니다.
+문제가 있으면 python scripts/index_generations.py rollback 으로 즉시 되돌릴 수 있습니다.
+Lambda와 같은 GENERATION_TABLE / SEARCH_BACKEND / SHARD_COUNT / SNAPSHOT_S3_BUCKET으로 실행하세요.
+
+실행:
+python scripts/insert_perso_qa.py
+python scripts/insert_perso_qa.py --paraphrases 5                         # Claude 패러프레이즈 추가
+PARAPHRASE_PROVIDER=stub python scripts/insert_perso_qa.py --paraphrases 3  # 로컬 규칙 기반
+GENERATION_TABLE=qa-generations python scripts/insert_perso_qa.py --no-publish  # 세대만 만들고 게시는 index_generations.py publish로
 """
+import sys
 import boto3
-import json
-from decimal import Decimal
+import logging
+import argparse
+from pathlib import Path
+
+# Lambda 공용 모듈 (embeddings.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from embeddings import get_provider
+from qa_store import bump_collection_version, query_collection
+from export_snapshot import export_generation, snapshot_bucket_for_generations
+from generations import GENERATION_KEEP, generation_source, namespaced, new_generation
+from index_generations import GENERATION_TABLE, collect_garbage, open_pointers, verify_generation
+from ingest_engine import BulkIngestor
+from paraphrase import expand_paraphrases, get_paraphraser
+
+# 적재 진행 로그 출력 (ingest_engine)
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # AWS 설정
 dynamodb = boto3.resource('dynamodb', region_name='ap-northeast-1')
 bedrock = boto3.client('bedrock-runtime', region_name='ap-northeast-1')
+# 임베딩 프로바이더 (EMBEDDING_MODEL_ID / EMBEDDING_DIMENSIONS, 기본: Titan v1)
+embedding_provider = get_provider(bedrock_client=bedrock)
 
 TABLE_NAME = 'qa-documents'
-BEDROCK_MODEL_ID = 'amazon.titan-embed-text-v1'
+COLLECTION = 'perso.ai'
 
 # Perso.ai Q&A 데이터
 QA_DATA = [
@@ -70,64 +103,100 @@ QA_DATA = [
 ]
 
 def get_embedding(text):
-    """Bedrock Titan으로 임베딩 생성"""
-    try:
-        response = bedrock.invoke_model(
-            modelId=BEDROCK_MODEL_ID,
-            body=json.dumps({'inputText': text})
-        )
-        result = json.loads(response['body'].read())
-        # Decimal로 변환 (DynamoDB 호환)
-        embedding = [Decimal(str(x)) for x in result['embedding']]
-        return embedding
-    except Exception as e:
-        print(f"❌ 임베딩 생성 오류: {e}")
-        return None
-
-def insert_qa_data():
-    """Perso.ai Q&A 데이터를 DynamoDB에 삽입"""
+    """임베딩 생성 (오류는 BulkIngestor가 재시도/스킵 처리)"""
+    return embedding_provider.embed(text)
+
+def build_rows(paraphrases=0):
+    """삽입할 행 (paraphrases > 0이면 질문마다 패러프레이즈 추가)"""
+    rows = [
+        {'id': f'perso-{idx}', 'question': qa['question'], 'answer': qa['answer']}
+        for idx, qa in enumerate(QA_DATA, 1)
+    ]
+    if paraphrases:
+        print(f"🔁 질문마다 패러프레이즈 {paraphrases}개 생성 중...")
+        rows = expand_paraphrases(rows, get_paraphraser(bedrock), paraphrases)
+    return rows
+
+def write_rows(engine, rows, source):
+    """행을 임베딩해 source 컬렉션으로 저장 (BulkIngestor 통계 반환)"""
+    return engine.run(
+        rows,
+        build_item=lambda row, embedding: {
+            **row,
+            'embedding': embedding,
+            **embedding_provider.metadata(),
+            'created_at': '2025-11-14T00:00:00',
+            'source': source
+        }
+    )
+
+def delete_test_data(table, engine):
+    """기존 테스트 데이터 삭제"""
+    print("🗑️  기존 테스트 데이터 삭제 중...")
+    test_keys = [{'id': item['id']} for item in query_collection(table, 'test', projection='id')]
+    deleted = engine.delete_keys(test_keys)
+    print(f"   삭제: {deleted}개")
+
+def insert_qa_data(paraphrases=0, publish=True, keep=GENERATION_KEEP):
+    """Perso.ai Q&A 데이터 삽입 (GENERATION_TABLE이 있으면 새 세대로 삽입 후 게시, 없으면 컬렉션에 바로 덮어쓰기)"""
+    if not GENERATION_TABLE:
+        insert_in_place(paraphrases)
+        return
+    
     table = dynamodb.Table(TABLE_NAME)
+    engine = BulkIngestor(table, get_embedding)
+    pointers = open_pointers(dynamodb)
+    snapshot_bucket_for_generations()  # 스냅샷 백엔드인데 버킷이 없으면 적재 전에 중단
     
-    # 기존 테스트 데이터 삭제
-    print("🗑️  기존 테스트 데이터 삭제 중...")
-    response = table.scan()
-    for item in response.get('Items', []):
-        if item['id'].startswith('test-'):
-            table.delete_item(Key={'id': item['id']})
-            print(f"   삭제: {item['id']}")
+    delete_test_data(table, engine)
     
-    print(f"\n📊 Perso.ai Q&A 데이터 {len(QA_DATA)}개를 DynamoDB에 삽입 중...\n")
+    # 빌드 시작 시점의 라이브 세대 (게시할 때 그대로가 아니면 동시에 실행된 적재가 있으므로 중단)
+    live = pointers.get(COLLECTION)['generation']
+    generation = new_generation()
+    pointers.register(COLLECTION, generation)
+    source = generation_source(COLLECTION, generation)
+    print(f"\n📊 Perso.ai Q&A 데이터 {len(QA_DATA)}개를 새 세대 {source}에 삽입 중... (라이브: {live or COLLECTION})\n")
+    
+    rows = [namespaced(row, generation) for row in build_rows(paraphrases)]
+    stats = write_rows(engine, rows, source)
+    if stats.failed:
+        raise RuntimeError(f"❌ {stats.failed}개 아이템 저장 실패, 게시하지 않음 (세대 {generation}는 다음 게시 후 gc에서 정리)")
+    
+    verify_generation(table, COLLECTION, generation, len(rows), embedding_provider)
+    print(f"✅ 새 세대 {generation} 삽입 완료: {stats.written}개 (패러프레이즈 포함)")
+    if not publish:
+        print(f"ℹ️  게시하려면: python scripts/index_generations.py publish {generation}")
+        return
+    
+    # 스냅샷 백엔드는 포인터가 가리킬 세대 스냅샷이 S3에 있어야 하므로 게시 전에 업로드
+    export_generation(table, COLLECTION, generation, embedding_provider)
+    pointers.publish(COLLECTION, generation, expected=live)
+    bump_collection_version(table, COLLECTION)  # 검색 API ETag 갱신
+    print(f"🚀 {COLLECTION} 라이브 세대 전환: {live or COLLECTION} → {generation}")
     
-    for idx, qa in enumerate(QA_DATA, 1):
-        question = qa['question']
-        answer = qa['answer']
-        
-        print(f"[{idx}/{len(QA_DATA)}] {question}")
-        
-        # 질문의 임베딩 생성
-        embedding = get_embedding(question)
-        if not embedding:
-            print(f"   ⚠️  임베딩 생성 실패, 스킵")
-            continue
-        
-        # DynamoDB에 저장
-        try:
-            table.put_item(
-                Item={
-                    'id': f'perso-{idx}',
-                    'question': question,
-                    'answer': answer,
-                    'embedding': embedding,
-                    'created_at': '2025-11-14T00:00:00',
-                    'source': 'perso.ai'
-                }
-            )
-            print(f"   ✅ 저장 완료\n")
-        except Exception as e:
-            print(f"   ❌ 저장 오류: {e}\n")
+    removed = collect_garbage(table, pointers, COLLECTION, keep)
+    print(f"🧹 보관 범위 밖 이전 세대 아이템 {removed}개 삭제 (롤백용 이전 세대 {keep}개 보관)")
+
+def insert_in_place(paraphrases=0):
+    """세대 없이 perso.ai 컬렉션에 바로 삽입 (같은 ID는 덮어씀)"""
+    table = dynamodb.Table(TABLE_NAME)
+    engine = BulkIngestor(table, get_embedding)
+    
+    delete_test_data(table, engine)
+    
+    print(f"\n📊 Perso.ai Q&A 데이터 {len(QA_DATA)}개를 DynamoDB에 삽입 중...\n")
+    stats = write_rows(engine, build_rows(paraphrases), COLLECTION)
+    if stats.written:
+        bump_collection_version(table, COLLECTION)  # 검색 API ETag 갱신
     
     print("✅ Perso.ai Q&A 데이터 삽입 완료!")
-    print(f"📈 총 {len(QA_DATA)}개의 Q&A가 DynamoDB에 저장되었습니다.")
+    print(f"📈 총 {stats.written}개의 Q&A 아이템(패러프레이즈 포함)이 DynamoDB에 저장되었습니다. (실패 {stats.failed}개)")
 
 if __name__ == '__main__':
-    insert_qa_data()
+    parser = argparse.ArgumentParser(description="Perso.ai Q&A 데이터 삽입")
+    parser.add_argument("--paraphrases", type=int, default=0, help="질문마다 추가할 패러프레이즈 수 (기본: 0)")
+    parser.add_argument("--no-publish", action="store_true", help="새 세대만 만들고 라이브로 전환하지 않음 (GENERATION_TABLE 설정 시)")
+    parser.add_argument("--keep", type=int, default=GENERATION_KEEP,
+                        help=f"게시 후 보관할 이전 세대 수 (기본: {GENERATION_KEEP})")
+    args = parser.parse_args()
+    insert_qa_data(args.paraphrases, not args.no_publish, args.keep)
@@ -2,17 +2,29 @@
 """
 DynamoDB에 테스트 Q&A 데이터 삽입
 """
+import sys
 import boto3
-import json
+import logging
+from pathlib import Path
 from datetime import datetime
-import numpy as np
+
+# Lambda 공용 모듈 (embeddings.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from embeddings import get_provider
+from ingest_engine import BulkIngestor
+from qa_store import bump_collection_version
+
+# 적재 진행 로그 출력 (ingest_engine)
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 # AWS 설정
 dynamodb = boto3.resource('dynamodb', region_name='ap-northeast-1')
 bedrock = boto3.client('bedrock-runtime', region_name='ap-northeast-1')
+# 임베딩 프로바이더 (EMBEDDING_MODEL_ID / EMBEDDING_DIMENSIONS, 기본: Titan v1)
+embedding_provider = get_provider(bedrock_client=bedrock, normalize=True)  # Titan v1은 클라이언트에서 정규화
 
 TABLE_NAME = 'qa-documents'
-BEDROCK_MODEL_ID = 'amazon.titan-embed-text-v1'
 
 # 테스트 Q&A 데이터
 TEST_DATA = [
@@ -39,21 +51,8 @@ TEST_DATA = [
 ]
 
 def get_embedding(text):
-    """Bedrock Titan으로 임베딩 생성"""
-    try:
-        response = bedrock.invoke_model(
-            modelId=BEDROCK_MODEL_ID,
-            body=json.dumps({'inputText': text})
-        )
-        result = json.loads(response['body'].read())
-        embedding = result['embedding']
-        # 임베딩을 정규화
-        embedding_array = np.array(embedding)
-        normalized = embedding_array / np.linalg.norm(embedding_array)
-        return normalized.tolist()
-    except Exception as e:
-        print(f"❌ 임베딩 생성 오류: {e}")
-        return None
+    """임베딩 생성 (오류는 BulkIngestor가 재시도/스킵 처리)"""
+    return embedding_provider.embed(text)
 
 def insert_test_data():
     """테스트 데이터를 DynamoDB에 삽입"""
@@ -61,35 +60,23 @@ def insert_test_data():
     
     print(f"📊 테스트 데이터 {len(TEST_DATA)}개를 DynamoDB에 삽입 중...")
     
-    for idx, qa in enumerate(TEST_DATA, 1):
-        question = qa['question']
-        answer = qa['answer']
-        
-        print(f"\n[{idx}/{len(TEST_DATA)}] Q: {question}")
-        
-        # 질문의 임베딩 생성
-        embedding = get_embedding(question)
-        if not embedding:
-            print(f"⚠️  임베딩 생성 실패, 스킵")
-            continue
-        
-        # DynamoDB에 저장
-        try:
-            table.put_item(
-                Item={
-                    'id': f'test-{idx}',
-                    'question': question,
-                    'answer': answer,
-                    'embedding': embedding,
-                    'created_at': datetime.now().isoformat(),
-                    'source': 'test'
-                }
-            )
-            print(f"✅ 저장 완료")
-        except Exception as e:
-            print(f"❌ 저장 오류: {e}")
+    rows = [
+        {'id': f'test-{idx}', 'question': qa['question'], 'answer': qa['answer']}
+        for idx, qa in enumerate(TEST_DATA, 1)
+    ]
+    stats = BulkIngestor(table, get_embedding).run(
+        rows,
+        build_item=lambda row, embedding: {
+            **row,
+            'embedding': embedding,
+            **embedding_provider.metadata(),
+            'created_at': datetime.now().isoformat(),
+            'source': 'test'
+        }
+    )
     
-    print("\n✅ 테스트 데이터 삽입 완료!")
+    bump_collection_version(table, 'test')  # 검색 API ETag 갱신
+    print(f"\n✅ 테스트 데이터 삽입 완료! (저장 {stats.written}개, 실패 {stats.failed}개)")
 
 if __name__ == '__main__':
     insert_test_data()
@@ -0,0 +1,41 @@
+-- Supabase pgvector 검색 RPC (backend/lambda/pgvector_store.py, SEARCH_BACKEND=pgvector)
+--
+-- 쿼리 벡터와 가까운 qa_embeddings 행을 Postgres 안에서 찾아 상위 match_count개만 반환합니다.
+-- 임계값 필터는 근사 최근접 검색 뒤에 적용해야 인덱스를 사용합니다.
+--
+-- 실행: Supabase SQL Editor 또는 psql "$DATABASE_URL" -f scripts/match_qa_embeddings.sql
+-- embedding 열의 차원은 적재 시 EMBEDDING_DIMENSIONS와 같아야 합니다 (예: vector(1536)).
+
+create extension if not exists vector;
+
+-- HNSW 인덱스 (코사인 거리). 메모리가 부족하면 ivfflat으로 대체:
+--   create index qa_embeddings_embedding_ivfflat on qa_embeddings
+--     using ivfflat (embedding vector_cosine_ops) with (lists = 100);
+create index if not exists qa_embeddings_embedding_hnsw
+  on qa_embeddings using hnsw (embedding vector_cosine_ops);
+
+create or replace function match_qa_embeddings(
+  query_embedding vector,
+  match_count int default 3,
+  match_threshold float default 0.7,
+  filter_model text default null,
+  filter_dim int default null
+)
+returns table (id bigint, question text, answer text, similarity float)
+language sql stable
+as $$
+  select nearest.id, nearest.question, nearest.answer, nearest.similarity
+  from (
+    select q.id, q.question, q.answer, 1 - (q.embedding <=> query_embedding) as similarity
+    from qa_embeddings q
+    -- 다른 모델/차원으로 임베딩된 행은 비교 불가
+    where (filter_model is null or q.embedding_model = filter_model)
+      and (filter_dim is null or q.embedding_dim = filter_dim)
+    order by q.embedding <=> query_embedding
+    limit match_count
+  ) nearest
+  where nearest.similarity >= match_threshold
+  order by nearest.similarity desc;
+$$;
+
+grant execute on function match_qa_embeddings(vector, int, float, text, int) to anon, authenticated;
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+source 없는 기존 아이템을 증분 적재 형식으로 이전 (1회성)
+
+증분 적재 도입 전 ingest_dynamodb.py는 uuid4 ID에 source / created_at / content_hash 없이 저장했습니다.
+이 아이템들은 컬렉션 GSI에 잡히지 않아 증분 적재(fetch_hashes)가 보지 못하므로, 그대로 두면
+첫 증분 실행이 스프레드시트 전체를 중복 저장하고 이전 아이템은 영영 삭제되지 않습니다.
+
+이 스크립트는 source가 없는 아이템을 Scan으로 찾아
+1. 질문 기반 고정 ID(stable_id)로 다시 키를 매기고
+2. source(기본: excel) / created_at / content_hash를 채워 새 아이템으로 저장한 뒤
+3. 이전 uuid 아이템을 삭제합니다.
+임베딩은 그대로 옮기므로 다시 호출하지 않으며, 현재 임베딩 모델과 다른 아이템은 content_hash를 비워
+다음 ingest_dynamodb.py 실행에서 재임베딩되게 합니다. 같은 질문이 여러 개면 하나만 남습니다.
+
+ingest_dynamodb.py를 처음 실행하기 전에 한 번 실행하세요.
+
+실행:
+python scripts/migrate_legacy_items.py --dry-run
+python scripts/migrate_legacy_items.py
+INGEST_SOURCE=excel python scripts/migrate_legacy_items.py
+"""
+
+import os
+import sys
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from dotenv import load_dotenv
+
+# Lambda 공용 모듈 (embeddings.py, qa_store.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from embeddings import get_provider
+from ingest_engine import content_hash, stable_id
+from qa_store import COLLECTION_ATTRIBUTE, bump_collection_version
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 설정
+BEDROCK_REGION = os.environ.get("BEDROCK_REGION", "ap-northeast-1")
+DYNAMODB_TABLE = os.environ.get("DYNAMODB_TABLE", "qa-documents")
+SOURCE = os.environ.get("INGEST_SOURCE", "excel")  # ingest_dynamodb.py와 같은 기본값
+
+
+def scan_legacy_items(table: Any) -> Iterator[dict[str, Any]]:
+    """source 속성이 없는 아이템 (페이지 단위 Scan)"""
+    kwargs: dict[str, Any] = {"FilterExpression": Attr(COLLECTION_ATTRIBUTE).not_exists()}
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def migrated_item(item: dict[str, Any], provider: Any, source: str, migrated_at: str) -> dict[str, Any]:
+    """이전 아이템 → 고정 ID + source / created_at / content_hash를 가진 아이템"""
+    question, answer = str(item.get("question", "")), str(item.get("answer", ""))
+    return {
+        **item,
+        "id": stable_id(question),
+        "source": source,
+        "created_at": item.get("created_at") or migrated_at,
+        # 모델이 다르면 해시를 비워 다음 증분 적재에서 재임베딩
+        "content_hash": content_hash(question, answer, provider.key) if provider.matches(item) else "",
+    }
+
+
+def migrate(table: Any, provider: Any, source: str = SOURCE, dry_run: bool = False) -> int:
+    """source 없는 아이템 이전, 이전한 아이템 수 반환"""
+    migrated_at = datetime.now().isoformat()
+    migrated = 0
+    with table.batch_writer(overwrite_by_pkeys=["id"]) as batch:
+        for item in scan_legacy_items(table):
+            if not item.get("question"):
+                logger.warning(f"⚠️  질문 없는 아이템 건너뜀: {item.get('id')}")
+                continue
+            new_item = migrated_item(item, provider, source, migrated_at)
+            migrated += 1
+            if dry_run:
+                logger.info(f"🔍 {item['id']} → {new_item['id']} '{new_item['question'][:50]}'")
+                continue
+            batch.put_item(Item=new_item)
+            if new_item["id"] != item["id"]:
+                batch.delete_item(Key={"id": item["id"]})
+    if migrated and not dry_run:
+        bump_collection_version(table, source)
+    return migrated
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="source 없는 기존 아이템을 증분 적재 형식으로 이전")
+    parser.add_argument("--source", default=SOURCE, help=f"부여할 컬렉션 (기본: {SOURCE})")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 이전 대상만 출력")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        bedrock = boto3.client("bedrock-runtime", region_name=BEDROCK_REGION)
+        table = boto3.resource("dynamodb", region_name=BEDROCK_REGION).Table(DYNAMODB_TABLE)
+        count = migrate(table, get_provider(bedrock_client=bedrock), args.source, args.dry_run)
+        print(f"{'🔍 이전 대상' if args.dry_run else '✅ 이전 완료'}: {count}개 → {DYNAMODB_TABLE}[{args.source}]")
+    except Exception as e:
+        logger.error(f"❌ 오류 발생: {str(e)}", exc_info=True)
+        sys.exit(1)
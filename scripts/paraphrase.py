@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+적재 시점 질문 패러프레이즈 확장
+
+Q&A마다 다른 표현의 질문 N개를 미리 만들어 추가 벡터로 저장합니다.
+사용자가 원문과 다르게 물어봐도 벡터 검색 임계값을 넘기 쉬워져
+요청 시점의 생성 비용을 적재 시점으로 옮깁니다.
+
+패러프레이즈 아이템은 parent_id / parent_question을 가지며,
+검색(index.py, snapshot.py)은 항상 부모 Q&A로 결과를 돌려줍니다.
+
+중복 제거:
+- 원문·다른 Q&A 질문·형제 패러프레이즈와 정규화 후 같은 문장 제거
+- 문자 2-gram Jaccard 유사도가 PARAPHRASE_DEDUP_THRESHOLD 이상인 거의 같은 문장 제거
+  (다른 Q&A 질문과 겹치는 패러프레이즈는 엉뚱한 답을 가리키므로 특히 제외)
+
+환경 변수:
+- PARAPHRASE_PROVIDER: bedrock (Claude) / stub (로컬 규칙 기반, 네트워크 없음) (기본: bedrock)
+- PARAPHRASE_MODEL_ID: Bedrock 모델 ID (기본: anthropic.claude-3-haiku-20240307-v1:0)
+- PARAPHRASE_DEDUP_THRESHOLD: 거의 같은 문장 판정 기준 (기본: 0.85)
+"""
+
+import os
+import re
+import json
+import logging
+from typing import Any, Iterable, Iterator
+
+from ingest_engine import normalize_question
+
+logger = logging.getLogger(__name__)
+
+PARAPHRASE_PROVIDER = os.environ.get("PARAPHRASE_PROVIDER", "bedrock")
+PARAPHRASE_MODEL_ID = os.environ.get("PARAPHRASE_MODEL_ID", "anthropic.claude-3-haiku-20240307-v1:0")
+PARAPHRASE_DEDUP_THRESHOLD = float(os.environ.get("PARAPHRASE_DEDUP_THRESHOLD", "0.85"))
+
+
+class BedrockParaphraser:
+    """Claude로 패러프레이즈 생성 (JSON 배열 응답)"""
+
+    def __init__(self, client: Any, model_id: str = PARAPHRASE_MODEL_ID):
+        self.client = client
+        self.model_id = model_id
+
+    def paraphrase(self, question: str, count: int) -> list[str]:
+        prompt = (
+            f"다음 질문과 같은 뜻이지만 표현이 다른 한국어 질문 {count}개를 만들어 주세요.\n"
+            "실제 사용자가 채팅창에 입력할 법한 구어체, 축약형, 존댓말/반말을 섞어 주세요.\n"
+            "설명 없이 JSON 문자열 배열로만 답하세요.\n\n"
+            f"질문: {question}"
+        )
+        response = self.client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps({
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": 500,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.8,
+            })
+        )
+        text = json.loads(response["body"].read())["content"][0]["text"]
+        match = re.search(r"\[.*\]", text, re.DOTALL)
+        if not match:
+            logger.warning(f"⚠️  패러프레이즈 응답 파싱 실패: {text[:80]}")
+            return []
+        return [str(p).strip() for p in json.loads(match.group()) if str(p).strip()][:count]
+
+
+class StubParaphraser:
+    """규칙 기반 패러프레이즈 (로컬 테스트용, 결정적)"""
+
+    ENDINGS = [
+        ("인가요", "이에요"), ("인가요", "야"), ("나요", "나"), ("나요", "는지 궁금해요"),
+        ("무엇", "뭐"), ("어떤", "무슨"), ("있나요", "있어"), ("하나요", "해"),
+    ]
+
+    def paraphrase(self, question: str, count: int) -> list[str]:
+        base = question.strip().rstrip("?？ ")
+        candidates = [base.replace(old, new) + "?" for old, new in self.ENDINGS if old in base]
+        candidates += [f"{base} 알려주세요", f"{base} 궁금해요", base.replace(" ", "")]
+        return candidates[:count]
+
+
+def get_paraphraser(bedrock_client: Any = None, provider: str = PARAPHRASE_PROVIDER):
+    if provider == "stub":
+        return StubParaphraser()
+    if provider == "bedrock":
+        if bedrock_client is None:
+            import boto3
+
+            bedrock_client = boto3.client("bedrock-runtime", region_name=os.environ.get("BEDROCK_REGION", "ap-northeast-1"))
+        return BedrockParaphraser(bedrock_client)
+    raise ValueError(f"❌ 지원하지 않는 패러프레이즈 프로바이더: {provider}")
+
+
+def _bigrams(text: str) -> set[str]:
+    compact = re.sub(r"[\s?？!.,]", "", normalize_question(text))
+    return {compact[i:i + 2] for i in range(len(compact) - 1)} or {compact}
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def expand_paraphrases(
+    rows: Iterable[dict],
+    paraphraser: Any,
+    count: int,
+    threshold: float = PARAPHRASE_DEDUP_THRESHOLD,
+) -> Iterator[dict]:
+    """
+    원본 행 뒤에 패러프레이즈 행을 이어서 반환
+
+    패러프레이즈 행: {id: <부모 id>-p<k>, question, answer, parent_id, parent_question}
+    """
+    rows = list(rows)
+    canonical = {normalize_question(row["question"]): row["id"] for row in rows}
+    canonical_grams = {row["id"]: _bigrams(row["question"]) for row in rows}
+    seen: set[str] = set(canonical)
+    generated = dropped = 0
+
+    for row in rows:
+        yield row
+        try:
+            candidates = paraphraser.paraphrase(row["question"], count)
+        except Exception as e:
+            logger.error(f"❌ 패러프레이즈 생성 실패, 스킵: '{row['question'][:50]}' ({str(e)})")
+            continue
+
+        kept_grams = [canonical_grams[row["id"]]]
+        for candidate in candidates:
+            key = normalize_question(candidate)
+            grams = _bigrams(candidate)
+            # 같은/거의 같은 문장이거나 다른 Q&A 질문과 겹치면 제외
+            if (
+                key in seen
+                or any(_jaccard(grams, g) >= threshold for g in kept_grams)
+                or any(_jaccard(grams, g) >= threshold for other, g in canonical_grams.items() if other != row["id"])
+            ):
+                dropped += 1
+                continue
+            seen.add(key)
+            kept_grams.append(grams)
+            generated += 1
+            yield {
+                "id": f"{row['id']}-p{len(kept_grams) - 1}",
+                "question": candidate,
+                "answer": row["answer"],
+                "parent_id": row["id"],
+                "parent_question": row["question"],
+            }
+
+    logger.info(f"🔁 패러프레이즈 {generated}개 추가 (중복 {dropped}개 제외)")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Q&A 원본 데이터 스트리밍 리더
+
+지원 형식:
+- .xlsx: openpyxl read-only 모드 (행 단위 스트리밍)
+- .csv: 첫 줄은 헤더
+- .jsonl: 한 줄에 JSON 객체 하나
+
+모든 리더는 제너레이터이므로 파일 크기와 무관하게 메모리 사용량이 일정하며,
+`chunked()`로 고정 크기 청크를 만들어 임베딩/저장 파이프라인에 바로 전달합니다.
+
+각 행은 {"row_number", "question", "answer"} 형태로 반환됩니다.
+row_number는 헤더를 제외한 1부터 시작하는 데이터 행 번호입니다.
+"""
+
+import csv
+import json
+import logging
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Column = Union[int, str]  # 열 번호(0부터) 또는 헤더 이름
+DEFAULT_CHUNK_SIZE = 100
+
+
+@dataclass
+class ColumnMapping:
+    """원본 열 → 필드 매핑 (기본: 0번 열 = 질문, 1번 열 = 답변)"""
+    question: Column = 0
+    answer: Column = 1
+
+    @staticmethod
+    def parse(value: Optional[str], default: Column) -> Column:
+        """CLI/환경 변수 값 파싱 ("2" → 2, "질문" → "질문")"""
+        if value is None or value == "":
+            return default
+        return int(value) if value.isdigit() else value
+
+
+def _resolve(column: Column, header: Optional[list[str]]) -> Column:
+    """헤더 이름을 열 번호로 변환"""
+    if isinstance(column, int) or header is None:
+        return column
+    try:
+        return header.index(column)
+    except ValueError:
+        raise ValueError(f"❌ 열을 찾을 수 없습니다: '{column}' (헤더: {header})")
+
+
+def _make_row(row_number: int, question: Any, answer: Any) -> Optional[dict]:
+    if question is None or answer is None:
+        return None
+    question, answer = str(question).strip(), str(answer).strip()
+    if not question or not answer:
+        return None
+    return {"row_number": row_number, "question": question, "answer": answer}
+
+
+def _cell(values: Any, column: Column) -> Any:
+    if isinstance(column, int):
+        return values[column] if column < len(values) else None
+    return values.get(column)
+
+
+def read_xlsx(path: Path, mapping: ColumnMapping, sheet: Union[int, str] = 0) -> Iterator[dict]:
+    """엑셀 파일 스트리밍 읽기 (read-only 모드)"""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[wb.sheetnames[sheet]] if isinstance(sheet, int) else wb[sheet]
+        rows = ws.iter_rows(values_only=True)
+        header = [str(v).strip() if v is not None else "" for v in next(rows, ())]
+        q_col = _resolve(mapping.question, header)
+        a_col = _resolve(mapping.answer, header)
+        for row_number, values in enumerate(rows, start=1):
+            row = _make_row(row_number, _cell(values, q_col), _cell(values, a_col))
+            if row:
+                yield row
+    finally:
+        wb.close()
+
+
+def read_csv(path: Path, mapping: ColumnMapping) -> Iterator[dict]:
+    """CSV 파일 스트리밍 읽기 (UTF-8, BOM 허용)"""
+    with path.open(newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [v.strip() for v in next(reader, [])]
+        q_col = _resolve(mapping.question, header)
+        a_col = _resolve(mapping.answer, header)
+        for row_number, values in enumerate(reader, start=1):
+            row = _make_row(row_number, _cell(values, q_col), _cell(values, a_col))
+            if row:
+                yield row
+
+
+def read_jsonl(path: Path, mapping: ColumnMapping) -> Iterator[dict]:
+    """JSONL 파일 스트리밍 읽기 (열 번호 매핑이면 question/answer 키 사용)"""
+    q_key = mapping.question if isinstance(mapping.question, str) else "question"
+    a_key = mapping.answer if isinstance(mapping.answer, str) else "answer"
+    with path.open(encoding="utf-8") as f:
+        for row_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            row = _make_row(row_number, record.get(q_key), record.get(a_key))
+            if row:
+                yield row
+
+
+def read_rows(
+    file_path: str,
+    mapping: Optional[ColumnMapping] = None,
+    sheet: Union[int, str] = 0,
+) -> Iterator[dict]:
+    """확장자에 따라 리더 선택"""
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"❌ 파일을 찾을 수 없습니다: {file_path}")
+
+    mapping = mapping or ColumnMapping()
+    suffix = path.suffix.lower()
+    logger.info(f"📂 {suffix[1:]} 파일 스트리밍 읽기: {file_path}")
+
+    if suffix in (".xlsx", ".xlsm"):
+        return read_xlsx(path, mapping, sheet)
+    if suffix == ".csv":
+        return read_csv(path, mapping)
+    if suffix in (".jsonl", ".ndjson"):
+        return read_jsonl(path, mapping)
+    raise ValueError(f"❌ 지원하지 않는 파일 형식: {suffix}")
+
+
+def chunked(rows: Iterable[dict], size: int = DEFAULT_CHUNK_SIZE) -> Iterator[list[dict]]:
+    """고정 크기 청크로 묶기 (마지막 청크는 더 작을 수 있음)"""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
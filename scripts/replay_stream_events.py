@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+DynamoDB Streams 이벤트 파일 재생 (backend/lambda/deltas.py)
+
+Lambda가 받는 것과 같은 형식의 이벤트({"Records": [...]}) JSON 파일을 읽어
+변경분으로 바꾼 뒤 변경분 로그에 기록하거나, 로컬 스냅샷에 바로 반영해 결과를 확인합니다.
+
+- DELTA_TABLE 설정 시: 변경분 테이블에 기록 (스트림 핸들러와 동일)
+- --snapshot: 스냅샷을 열어 변경분을 반영하고 컬렉션 크기 변화를 출력
+- --compact-out: 반영 결과를 새 스냅샷으로 저장 (압축 결과 확인용)
+
+실행:
+python scripts/replay_stream_events.py events.json --snapshot backend/lambda/snapshot/perso.ai
+python scripts/replay_stream_events.py events.json --snapshot backend/lambda/snapshot/perso.ai --compact-out /tmp/compacted
+DELTA_TABLE=qa-deltas python scripts/replay_stream_events.py events.json
+"""
+
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Lambda 공용 모듈 (deltas.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 환경 변수 로드 (deltas.py가 DELTA_TABLE을 읽기 전에)
+load_dotenv()
+
+from deltas import MemoryDeltaLog, DeltaFollower, compact, deltas_from_stream, default_log, snapshot_cursor
+from snapshot import SnapshotIndex
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DynamoDB Streams 이벤트 파일 재생")
+    parser.add_argument("events", help="스트림 이벤트 JSON 파일 ({\"Records\": [...]})")
+    parser.add_argument("--snapshot", help="변경분을 반영할 컬렉션 스냅샷 경로")
+    parser.add_argument("--collection", default="perso.ai", help="--snapshot의 컬렉션 (source 값)")
+    parser.add_argument("--compact-out", help="반영 결과를 저장할 스냅샷 루트")
+    args = parser.parse_args()
+
+    event = json.loads(Path(args.events).read_text(encoding="utf-8"))
+    records = event["Records"] if isinstance(event, dict) else event
+
+    index = SnapshotIndex(args.snapshot) if args.snapshot else None
+    # 스냅샷 반영 시에는 스냅샷 이후 시각으로 기록해야 커서 뒤에 놓임
+    written_at = int(snapshot_cursor(index.manifest)) / 1000 + 1 if index else None
+    deltas = deltas_from_stream(records, written_at=written_at)
+    logger.info(f"📋 스트림 레코드 {len(records)}건 → 변경분 {len(deltas)}건")
+
+    log = default_log() if not index else MemoryDeltaLog()
+    log.append(deltas)
+    if not index:
+        logger.info(f"✅ 변경분 로그에 기록 완료 ({type(log).__name__})")
+        return
+
+    before = len(index)
+    follower = DeltaFollower(index, log, args.collection)
+    applied = follower.poll(force=True)
+    print(f"🔄 변경분 {applied}건 반영: {before}개 → {len(index)}개 (커서 {follower.cursor})")
+
+    if args.compact_out:
+        snapshot_dir = compact(follower, args.compact_out)
+        print(f"🗜️  압축 스냅샷: {snapshot_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+의도 분류 선형 모델 학습 (backend/lambda/intent_classifier.py)
+
+규칙으로 잡히지 않는 표현을 보완하는 작은 다중 클래스 로지스틱 회귀입니다.
+특징 추출은 Lambda와 같은 features()를 사용하며, 외부 라이브러리 없이 SGD로 학습합니다.
+
+학습 데이터 (JSONL, 한 줄에 하나):
+{"text": "답이 왜 저거인지 모르겠어", "intent": "answer_confusion"}
+{"text": "환율이 오르면 수출은?", "intent": "other"}     # 템플릿 대상이 아닌 일반 질문
+
+의도 이름은 intent_classifier.TEMPLATES의 키 또는 other여야 합니다.
+
+실행:
+python scripts/train_intent_model.py data/intents.jsonl
+python scripts/train_intent_model.py data/intents.jsonl --epochs 30 --out backend/lambda/intent_model.json
+"""
+
+import sys
+import json
+import math
+import random
+import logging
+import argparse
+from pathlib import Path
+
+# Lambda 공용 모듈 (intent_classifier.py 등)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend" / "lambda"))
+
+from intent_classifier import OTHER, TEMPLATES, LinearIntentModel, features
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUT = str(Path(__file__).resolve().parent.parent / "backend" / "lambda" / "intent_model.json")
+
+
+def load_examples(path: str) -> list[tuple[str, str]]:
+    examples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["intent"] != OTHER and record["intent"] not in TEMPLATES:
+                raise ValueError(f"❌ 알 수 없는 의도: {record['intent']} (허용: {[OTHER, *TEMPLATES]})")
+            examples.append((record["text"], record["intent"]))
+    return examples
+
+
+def train(examples: list[tuple[str, str]], epochs: int, lr: float, l2: float, seed: int) -> dict:
+    """softmax 교차 엔트로피 SGD"""
+    labels = sorted({intent for _, intent in examples})
+    index = {label: i for i, label in enumerate(labels)}
+    weights: dict[str, list[float]] = {}
+    bias = [0.0] * len(labels)
+    rng = random.Random(seed)
+    data = [(features(text), index[intent]) for text, intent in examples]
+
+    for epoch in range(epochs):
+        rng.shuffle(data)
+        loss = 0.0
+        for feats, target in data:
+            scores = list(bias)
+            for feat in feats:
+                row = weights.get(feat)
+                if row:
+                    scores = [s + w for s, w in zip(scores, row)]
+            top = max(scores)
+            exps = [math.exp(s - top) for s in scores]
+            total = sum(exps)
+            probs = [e / total for e in exps]
+            loss -= math.log(max(probs[target], 1e-12))
+
+            grads = [p - (1.0 if i == target else 0.0) for i, p in enumerate(probs)]
+            bias = [b - lr * g for b, g in zip(bias, grads)]
+            for feat in feats:
+                row = weights.setdefault(feat, [0.0] * len(labels))
+                weights[feat] = [w - lr * (g + l2 * w) for w, g in zip(row, grads)]
+        logger.info(f"epoch {epoch + 1}/{epochs} loss {loss / len(data):.4f}")
+
+    # 영향이 거의 없는 특징 제거 (파일 크기 축소)
+    weights = {
+        feat: [round(w, 4) for w in row]
+        for feat, row in weights.items()
+        if max(abs(w) for w in row) >= 1e-3
+    }
+    return {"labels": labels, "bias": [round(b, 4) for b in bias], "weights": weights}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="의도 분류 선형 모델 학습")
+    parser.add_argument("data", help="학습 데이터 JSONL")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--lr", type=float, default=0.1)
+    parser.add_argument("--l2", type=float, default=1e-4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=DEFAULT_OUT, help="출력 JSON 경로")
+    args = parser.parse_args()
+
+    examples = load_examples(args.data)
+    logger.info(f"📋 학습 예제 {len(examples)}개")
+    model_data = train(examples, args.epochs, args.lr, args.l2, args.seed)
+
+    model = LinearIntentModel(model_data)
+    correct = sum(model.predict(text)[0] == intent for text, intent in examples)
+    logger.info(f"🎯 학습 정확도: {correct / len(examples):.1%}")
+
+    Path(args.out).write_text(json.dumps(model_data, ensure_ascii=False), encoding="utf-8")
+    logger.info(f"✅ 모델 저장: {args.out} ({len(model_data['weights'])}개 특징)")
+
+
+if __name__ == "__main__":
+    main()
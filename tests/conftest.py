@@ -0,0 +1,14 @@
+"""
+테스트 공통 설정
+
+scripts/와 backend/lambda/는 패키지가 아니라 평평한 모듈 디렉터리이므로 import 경로에 추가합니다.
+의존성 설치: pip install -r requirements-dev.txt
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT / "scripts", ROOT / "backend" / "lambda"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
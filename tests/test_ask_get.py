@@ -0,0 +1,69 @@
+"""
+backend/lambda/index.py — GET /ask 캐시 헤더: 검색 백엔드 오류를 "결과 없음"으로 캐시하지 않음
+"""
+
+import json
+
+import pytest
+
+import index
+
+EMBEDDING = [1.0, 0.0, 0.0]
+ITEM = {"id": "qa-1", "question": "퍼소 AI가 뭐예요?", "answer": "AI 영상 더빙 서비스", "embedding": EMBEDDING}
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(index, "SEARCH_BACKEND", "dynamodb")
+    monkeypatch.setattr(index, "generation_pointers", None)
+    monkeypatch.setattr(index, "embed_text", lambda text: EMBEDDING)
+    monkeypatch.setattr(index, "data_version", lambda collection: 1)
+    monkeypatch.setattr(index.embedding_provider, "matches", lambda item: True)
+    monkeypatch.setattr(index.rate_limiter, "check", lambda event, bucket: 0)
+
+
+def get(question: str = "퍼소 AI가 뭐예요?", collection: str = "perso.ai") -> dict:
+    return index.handler({"httpMethod": "GET", "queryStringParameters": {"question": question, "collection": collection}}, None)
+
+
+def test_answer_is_cacheable(monkeypatch):
+    monkeypatch.setattr(index, "query_collection", lambda table, collection, created_after=None: iter([ITEM]))
+    response = get()
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["answer"] == ITEM["answer"]
+    assert response["headers"]["Cache-Control"].startswith("public")
+
+
+def test_no_match_is_cacheable(monkeypatch):
+    monkeypatch.setattr(index, "query_collection", lambda table, collection, created_after=None: iter([]))
+    response = get()
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["success"] is False
+    assert response["headers"]["Cache-Control"].startswith("public")
+
+
+def test_backend_failure_is_not_cached(monkeypatch):
+    def unavailable(table, collection, created_after=None):
+        raise RuntimeError("ProvisionedThroughputExceededException")
+
+    monkeypatch.setattr(index, "query_collection", unavailable)
+    response = get()
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 503
+    assert response["headers"]["Cache-Control"] == "no-store"
+    assert body["success"] is False
+    assert body["failed"] is True
+
+
+def test_failure_in_one_collection_keeps_other_answer_uncached(monkeypatch):
+    def query(table, collection, created_after=None):
+        if collection == "excel":
+            raise RuntimeError("timeout")
+        return iter([ITEM] if collection == "perso.ai" else [])
+
+    monkeypatch.setattr(index, "query_collection", query)
+    monkeypatch.setattr(index, "DEFAULT_COLLECTION", "")
+    response = index.handler({"httpMethod": "GET", "queryStringParameters": {"question": "퍼소 AI가 뭐예요?"}}, None)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["answer"] == ITEM["answer"]
+    assert response["headers"]["Cache-Control"] == "no-store"
@@ -0,0 +1,50 @@
+"""
+backend/lambda/chunker.py — 청크 분할 후 병합하면 원문과 같아야 함
+"""
+
+import pytest
+
+from chunker import chunk_text, merge_chunks
+
+SENTENCES = [
+    "퍼소 AI는 AI 영상 더빙 서비스입니다. ",
+    "30개 이상의 언어를 지원합니다! ",
+    "요금제는 월 구독과 연 구독이 있나요? ",
+    "네, 연 구독은 20% 할인됩니다.\n",
+    "환불은 결제 후 7일 이내에 가능합니다. ",
+]
+DOCUMENT = "".join(SENTENCES * 12)
+
+
+def blocks(text: str, size: int = 97):
+    """블록 경계가 문장 중간에 걸리도록 고정 크기로 자름"""
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def hits(chunks):
+    return [{"chunk": c.index, "chunk_start": c.start, "chunk_end": c.end, "answer": c.text} for c in chunks]
+
+
+@pytest.mark.parametrize("overlap", [0, 60])
+def test_merge_round_trips_to_original(overlap):
+    chunks = list(chunk_text(blocks(DOCUMENT), chunk_chars=200, overlap_chars=overlap))
+    assert len(chunks) > 3
+    for chunk in chunks:
+        assert DOCUMENT[chunk.start:chunk.end] == chunk.text
+    if overlap == 0:
+        # 겹침 없이 바로 이어지는 청크 (start == 이전 end)
+        assert all(b.start == a.end for a, b in zip(chunks, chunks[1:]))
+    else:
+        assert any(b.start < a.end for a, b in zip(chunks, chunks[1:]))
+
+    assert merge_chunks(hits(chunks)) == DOCUMENT.strip()
+    assert merge_chunks(reversed(hits(chunks))) == DOCUMENT.strip()
+
+
+def test_merge_adjacent_pair_adds_nothing():
+    first, second, *_ = chunk_text(blocks(DOCUMENT), chunk_chars=200, overlap_chars=0)
+    merged = merge_chunks(hits([first, second]))
+    assert merged == DOCUMENT[first.start:second.end].strip()
+    assert len(merged) <= second.end - first.start
+
@@ -0,0 +1,51 @@
+"""
+scripts/dedup.py — 유사 중복 병합 조건 (숫자/답변이 다르면 병합하지 않음)
+"""
+
+import json
+
+from dedup import NearDuplicateFilter, jaccard, shingles
+
+
+def row(question: str, answer: str = "답변") -> dict:
+    return {"id": question, "question": question, "answer": answer}
+
+
+def test_merges_rephrased_question_with_same_answer():
+    dedup = NearDuplicateFilter(0.8)
+    kept = list(dedup.filter([
+        row("퍼소 AI는 어떤 서비스인가요?"),
+        row("퍼소 AI는 어떤 서비스인가요"),
+        row("환율이란 무엇인가요?"),
+    ]))
+    assert [r["id"] for r in kept] == ["퍼소 AI는 어떤 서비스인가요?", "환율이란 무엇인가요?"]
+    assert len(dedup.merged) == 1
+
+
+def test_questions_with_different_numbers_are_kept():
+    first = "2023년 한국은행 금융통화위원회가 결정한 기준금리는 몇 퍼센트였나요?"
+    second = first.replace("2023", "2024")
+    assert jaccard(shingles(first), shingles(second)) >= 0.8
+
+    dedup = NearDuplicateFilter(0.8)
+    kept = list(dedup.filter([row(first, "3.5%"), row(second, "3.5%")]))
+    assert len(kept) == 2
+    assert dedup.merged == []
+
+
+def test_different_answers_are_kept_and_reported(tmp_path):
+    dedup = NearDuplicateFilter(0.8)
+    kept = list(dedup.filter([
+        row("퍼소 AI 요금제는 어떻게 되나요?", "월 10달러"),
+        row("퍼소 AI 요금제는 어떻게 되나요", "월 20달러"),
+        row("퍼소 AI 요금제는 어떻게 되나요!", "월 10달러"),
+    ]))
+    assert len(kept) == 2
+    assert "남긴 유사 행 1개" in dedup.summary()
+
+    report = tmp_path / "dedup.jsonl"
+    dedup.write_report(str(report))
+    record = json.loads(report.read_text(encoding="utf-8").splitlines()[0])
+    assert record["answer_conflict"] is True
+    assert record["conflicting_questions"] == ["퍼소 AI 요금제는 어떻게 되나요"]
+    assert record["merged_questions"] == ["퍼소 AI 요금제는 어떻게 되나요!"]
@@ -0,0 +1,54 @@
+"""
+backend/lambda/delta_handler.py — 세대 포인터가 있으면 라이브 세대 스냅샷을 압축
+"""
+
+import pytest
+
+import delta_handler
+from generations import GenerationPointers, MemoryPointerBackend
+from snapshot import write_snapshot
+
+DIM = 4
+
+
+def items():
+    yield {"id": "g1#perso-1", "question": "퍼소 AI가 뭐예요?", "answer": "AI 영상 더빙 서비스", "embedding": [1.0, 0.0, 0.0, 0.0]}
+
+
+@pytest.fixture
+def s3(tmp_path, monkeypatch):
+    """download_snapshot / upload_snapshot을 로컬 디렉터리로 대신하고 접근한 prefix 기록"""
+    calls = {"downloaded": [], "uploaded": []}
+    source = write_snapshot(items(), str(tmp_path / "s3"), embedding_model="m", embedding_dim=DIM)
+
+    def download(bucket, prefix, target_root):
+        calls["downloaded"].append(prefix)
+        return str(source)
+
+    monkeypatch.setattr(delta_handler, "download_snapshot", download)
+    monkeypatch.setattr(delta_handler, "upload_snapshot", lambda path, bucket, prefix: calls["uploaded"].append(prefix))
+    monkeypatch.setattr(delta_handler, "SNAPSHOT_S3_BUCKET", "bkt")
+    monkeypatch.setattr(delta_handler, "SNAPSHOT_TMP_DIR", str(tmp_path / "tmp"))
+    monkeypatch.setattr(delta_handler, "DELTA_COMPACT_COLLECTIONS", ["perso.ai"])
+    return calls
+
+
+def test_compacts_live_generation(s3, monkeypatch):
+    backend = MemoryPointerBackend()
+    pointers = GenerationPointers(backend, poll_seconds=0)
+    pointers.register("perso.ai", "g1")
+    pointers.publish("perso.ai", "g1")
+    monkeypatch.setattr(delta_handler, "GENERATION_TABLE", "qa-generations")
+    monkeypatch.setattr(delta_handler, "GenerationPointers", lambda poll_seconds: GenerationPointers(backend, poll_seconds))
+
+    results = delta_handler.compact_handler({}, None)
+
+    assert list(results) == ["perso.ai@g1"]
+    assert s3["downloaded"] == s3["uploaded"] == ["snapshots/qa/perso.ai@g1/"]
+
+
+def test_compacts_collection_without_generation_table(s3, monkeypatch):
+    monkeypatch.setattr(delta_handler, "GENERATION_TABLE", "")
+
+    assert list(delta_handler.compact_handler({}, None)) == ["perso.ai"]
+    assert s3["uploaded"] == ["snapshots/qa/perso.ai/"]
@@ -0,0 +1,138 @@
+"""
+scripts/ingest.py — OpenAI embeddings / Supabase REST를 httpx.MockTransport로 대신한 배치 적재 테스트
+"""
+
+import json
+import asyncio
+
+import httpx
+import pytest
+
+import ingest
+from embeddings import OpenAIProvider
+
+OPENAI_URL = "http://openai.test/v1"
+SUPABASE_URL = "http://supabase.test"
+DIMENSIONS = 4
+
+
+class StandIn:
+    """embeddings / qa_embeddings 엔드포인트 흉내 (요청 기록, 실패 응답 주입, 동시 처리 수 측정)"""
+
+    def __init__(self, failures=None, delay=0.0):
+        self.failures = list(failures or [])  # (경로 접미사, 상태 코드, 헤더)를 순서대로 한 번씩 반환
+        self.delay = delay
+        self.embed_requests = []
+        self.upserts = []
+        self.upsert_headers = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        for failure in self.failures:
+            if path.endswith(failure[0]):
+                self.failures.remove(failure)
+                return httpx.Response(failure[1], headers=failure[2], json={"error": "stand-in"})
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        body = json.loads(request.content)
+        if path == "/v1/embeddings":
+            self.embed_requests.append(body)
+            data = [{"index": i, "embedding": [float(len(text))] * DIMENSIONS} for i, text in enumerate(body["input"])]
+            return httpx.Response(200, json={"data": list(reversed(data))})
+        if path == "/rest/v1/qa_embeddings":
+            self.upserts.append(body)
+            self.upsert_headers.append(request.headers)
+            return httpx.Response(201)
+        return httpx.Response(404)
+
+
+@pytest.fixture(autouse=True)
+def environment(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", SUPABASE_URL)
+    monkeypatch.setenv("SUPABASE_ANON_KEY", "anon")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(ingest, "EMBEDDING_MODEL", "text-embedding-3-small")
+    # 재시도 백오프 없이 바로 재시도
+    monkeypatch.setattr(ingest.random, "uniform", lambda a, b: 0.0)
+
+
+def make_ingestor(stand_in: StandIn, max_batch_size: int = 2048) -> ingest.QAIngestor:
+    ingestor = ingest.QAIngestor(transport=httpx.MockTransport(stand_in))
+    ingestor.provider = OpenAIProvider("text-embedding-3-small", DIMENSIONS, api_key="sk-test", base_url=OPENAI_URL)
+    ingestor.provider.max_batch_size = max_batch_size
+    return ingestor
+
+
+def rows(count: int) -> list[dict]:
+    return [{"id": i, "question": f"질문 {i}" + "?" * (i % 3), "answer": f"답변 {i}"} for i in range(1, count + 1)]
+
+
+def test_batches_are_capped_by_max_batch_size():
+    stand_in = StandIn()
+    make_ingestor(stand_in, max_batch_size=3).upsert_to_supabase(rows(10), chunk_size=100)
+
+    assert [len(body["input"]) for body in stand_in.embed_requests] == [3, 3, 3, 1]
+    assert [len(batch) for batch in stand_in.upserts] == [3, 3, 3, 1]
+    assert all(body["dimensions"] == DIMENSIONS for body in stand_in.embed_requests)
+
+
+def test_upserts_json_array_with_embeddings_in_row_order():
+    stand_in = StandIn()
+    make_ingestor(stand_in).upsert_to_supabase(rows(5), chunk_size=2)
+
+    upserted = [row for batch in stand_in.upserts for row in batch]
+    assert sorted(row["id"] for row in upserted) == [1, 2, 3, 4, 5]
+    for row in upserted:
+        # 응답 data 순서를 뒤집어도 index로 정렬되어 행과 맞아야 함
+        assert row["embedding"] == [float(len(row["question"]))] * DIMENSIONS
+        assert row["embedding_model"] == "text-embedding-3-small"
+        assert row["embedding_dim"] == DIMENSIONS
+    headers = stand_in.upsert_headers[0]
+    assert headers["prefer"] == "resolution=merge-duplicates,return=minimal"
+    assert headers["apikey"] == "anon"
+
+
+def test_chunks_run_concurrently_up_to_limit(monkeypatch):
+    monkeypatch.setattr(ingest, "MAX_CONCURRENCY", 3)
+    stand_in = StandIn(delay=0.02)
+    make_ingestor(stand_in).upsert_to_supabase(rows(20), chunk_size=2)
+
+    assert len(stand_in.upserts) == 10
+    assert 1 < stand_in.max_in_flight <= 3
+
+
+def test_retries_429_and_5xx():
+    stand_in = StandIn(failures=[
+        ("/embeddings", 429, {"Retry-After": "0"}),
+        ("/embeddings", 503, {}),
+        ("/qa_embeddings", 500, {}),
+        ("/qa_embeddings", 429, {}),
+    ])
+    make_ingestor(stand_in).upsert_to_supabase(rows(4), chunk_size=4)
+
+    assert stand_in.failures == []
+    assert len(stand_in.embed_requests) == 1
+    assert [len(batch) for batch in stand_in.upserts] == [4]
+
+
+def test_client_error_is_not_retried():
+    stand_in = StandIn(failures=[("/qa_embeddings", 400, {})])
+    with pytest.raises(httpx.HTTPStatusError):
+        make_ingestor(stand_in).upsert_to_supabase(rows(2), chunk_size=2)
+    assert stand_in.upserts == []
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(ingest, "MAX_RETRIES", 2)
+    stand_in = StandIn(failures=[("/embeddings", 503, {})] * 3)
+    with pytest.raises(httpx.HTTPStatusError):
+        make_ingestor(stand_in).upsert_to_supabase(rows(1), chunk_size=1)
+    assert stand_in.embed_requests == []
@@ -0,0 +1,44 @@
+"""
+scripts/ingest_documents.py — 위치만 밀린 청크도 변경으로 잡아 chunk_start / chunk_end를 다시 저장
+"""
+
+from types import SimpleNamespace
+
+from ingest_documents import DocumentIngestor
+from ingest_engine import SyncPlan
+
+BODY = "".join(f"{i}번째 문장은 변하지 않습니다. " for i in range(40))
+
+
+def chunk_rows(text: str) -> list[dict]:
+    ingestor = DocumentIngestor.__new__(DocumentIngestor)
+    ingestor.provider = SimpleNamespace(key="m:4")
+    ingestor.documents = ingestor.chunks = 0
+    document = {"id": "doc-1", "title": "정책", "blocks": iter([text])}
+    return list(ingestor.chunk_rows([document], chunk_chars=200, overlap_chars=0))
+
+
+def test_shifted_chunks_are_resynced_with_new_offsets():
+    before = chunk_rows(BODY)
+    # 첫 문장만 짧아짐 → 뒤 청크는 텍스트 그대로, 위치만 앞으로 밀림
+    after = chunk_rows(BODY.replace("0번째 문장은 변하지 않습니다.", "0번째 문장은 짧습니다.", 1))
+
+    plan = SyncPlan({row["id"]: row["content_hash"] for row in before})
+    resynced = {row["id"]: row for row in plan.filter(after)}
+    stored = {row["id"]: row for row in before}
+
+    shifted = [
+        row["id"] for row in after
+        if row["answer"] == stored[row["id"]]["answer"] and row["chunk_start"] != stored[row["id"]]["chunk_start"]
+    ]
+    assert shifted
+    # 텍스트가 같아도 위치가 달라진 청크는 통과해야 새 chunk_start / chunk_end가 저장됨
+    assert set(shifted) <= set(resynced)
+    assert set(resynced) == {row["id"] for row in after}
+
+
+def test_unchanged_document_is_skipped():
+    rows = chunk_rows(BODY)
+    plan = SyncPlan({row["id"]: row["content_hash"] for row in rows})
+    assert list(plan.filter(chunk_rows(BODY))) == []
+    assert plan.unchanged == len(rows)
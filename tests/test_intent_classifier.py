@@ -0,0 +1,61 @@
+"""
+backend/lambda/intent_classifier.py — 템플릿 답변 여부 평가 세트
+
+CANNED는 템플릿으로 바로 답해야 하는 단독 발화, QUESTIONS는 "모르겠어요"/"헷갈려요"/"어떻게 사용"이
+들어 있어도 모델이 답해야 하는 실제 경제 질문입니다. 규칙을 바꿀 때 두 목록에 예문을 추가하세요.
+"""
+
+import pytest
+
+import intent_classifier
+from intent_classifier import canned_response, classify
+
+CANNED = [
+    ("안녕하세요!", "greeting"),
+    ("고마워요", "thanks"),
+    ("뭘 할 수 있어?", "help"),
+    ("사용법 알려줘", "help"),
+    ("도움말", "help"),
+    ("정답이 이해가 안 돼요", "answer_confusion"),
+    ("해설 봐도 모르겠어요", "answer_confusion"),
+    ("왜 이게 정답이에요?", "answer_confusion"),
+    ("이해가 안 가요", "answer_confusion"),
+    ("헷갈려요", "answer_confusion"),
+    ("잘 모르겠어요", "answer_confusion"),
+]
+
+QUESTIONS = [
+    "금리가 오르면 왜 환율이 떨어지는지 모르겠어",
+    "인플레이션과 스태그플레이션이 헷갈려요",
+    "이 답변에서 관세 부분이 이해가 안 돼요",
+    "어떻게 사용해야 투자에 도움이 될까요",
+    "기준금리 인하가 집값에 어떤 영향을 주는지 잘 모르겠습니다",
+    "원달러 환율이 왜 오르는지 이해가 안 가요",
+    "수요와 공급 곡선이 어떻게 움직이는지 설명을 봐도 잘 모르겠네",
+]
+
+
+@pytest.fixture(autouse=True)
+def rules_only(monkeypatch):
+    # 배포 패키지의 학습 모델 유무와 무관하게 규칙만 평가
+    monkeypatch.setattr(intent_classifier, "get_model", lambda: None)
+
+
+@pytest.mark.parametrize("text,intent", CANNED)
+def test_standalone_utterances_get_templates(text, intent):
+    canned = canned_response(text)
+    assert canned is not None
+    assert canned[0].name == intent
+
+
+@pytest.mark.parametrize("text", QUESTIONS)
+def test_domain_questions_go_to_the_model(text):
+    assert canned_response(text) is None
+    intent = classify(text)
+    assert intent is None or intent.confidence < intent_classifier.INTENT_CONFIDENCE_THRESHOLD
+
+
+def test_game_type_template_is_selected():
+    intent, answer = canned_response("정답이 헷갈려요", "PrisonersDilemma")
+    assert intent.name == "answer_confusion"
+    assert answer == intent_classifier.TEMPLATES["answer_confusion"]["PrisonersDilemma"]
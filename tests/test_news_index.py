@@ -0,0 +1,115 @@
+"""
+backend/lambda/news_index.py — 버전 교체 시 이전 /tmp 디렉터리 정리와 S3 이전 버전 삭제
+"""
+
+import io
+from pathlib import Path
+
+import boto3
+import pytest
+
+import news_index
+from news_index import NewsIndex
+from snapshot import LATEST_FILE, MANIFEST_FILE, prune_snapshots, write_snapshot
+
+DIM = 4
+
+
+def items(count: int):
+    for i in range(count):
+        vector = [0.0] * DIM
+        vector[i % DIM] = 1.0
+        yield {"id": f"n{i}", "question": f"기사 {i}", "answer": f"본문 {i}", "created_at": "2026-10-01", "embedding": vector}
+
+
+class FakeS3:
+    """LATEST 읽기 / 버전 목록 / 삭제만 흉내내는 S3 클라이언트"""
+
+    def __init__(self, prefix: str, versions: list[str], latest: str):
+        self.prefix = prefix
+        self.versions = versions
+        self.latest = latest
+        self.deleted: list[str] = []
+
+    def get_object(self, Bucket, Key):
+        assert Key == f"{self.prefix}{LATEST_FILE}"
+        return {"Body": io.BytesIO(self.latest.encode("utf-8"))}
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix, Delimiter):
+                # 버전 목록을 두 페이지로 나눠 반환
+                prefixes = [{"Prefix": f"{Prefix}{v}/"} for v in fake.versions]
+                yield {"CommonPrefixes": prefixes[:2]}
+                yield {"CommonPrefixes": prefixes[2:]}
+
+        return Paginator()
+
+    def delete_objects(self, Bucket, Delete):
+        self.deleted.extend(obj["Key"] for obj in Delete["Objects"])
+
+
+@pytest.fixture
+def tmp_root(tmp_path, monkeypatch):
+    root = tmp_path / "news-index"
+    monkeypatch.setattr(news_index, "NEWS_INDEX_TMP_DIR", str(root))
+    return root
+
+
+def test_swap_closes_previous_index_and_removes_old_downloads(tmp_root, monkeypatch):
+    old = write_snapshot(items(3), str(tmp_root), embedding_model="m", embedding_dim=DIM, version="v20261001T000000Z")
+    older = write_snapshot(items(1), str(tmp_root), embedding_model="m", embedding_dim=DIM, version="v20260930T000000Z")
+
+    latest = {"dir": old}
+    monkeypatch.setattr(news_index, "download_snapshot", lambda bucket, prefix, root: str(latest["dir"]))
+    index = NewsIndex(bucket="news-bucket", path="")
+
+    first = index.load()
+    assert first.dir == old
+    assert not older.exists()  # 이전 실행에서 받은 버전도 정리
+
+    new = write_snapshot(items(5), str(tmp_root), embedding_model="m", embedding_dim=DIM, version="v20261001T010000Z")
+    latest["dir"] = new
+    second = index.load()
+    assert second.dir == new
+    assert len(second) == 5
+    assert not old.exists()
+    assert first.vectors.shape == (0, DIM)  # 이전 인덱스는 닫힘
+    assert (new / MANIFEST_FILE).exists()
+
+
+def test_local_path_versions_are_kept(tmp_path):
+    root = tmp_path / "local-news"
+    old = write_snapshot(items(2), str(root), embedding_model="m", embedding_dim=DIM, version="v20261001T000000Z")
+    index = NewsIndex(bucket="", path=str(root))
+    assert index.load().dir == old
+
+    new = write_snapshot(items(3), str(root), embedding_model="m", embedding_dim=DIM, version="v20261001T010000Z")
+    assert index.load().dir == new
+    assert old.exists()
+
+
+def test_prune_keeps_newest_versions_and_latest(monkeypatch):
+    prefix = "news-index/"
+    versions = ["v20261001T000000Z", "v20261001T010000Z", "v20261001T020000Z", "v20261001T030000Z", "v20261001T040000Z"]
+    s3 = FakeS3(prefix, versions, latest="v20261001T040000Z")
+    monkeypatch.setattr(boto3, "client", lambda service: s3)
+
+    expired = prune_snapshots("news-bucket", prefix, keep=2)
+
+    assert expired == versions[:3]
+    assert {Path(key).parent.name for key in s3.deleted} == set(versions[:3])
+    assert len(s3.deleted) == 3 * 4
+
+
+def test_prune_never_deletes_latest(monkeypatch):
+    prefix = "news-index/"
+    versions = ["v20261001T000000Z", "v20261001T010000Z", "v20261001T020000Z"]
+    # LATEST가 가장 오래된 버전을 가리키는 경우 (롤백 등)
+    s3 = FakeS3(prefix, versions, latest=versions[0])
+    monkeypatch.setattr(boto3, "client", lambda service: s3)
+
+    assert prune_snapshots("news-bucket", prefix, keep=1) == [versions[1]]
@@ -0,0 +1,173 @@
+"""
+backend/lambda/pgvector_store.py — 로컬 HTTP 서버로 PostgREST RPC를 대신한 검색 테스트
+"""
+
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pgvector_store import PgVectorSearch
+
+ROWS = [
+    {"id": "qa-1", "question": "퍼소 AI가 뭐예요?", "answer": "AI 영상 더빙 서비스", "embedding": [1.0, 0.0, 0.0]},
+    {"id": "qa-2", "question": "요금제는?", "answer": "월 구독", "embedding": [0.8, 0.6, 0.0]},
+    {"id": "qa-3", "question": "지원 언어는?", "answer": "30개 이상", "embedding": [0.0, 1.0, 0.0]},
+    {"id": "qa-4", "question": "환불 되나요?", "answer": "7일 이내", "embedding": [0.0, 0.0, 1.0]},
+]
+
+
+def cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    return dot / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+
+class StandIn(ThreadingHTTPServer):
+    """match_qa_embeddings RPC 흉내 (요청 기록, 오류 응답 주입, keep-alive 끊기)"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RpcHandler)
+        self.requests: list[dict] = []
+        self.connections = 0
+        self.failures: list[int] = []  # 순서대로 한 번씩 반환할 상태 코드
+        self.drop_after_response = False  # 응답 후 Connection: close 없이 소켓을 닫음 (유휴 keep-alive 종료 흉내)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class RpcHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append({"path": self.path, "headers": dict(self.headers), "body": body})
+
+        if self.server.failures:
+            self.respond(self.server.failures.pop(0), {"message": "stand-in error"})
+        elif self.path != "/rest/v1/rpc/match_qa_embeddings":
+            self.respond(404, {"message": "not found"})
+        else:
+            matches = [
+                {**{k: v for k, v in row.items() if k != "embedding"},
+                 "similarity": cosine(body["query_embedding"], row["embedding"])}
+                for row in ROWS
+            ]
+            matches = [m for m in matches if m["similarity"] >= body["match_threshold"]]
+            matches.sort(key=lambda m: m["similarity"], reverse=True)
+            self.respond(200, matches[:body["match_count"]])
+
+        if self.server.drop_after_response:
+            self.close_connection = True
+
+    def respond(self, status: int, payload) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_rpc_payload_and_headers(stand_in):
+    search = PgVectorSearch(stand_in.url, "anon-key")
+    search.search([1.0, 0.0, 0.0], 3, 0.5, embedding_model="text-embedding-3-small", embedding_dim=3)
+
+    request = stand_in.requests[0]
+    assert request["path"] == "/rest/v1/rpc/match_qa_embeddings"
+    assert request["body"] == {
+        "query_embedding": [1.0, 0.0, 0.0],
+        "match_count": 3,
+        "match_threshold": 0.5,
+        "filter_model": "text-embedding-3-small",
+        "filter_dim": 3,
+    }
+    assert request["headers"]["apikey"] == "anon-key"
+    assert request["headers"]["Authorization"] == "Bearer anon-key"
+    assert request["headers"]["Content-Type"] == "application/json"
+
+
+def test_returns_top_k_above_threshold(stand_in):
+    search = PgVectorSearch(stand_in.url, "anon-key")
+
+    results = search.search([1.0, 0.1, 0.0], 2, 0.0)
+    assert [r["id"] for r in results] == ["qa-1", "qa-2"]
+    assert results[0]["similarity"] > results[1]["similarity"]
+    assert set(results[0]) == {"id", "question", "answer", "similarity"}
+
+    assert [r["id"] for r in search.search([1.0, 0.1, 0.0], 10, 0.9)] == ["qa-1"]
+    assert search.search([-1.0, 0.0, 0.0], 10, 0.5) == []
+
+
+def test_reuses_keep_alive_connection(stand_in):
+    search = PgVectorSearch(stand_in.url, "anon-key")
+    for _ in range(3):
+        search.search([1.0, 0.0, 0.0], 1, 0.5)
+    assert len(stand_in.requests) == 3
+    assert stand_in.connections == 1
+
+
+def test_reconnects_after_server_drops_idle_connection(stand_in):
+    search = PgVectorSearch(stand_in.url, "anon-key")
+    stand_in.drop_after_response = True
+    search.search([1.0, 0.0, 0.0], 1, 0.5)
+
+    # 클라이언트는 커넥션이 살아 있다고 보지만 서버는 이미 닫음 → 한 번 다시 연결해 성공
+    results = search.search([0.0, 1.0, 0.0], 1, 0.5)
+    assert [r["id"] for r in results] == ["qa-3"]
+    assert stand_in.connections == 2
+    assert len(stand_in.requests) == 2
+
+
+def test_gives_up_when_reconnect_also_fails(stand_in):
+    search = PgVectorSearch(stand_in.url, "anon-key")
+    search.search([1.0, 0.0, 0.0], 1, 0.5)
+    stand_in.shutdown()
+    stand_in.server_close()
+    search._conn.sock.close()  # 서버가 사라진 상태에서 기존 소켓도 끊김
+
+    with pytest.raises(OSError):
+        search.search([1.0, 0.0, 0.0], 1, 0.5)
+
+
+@pytest.mark.parametrize("status", [400, 404, 500, 503])
+def test_error_status_raises_without_retry(stand_in, status):
+    stand_in.failures = [status]
+    search = PgVectorSearch(stand_in.url, "anon-key")
+
+    with pytest.raises(RuntimeError, match=f"pgvector RPC 오류 {status}"):
+        search.search([1.0, 0.0, 0.0], 1, 0.5)
+    assert len(stand_in.requests) == 1
+
+    # 오류 응답 본문은 모두 읽었으므로 같은 커넥션으로 다음 요청 가능
+    assert [r["id"] for r in search.search([1.0, 0.0, 0.0], 1, 0.5)] == ["qa-1"]
+    assert stand_in.connections == 1
+
+
+def test_requires_url_and_key():
+    with pytest.raises(ValueError):
+        PgVectorSearch("", "anon-key")
+    with pytest.raises(ValueError):
+        PgVectorSearch("http://127.0.0.1:1", "")
@@ -0,0 +1,91 @@
+"""
+backend/lambda/rate_limit.py — 클라이언트 식별과 DynamoDB GCRA 판정 (조건부 UpdateItem을 흉내낸 테이블)
+"""
+
+from botocore.exceptions import ClientError
+
+from rate_limit import DynamoRateLimitBackend, MemoryRateLimitBackend, client_key
+
+INTERVAL_MS = 1000
+BURST = 3
+
+
+class FakeTable:
+    """rate_limit.py가 쓰는 두 조건부 UpdateItem만 흉내 (쓰기 횟수 기록)"""
+
+    def __init__(self):
+        self.items: dict[str, dict] = {}
+        self.writes = 0
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression, ExpressionAttributeValues, **kwargs):
+        self.writes += 1
+        values = ExpressionAttributeValues
+        item = self.items.get(Key["bucket_key"])
+        tat = item["tat"] if item else None
+        if ConditionExpression == "tat BETWEEN :now AND :until":
+            ok = tat is not None and values[":now"] <= tat <= values[":until"]
+            new_tat = tat + values[":interval"] if ok else None
+        else:
+            ok = tat is None or tat < values[":now"]
+            new_tat = values[":tat"]
+        if not ok:
+            error = {"Error": {"Code": "ConditionalCheckFailedException"}}
+            if item:
+                error["Item"] = {"tat": {"N": str(tat)}}
+            raise ClientError(error, "UpdateItem")
+        self.items[Key["bucket_key"]] = {"tat": new_tat, "expires_at": values[":expires"]}
+        return {"Attributes": {"tat": new_tat, "expires_at": values[":expires"]}}
+
+
+def test_unverified_api_key_header_falls_back_to_ip():
+    event = {"headers": {"X-Api-Key": "made-up"}, "requestContext": {"identity": {"sourceIp": "203.0.113.7"}}}
+    assert client_key(event) == "ip:203.0.113.7"
+
+
+def test_api_gateway_validated_key_is_trusted():
+    event = {"headers": {"X-Api-Key": "secret"}, "requestContext": {"identity": {"apiKeyId": "abc123", "sourceIp": "203.0.113.7"}}}
+    assert client_key(event) == "key:abc123"
+
+
+def test_configured_api_key_is_trusted():
+    event = {"headers": {"x-api-key": "partner-key"}, "requestContext": {"http": {"sourceIp": "203.0.113.7"}}}
+    key = client_key(event, frozenset({"partner-key"}))
+    assert key.startswith("key:") and "partner-key" not in key
+    assert client_key({**event, "headers": {"x-api-key": "other"}}, frozenset({"partner-key"})) == "ip:203.0.113.7"
+
+
+def test_dynamo_matches_memory_backend():
+    dynamo, memory = DynamoRateLimitBackend(FakeTable()), MemoryRateLimitBackend()
+    now = 1_000_000
+    for offset in (0, 0, 0, 0, 500, 1000, 1000, 5000, 5000):
+        assert dynamo.acquire("k", INTERVAL_MS, BURST, now + offset) == memory.acquire("k", INTERVAL_MS, BURST, now + offset)
+
+
+def test_busy_client_needs_one_write_per_request():
+    table = FakeTable()
+    backend = DynamoRateLimitBackend(table)
+    now = 1_000_000
+    assert backend.acquire("k", INTERVAL_MS, BURST, now) == 0
+    assert table.writes == 1
+
+    # 토큰이 남아 있는 동안 기억한 tat로 바로 증가 분기를 시도
+    table.writes = 0
+    assert backend.acquire("k", INTERVAL_MS, BURST, now + 10) == 0
+    assert backend.acquire("k", INTERVAL_MS, BURST, now + 20) == 0
+    assert table.writes == 2
+
+    # 한도를 넘은 것을 이미 알면 쓰기 없이 거절
+    table.writes = 0
+    assert backend.acquire("k", INTERVAL_MS, BURST, now + 30) > 0
+    assert table.writes == 0
+
+
+def test_stale_cache_recovers_from_other_containers():
+    table = FakeTable()
+    first, second = DynamoRateLimitBackend(table), DynamoRateLimitBackend(table)
+    now = 1_000_000
+    assert first.acquire("k", INTERVAL_MS, BURST, now) == 0
+    assert second.acquire("k", INTERVAL_MS, BURST, now) == 0
+    assert second.acquire("k", INTERVAL_MS, BURST, now) == 0
+    # first는 tat를 한 번만 봤지만 조건 실패 응답으로 실제 tat를 받아 거절
+    assert first.acquire("k", INTERVAL_MS, BURST, now) > 0
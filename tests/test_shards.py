@@ -0,0 +1,104 @@
+"""
+backend/lambda/shards.py / shard_worker.py — 다시 내보낸 샤드 스냅샷 교체와 이전 인덱스 정리
+"""
+
+import pytest
+
+import shard_worker
+from shards import LocalShardWorker, ScatterGather, shard_dir
+from snapshot import LatestSnapshot, write_snapshot
+
+DIM = 4
+
+
+def items(prefix: str, count: int):
+    for i in range(count):
+        vector = [0.0] * DIM
+        vector[i % DIM] = 1.0
+        yield {"id": f"{prefix}{i}", "question": f"질문 {i}", "answer": f"{prefix} 답변 {i}", "embedding": vector}
+
+
+def export(root, prefix: str, count: int, version: str):
+    return write_snapshot(items(prefix, count), str(root), embedding_model="m", embedding_dim=DIM, version=version)
+
+
+def test_latest_snapshot_swaps_after_refresh_interval(tmp_path):
+    root = tmp_path / "perso.ai" / shard_dir(0)
+    export(root, "old", 2, "v20261001T000000Z")
+    snapshot = LatestSnapshot(str(root), refresh_seconds=0)
+    first = snapshot.get()
+    assert first.version == "v20261001T000000Z"
+
+    export(root, "new", 3, "v20261001T010000Z")
+    second = snapshot.get()
+    assert second.version == "v20261001T010000Z"
+    assert len(second) == 3
+    assert first.vectors.shape == (0, DIM)  # 교체된 인덱스는 닫힘
+
+
+def test_latest_snapshot_waits_for_refresh_interval(tmp_path):
+    export(tmp_path, "old", 2, "v20261001T000000Z")
+    snapshot = LatestSnapshot(str(tmp_path), refresh_seconds=3600)
+    first = snapshot.get()
+
+    export(tmp_path, "new", 3, "v20261001T010000Z")
+    assert snapshot.get() is first
+
+
+def test_failed_check_keeps_previous_index(tmp_path):
+    export(tmp_path, "old", 2, "v20261001T000000Z")
+    allowed = {"m"}
+
+    def check(index):
+        if index.manifest["embedding_model"] not in allowed:
+            raise ValueError("모델 불일치")
+
+    snapshot = LatestSnapshot(str(tmp_path), refresh_seconds=0, check=check)
+    first = snapshot.get()
+    write_snapshot(items("new", 1), str(tmp_path), embedding_model="other", embedding_dim=DIM, version="v20261001T010000Z")
+    assert snapshot.get() is first
+    assert len(first) == 2
+
+
+def test_coordinator_serves_reexported_shards_and_close_releases_them(tmp_path):
+    snapshots = []
+    for shard in range(2):
+        root = tmp_path / shard_dir(shard)
+        export(root, f"s{shard}-old", 1, "v20261001T000000Z")
+        snapshots.append(LatestSnapshot(str(root), refresh_seconds=0))
+    coordinator = ScatterGather([LocalShardWorker(shard, snapshot) for shard, snapshot in enumerate(snapshots)])
+
+    gathered = coordinator.search("perso.ai", [1.0, 0.0, 0.0, 0.0], 4, 0.5)
+    assert {r["id"] for r in gathered.results} == {"s0-old0", "s1-old0"}
+
+    for shard in range(2):
+        export(tmp_path / shard_dir(shard), f"s{shard}-new", 1, "v20261001T010000Z")
+    gathered = coordinator.search("perso.ai", [1.0, 0.0, 0.0, 0.0], 4, 0.5)
+    assert {r["id"] for r in gathered.results} == {"s0-new0", "s1-new0"}
+
+    indexes = [snapshot.get() for snapshot in snapshots]
+    coordinator.close()
+    assert all(index.vectors.shape == (0, DIM) for index in indexes)
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(shard_worker, "SNAPSHOT_PATH", str(tmp_path))
+    monkeypatch.setattr(shard_worker, "SNAPSHOT_S3_BUCKET", "")
+    monkeypatch.setattr(shard_worker, "_snapshots", {})
+    monkeypatch.setattr(shard_worker, "_last_used", {})
+    return tmp_path
+
+
+def test_worker_evicts_idle_generation_sources(worker, monkeypatch):
+    for source in ("perso.ai@g1", "perso.ai@g2"):
+        export(worker / source / shard_dir(0), source, 1, "v20261001T000000Z")
+
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(shard_worker.time, "time", lambda: clock["now"])
+    old = shard_worker.get_index("perso.ai@g1")
+
+    clock["now"] += shard_worker.SNAPSHOT_IDLE_SECONDS
+    shard_worker.get_index("perso.ai@g2")
+    assert set(shard_worker._snapshots) == {"perso.ai@g2"}
+    assert old.vectors.shape == (0, DIM)